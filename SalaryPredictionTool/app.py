@@ -1,5 +1,8 @@
 
 
+import io
+import os
+import time
 import warnings
 import streamlit as st
 import pandas as pd
@@ -7,13 +10,24 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
+import plotly.graph_objects as go
 
 warnings.filterwarnings('ignore')
 
-from data_generator import generate_synthetic_data
 from model_trainer import ModelTrainer
-from predictor import SalaryPredictor
-from utils import get_currency_rates, format_currency, load_kaggle_data
+from predictor import SalaryPredictor, load_predictor
+from utils import (get_currency_rates, format_currency, format_currency_array, convert_salary_currency,
+                   convert_salaries, get_rate_vector, CURRENCY_CODES)
+from dataset_cache import generate_synthetic_data_cached, load_kaggle_data_cached, source_signature
+from profiling import profiling_enabled
+from training_jobs import TrainingJob, describe_event, COMPLETED, CANCELLED, FAILED
+from dataset_stats import get_dataset_statistics
+from chart_data import (MAX_CHART_POINTS, analysis_aggregates, box_statistics, density_grid, histogram_counts,
+                        stratified_sample)
+
+# Persisted models (ModelTrainer.save_models) loaded at startup instead of training
+MODEL_PATH_ENV_VAR = 'SALARY_MODEL_PATH'
+DEFAULT_MODEL_PATH = 'models.joblib'
 
 # Set page configuration
 st.set_page_config(
@@ -77,12 +91,17 @@ def main():
     )
     
     # Initialize session state
+    get_startup_metrics()
     if 'data' not in st.session_state:
         st.session_state.data = None
     if 'model_trainer' not in st.session_state:
         st.session_state.model_trainer = None
     if 'predictor' not in st.session_state:
-        st.session_state.predictor = None
+        # Warm start from a persisted artifact when there is one
+        st.session_state.predictor = load_persisted_predictor()
+    
+    # Swap in a finished background training job, whichever page is shown
+    finish_training_job()
     
     if page == "🏠 Home":
         show_home_page()
@@ -97,6 +116,176 @@ def main():
     elif page == "💱 Currency Converter":
         show_currency_converter()
 
+def get_dataset_stats():
+    """
+    Get cached statistics for the current dataset, looking them up again only when the data changes
+    
+    Returns None when no dataset is loaded (e.g. models were warm-started from an artifact).
+    """
+    data = st.session_state.data
+    if data is None:
+        return None
+    if 'dataset_stats' not in st.session_state or st.session_state.get('dataset_stats_data') is not data:
+        st.session_state.dataset_stats = get_dataset_statistics(data)
+        st.session_state.dataset_stats_data = data
+    return st.session_state.dataset_stats
+
+@st.cache_resource
+def get_startup_metrics():
+    """
+    Process-wide startup timings, created on the first script run after the server starts
+    """
+    return {
+        'started_at': time.perf_counter(),
+        'model_source': None,
+        'model_ready_s': None,
+        'first_prediction_s': None
+    }
+
+def get_model_path():
+    return os.environ.get(MODEL_PATH_ENV_VAR, DEFAULT_MODEL_PATH)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _load_persisted_predictor(path, signature):
+    start_time = time.perf_counter()
+    try:
+        predictor = load_predictor(path, mmap_mode='r')
+    except Exception as e:
+        print(f"Warning: Could not load persisted models from {path}: {e}")
+        return None
+    
+    print(f"Loaded persisted models from {path} in {time.perf_counter() - start_time:.3f}s")
+    record_model_ready('artifact')
+    return predictor
+
+def load_persisted_predictor():
+    """
+    Shared predictor from the persisted model artifact (reloaded when the file changes), or None if there is none
+    """
+    path = get_model_path()
+    if not os.path.isfile(path):
+        return None
+    
+    return _load_persisted_predictor(path, source_signature(path))
+
+def record_model_ready(source):
+    metrics = get_startup_metrics()
+    if metrics['model_source'] is None:
+        metrics['model_source'] = source
+        metrics['model_ready_s'] = time.perf_counter() - metrics['started_at']
+
+def record_prediction():
+    metrics = get_startup_metrics()
+    if metrics['first_prediction_s'] is None:
+        metrics['first_prediction_s'] = time.perf_counter() - metrics['started_at']
+        print(f"First prediction served {metrics['first_prediction_s']:.2f}s after startup")
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_synthetic_dataset(num_records=10000):
+    """
+    Synthetic dataset shared by all sessions (each call gets its own copy)
+    """
+    return generate_synthetic_data_cached(num_records)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_kaggle_dataset(path, signature):
+    return load_kaggle_data_cached(path)
+
+def load_kaggle_dataset(path):
+    """
+    Kaggle dataset shared by all sessions, reloaded when the source files change
+    """
+    return _load_kaggle_dataset(path, source_signature(path))
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def read_uploaded_csv(file_bytes):
+    """
+    Parse an uploaded CSV once per distinct file content
+    """
+    return pd.read_csv(io.BytesIO(file_bytes))
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def train_cached_models(dataset_fingerprint, models_to_train, test_size, random_state, _data):
+    """
+    Train models once per dataset fingerprint and training parameters, shared by all sessions
+    
+    The DataFrame itself is not hashed (leading underscore); the fingerprint
+    identifies it. Returns (trainer, predictor, results), which callers must
+    treat as read-only.
+    """
+    trainer = ModelTrainer(_data)
+    results = trainer.train_models(
+        models_to_train=list(models_to_train),
+        test_size=test_size,
+        random_state=random_state,
+        profile=False
+    )
+    predictor = SalaryPredictor(trainer.models, trainer.encoders, trainer.scaler)
+    
+    return trainer, predictor, results
+
+def get_trained_models(models_to_train=None, test_size=0.2, random_state=42):
+    """
+    Get (trainer, predictor, results) for the current dataset from the shared model cache
+    """
+    if models_to_train is None:
+        models_to_train = ["Linear Regression", "Random Forest", "Gradient Boosting"]
+    
+    return train_cached_models(
+        get_dataset_stats().fingerprint,
+        tuple(models_to_train),
+        float(test_size),
+        int(random_state),
+        _data=st.session_state.data
+    )
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def get_analysis_aggregates(dataset_fingerprint, _data):
+    """
+    Data Analysis chart inputs, computed once per dataset so reruns only redraw from aggregates
+    """
+    return analysis_aggregates(_data)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def get_chart_sample(dataset_fingerprint, columns, by, _data):
+    """
+    Stratified sample of the given columns for point charts, computed once per dataset
+    """
+    return stratified_sample(_data[list(dict.fromkeys(columns))], by=by)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def get_salary_histogram(dataset_fingerprint, bins, _data):
+    return histogram_counts(_data['salary'], bins=bins)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def get_density_grid(dataset_fingerprint, x_feature, y_feature, _data):
+    return density_grid(_data[x_feature], _data[y_feature])
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def get_box_statistics(dataset_fingerprint, by, _data):
+    return box_statistics(_data, 'salary', list(by))
+
+def box_figure(stats, x_feature, color_feature, title):
+    """
+    Grouped box plot drawn from precomputed quartiles and whiskers
+    """
+    fig = go.Figure()
+    for color_value, group in stats.groupby(color_feature, observed=True, sort=False):
+        fig.add_trace(go.Box(
+            name=str(color_value),
+            x=group[x_feature].astype(str),
+            q1=group['q1'],
+            median=group['median'],
+            q3=group['q3'],
+            lowerfence=group['lower_whisker'],
+            upperfence=group['upper_whisker'],
+            mean=group['mean']
+        ))
+    
+    fig.update_layout(boxmode='group', title=title, xaxis_title=x_feature,
+                      yaxis_title='salary', legend_title=color_feature)
+    return fig
+
 def show_home_page():
     st.markdown("## 🚀 Welcome to Advanced Salary Prediction System")
     
@@ -149,16 +338,25 @@ def show_home_page():
             with st.spinner("Downloading dataset from Kaggle..."):
                 try:
                     # Download the dataset
+                    import kagglehub
                     path = kagglehub.dataset_download("rkiattisak/salaly-prediction-for-beginer")
                     st.success(f"✅ Dataset downloaded successfully!")
                     st.info(f"📂 Dataset path: {path}")
                     
-                    # Load the dataset
-                    data = load_kaggle_data(path)
+                    # Load the dataset (from the local columnar cache when the files are unchanged)
+                    data = load_kaggle_dataset(path)
                     if data is not None:
                         st.session_state.data = data
                         st.success(f"✅ Data loaded: {len(data)} records")
                         
+                        file_row_counts = data.attrs.get('file_row_counts', {})
+                        if len(file_row_counts) > 1:
+                            st.info(f"📂 Combined {len(file_row_counts)} CSV files")
+                            st.dataframe(pd.DataFrame({
+                                'File': [os.path.basename(path) for path in file_row_counts],
+                                'Records': list(file_row_counts.values())
+                            }))
+                        
                         # Show data preview
                         st.subheader("📊 Dataset Preview")
                         st.dataframe(data.head(10))
@@ -172,23 +370,24 @@ def show_home_page():
                         with col2:
                             st.metric("Features", len(data.columns))
                         with col3:
-                            if 'salary' in data.columns:
-                                st.metric("Avg Salary", f"${data['salary'].mean():,.0f}")
+                            dataset_stats = get_dataset_stats()
+                            if 'salary' in dataset_stats.moments:
+                                st.metric("Avg Salary", f"${dataset_stats.column_summary('salary')['mean']:,.0f}")
                     else:
                         st.warning("⚠️ Could not load dataset properly. Using synthetic data instead.")
-                        st.session_state.data = generate_synthetic_data()
+                        st.session_state.data = load_synthetic_dataset()
                     
                 except Exception as e:
                     st.error(f"❌ Error downloading dataset: {str(e)}")
                     st.info("🔄 Falling back to synthetic data generation...")
                     with st.spinner("Generating synthetic data..."):
-                        st.session_state.data = generate_synthetic_data()
+                        st.session_state.data = load_synthetic_dataset()
                         st.success("✅ Synthetic data generated successfully!")
     
     elif data_source == "🔧 Synthetic Data":
         if st.button("🎲 Generate Synthetic Data"):
             with st.spinner("Generating synthetic data..."):
-                st.session_state.data = generate_synthetic_data()
+                st.session_state.data = load_synthetic_dataset()
                 st.success("✅ Synthetic data generated successfully!")
                 st.dataframe(st.session_state.data.head())
     
@@ -196,7 +395,7 @@ def show_home_page():
         uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
         if uploaded_file is not None:
             try:
-                st.session_state.data = pd.read_csv(uploaded_file)
+                st.session_state.data = read_uploaded_csv(uploaded_file.getvalue())
                 st.success("✅ File uploaded successfully!")
                 st.dataframe(st.session_state.data.head())
             except Exception as e:
@@ -205,22 +404,24 @@ def show_home_page():
     # Display data info if available
     if st.session_state.data is not None:
         st.markdown("## 📋 Dataset Information")
+        dataset_stats = get_dataset_stats()
+        salary_summary = dataset_stats.column_summary('salary') if 'salary' in dataset_stats.moments else None
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("📊 Total Records", len(st.session_state.data))
+            st.metric("📊 Total Records", dataset_stats.row_count)
         with col2:
-            st.metric("📋 Features", len(st.session_state.data.columns))
+            st.metric("📋 Features", len(dataset_stats.columns))
         with col3:
             # Check if salary column exists
-            if 'salary' in st.session_state.data.columns:
-                st.metric("💰 Avg Salary", f"${st.session_state.data['salary'].mean():,.0f}")
+            if salary_summary is not None:
+                st.metric("💰 Avg Salary", f"${salary_summary['mean']:,.0f}")
             else:
                 st.metric("💰 Avg Salary", "N/A")
         with col4:
             # Check if salary column exists
-            if 'salary' in st.session_state.data.columns:
-                st.metric("📈 Salary Range", f"${st.session_state.data['salary'].std():,.0f}")
+            if salary_summary is not None:
+                st.metric("📈 Salary Range", f"${salary_summary['std']:,.0f}")
             else:
                 st.metric("📈 Salary Range", "N/A")
 
@@ -232,6 +433,8 @@ def show_data_analysis():
         return
     
     data = st.session_state.data
+    dataset_stats = get_dataset_stats()
+    aggregates = get_analysis_aggregates(dataset_stats.fingerprint, data)
     
     # Basic statistics
     st.markdown("### 📈 Basic Statistics")
@@ -239,73 +442,93 @@ def show_data_analysis():
     
     with col1:
         st.subheader("📊 Numerical Summary")
-        st.dataframe(data.describe())
+        st.dataframe(dataset_stats.describe())
     
     with col2:
         st.subheader("🔍 Data Info")
         st.text(f"Shape: {data.shape}")
-        st.text(f"Missing Values: {data.isnull().sum().sum()}")
+        st.text(f"Missing Values: {dataset_stats.missing_counts.sum()}")
         st.text(f"Data Types:\n{data.dtypes.to_string()}")
     
-    # Visualizations
+    # Visualizations (rendered from cached aggregates, once per dataset and chart)
     st.markdown("### 📈 Data Visualizations")
-    
-    # Salary distribution
-    fig, ax = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # Histogram
-    ax[0].hist(data['salary'], bins=30, alpha=0.7, color='skyblue', edgecolor='black')
-    ax[0].set_title('Salary Distribution')
-    ax[0].set_xlabel('Salary')
-    ax[0].set_ylabel('Frequency')
-    
-    # Box plot
-    ax[1].boxplot(data['salary'])
-    ax[1].set_title('Salary Box Plot')
-    ax[1].set_ylabel('Salary')
-    
-    st.pyplot(fig)
+    st.image(render_analysis_chart(dataset_stats.fingerprint, 'salary', None, aggregates), use_container_width=True)
     
     # Correlation matrix
     st.markdown("### 🔗 Correlation Analysis")
-    numeric_columns = data.select_dtypes(include=[np.number]).columns
-    if len(numeric_columns) > 1:
-        corr_matrix = data[numeric_columns].corr()
-        
-        fig, ax = plt.subplots(figsize=(10, 8))
-        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, ax=ax)
-        ax.set_title('Correlation Matrix')
-        st.pyplot(fig)
+    if aggregates['correlation'] is not None:
+        st.image(render_analysis_chart(dataset_stats.fingerprint, 'correlation', None, aggregates),
+                 use_container_width=True)
     
     # Categorical analysis
     st.markdown("### 📊 Categorical Analysis")
-    categorical_columns = data.select_dtypes(include=['object']).columns
+    categorical_columns = aggregates['categorical_columns']
     
     if len(categorical_columns) > 0:
         selected_cat = st.selectbox("Select categorical variable:", categorical_columns)
         
         if selected_cat:
-            # Value counts
-            value_counts = data[selected_cat].value_counts()
-            
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader(f"📊 {selected_cat} Distribution")
-                fig, ax = plt.subplots(figsize=(10, 6))
-                value_counts.plot(kind='bar', ax=ax)
-                ax.set_title(f'{selected_cat} Distribution')
-                plt.xticks(rotation=45)
-                st.pyplot(fig)
+                st.image(render_analysis_chart(dataset_stats.fingerprint, 'value_counts', selected_cat, aggregates),
+                         use_container_width=True)
             
             with col2:
                 st.subheader(f"💰 Salary by {selected_cat}")
-                avg_salary = data.groupby(selected_cat)['salary'].mean().sort_values(ascending=False)
-                fig, ax = plt.subplots(figsize=(10, 6))
-                avg_salary.plot(kind='bar', ax=ax, color='lightcoral')
-                ax.set_title(f'Average Salary by {selected_cat}')
-                plt.xticks(rotation=45)
-                st.pyplot(fig)
+                st.image(render_analysis_chart(dataset_stats.fingerprint, 'mean_salary', selected_cat, aggregates),
+                         use_container_width=True)
+
+def analysis_figure(chart, aggregates, column=None):
+    """
+    Build a Data Analysis figure from precomputed aggregates
+    """
+    if chart == 'salary':
+        # Salary distribution
+        fig, ax = plt.subplots(1, 2, figsize=(15, 6))
+        
+        # Histogram (drawn from precomputed bin counts)
+        histogram = aggregates['salary_histogram']
+        ax[0].bar(histogram['bin_start'], histogram['count'], width=histogram['bin_end'] - histogram['bin_start'],
+                  align='edge', alpha=0.7, color='skyblue', edgecolor='black')
+        ax[0].set_title('Salary Distribution')
+        ax[0].set_xlabel('Salary')
+        ax[0].set_ylabel('Frequency')
+        
+        # Box plot (drawn from precomputed quartiles and whiskers)
+        ax[1].bxp([aggregates['salary_box']])
+        ax[1].set_title('Salary Box Plot')
+        ax[1].set_ylabel('Salary')
+    elif chart == 'correlation':
+        fig, ax = plt.subplots(figsize=(10, 8))
+        sns.heatmap(aggregates['correlation'], annot=True, cmap='coolwarm', center=0, ax=ax)
+        ax.set_title('Correlation Matrix')
+    elif chart == 'value_counts':
+        fig, ax = plt.subplots(figsize=(10, 6))
+        aggregates['value_counts'][column].plot(kind='bar', ax=ax)
+        ax.set_title(f'{column} Distribution')
+        ax.tick_params(axis='x', rotation=45)
+    elif chart == 'mean_salary':
+        fig, ax = plt.subplots(figsize=(10, 6))
+        aggregates['mean_salary'][column].plot(kind='bar', ax=ax, color='lightcoral')
+        ax.set_title(f'Average Salary by {column}')
+        ax.tick_params(axis='x', rotation=45)
+    else:
+        raise ValueError(f"Unknown chart: {chart}")
+    
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_analysis_chart(dataset_fingerprint, chart, column, _aggregates):
+    """
+    PNG of a Data Analysis chart, drawn once per dataset, chart and column (with st.pyplot's savefig settings)
+    """
+    fig = analysis_figure(chart, _aggregates, column)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight', dpi=200)
+    plt.close(fig)
+    return buffer.getvalue()
 
 def show_model_training():
     st.markdown("## 🤖 Model Training & Evaluation")
@@ -314,7 +537,7 @@ def show_model_training():
         st.warning("⚠️ Please load data first from the Home page.")
         return
     
-    data = st.session_state.data
+    job = st.session_state.get('training_job')
     
     # Model configuration
     st.markdown("### ⚙️ Model Configuration")
@@ -331,82 +554,182 @@ def show_model_training():
             ["Linear Regression", "Random Forest", "Gradient Boosting"],
             default=["Linear Regression", "Random Forest", "Gradient Boosting"]
         )
+        enable_profiling = st.checkbox("🔬 Profile training stages", value=False,
+                                       help="Captures per-stage profiles and flamegraph stack files")
     
-    if st.button("🚀 Train Models"):
-        with st.spinner("Training models..."):
-            try:
-                # Initialize model trainer
-                trainer = ModelTrainer(data)
-                
-                # Train models
-                results = trainer.train_models(
-                    models_to_train=models_to_train,
-                    test_size=test_size,
-                    random_state=random_state
-                )
-                
-                st.session_state.model_trainer = trainer
-                st.session_state.predictor = SalaryPredictor(trainer.models, trainer.encoders, trainer.scaler)
-                
-                st.success("✅ Models trained successfully!")
-                
-                # Display results
-                st.markdown("### 📊 Model Performance")
-                
-                results_df = pd.DataFrame(results).T
-                results_df = results_df.round(4)
-                
-                # Color code the results
-                st.dataframe(results_df.style.highlight_max(axis=0, subset=['R² Score']))
-                
-                # Best model
-                best_model = results_df['R² Score'].idxmax()
-                st.markdown(f"""
-                <div class="prediction-result">
-                    <h3>🏆 Best Model: {best_model}</h3>
-                    <p>R² Score: {results_df.loc[best_model, 'R² Score']:.4f}</p>
-                    <p>RMSE: ${results_df.loc[best_model, 'RMSE']:,.0f}</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Model comparison chart
-                st.markdown("### 📈 Model Comparison")
-                
-                fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-                
-                # R² Score comparison
-                r2_scores = results_df['R² Score']
-                axes[0, 0].bar(r2_scores.index, r2_scores.values, color='skyblue')
-                axes[0, 0].set_title('R² Score Comparison')
-                axes[0, 0].set_ylabel('R² Score')
-                axes[0, 0].tick_params(axis='x', rotation=45)
-                
-                # RMSE comparison
-                rmse_scores = results_df['RMSE']
-                axes[0, 1].bar(rmse_scores.index, rmse_scores.values, color='lightcoral')
-                axes[0, 1].set_title('RMSE Comparison')
-                axes[0, 1].set_ylabel('RMSE')
-                axes[0, 1].tick_params(axis='x', rotation=45)
-                
-                # MAE comparison
-                mae_scores = results_df['MAE']
-                axes[1, 0].bar(mae_scores.index, mae_scores.values, color='lightgreen')
-                axes[1, 0].set_title('MAE Comparison')
-                axes[1, 0].set_ylabel('MAE')
-                axes[1, 0].tick_params(axis='x', rotation=45)
-                
-                # Training time comparison
-                train_time = results_df['Training Time (s)']
-                axes[1, 1].bar(train_time.index, train_time.values, color='gold')
-                axes[1, 1].set_title('Training Time Comparison')
-                axes[1, 1].set_ylabel('Time (seconds)')
-                axes[1, 1].tick_params(axis='x', rotation=45)
-                
-                plt.tight_layout()
-                st.pyplot(fig)
-                
-            except Exception as e:
-                st.error(f"❌ Error training models: {str(e)}")
+    if st.button("🚀 Train Models", disabled=job is not None):
+        st.session_state.training_job = start_training_job(
+            models_to_train, test_size, random_state, profiling_enabled(enable_profiling or None)
+        )
+        st.session_state.training_outcome = None
+        st.session_state.training_results = None
+    
+    if st.session_state.get('training_job') is not None:
+        show_training_progress()
+    
+    outcome = st.session_state.get('training_outcome')
+    if outcome is not None:
+        status, message = outcome
+        if status == COMPLETED:
+            st.success(message)
+        elif status == CANCELLED:
+            st.warning(message)
+        else:
+            st.error(message)
+    
+    if st.session_state.get('training_results') is not None:
+        show_training_results(st.session_state.training_results, st.session_state.model_trainer)
+
+def start_training_job(models_to_train, test_size, random_state, profile):
+    """
+    Start training the current dataset on a background thread
+    
+    Session state is only available to the script thread, so the data is
+    captured here.
+    """
+    data = st.session_state.data
+    
+    def train(progress_callback, cancel_event):
+        # Trained outside the shared model cache: cached functions must not run off the script thread
+        trainer = ModelTrainer(data)
+        results = trainer.train_models(
+            models_to_train=models_to_train,
+            test_size=test_size,
+            random_state=random_state,
+            profile=profile,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event
+        )
+        return trainer, SalaryPredictor(trainer.models, trainer.encoders, trainer.scaler), results
+    
+    return TrainingJob(train).start()
+
+def finish_training_job():
+    """
+    Swap a completed training job's models in and record its outcome
+    
+    Runs at the start of every script run, so the new models serve
+    predictions on whichever page the user has moved to.
+    """
+    job = st.session_state.get('training_job')
+    if job is None or not job.done:
+        return
+    
+    if job.status == COMPLETED:
+        trainer, predictor, results = job.result
+        # Swap the new models in together; predictions never see a partial set
+        st.session_state.model_trainer, st.session_state.predictor = trainer, predictor
+        record_model_ready('trained')
+        st.session_state.training_results = results
+        st.session_state.training_outcome = (COMPLETED, f"✅ Models trained successfully in {job.elapsed_s:.1f}s!")
+    elif job.status == CANCELLED:
+        st.session_state.training_outcome = (CANCELLED, "⏹️ Training cancelled; the previous models are still in use.")
+    else:
+        st.session_state.training_outcome = (FAILED, f"❌ Error training models: {str(job.error)}")
+    
+    st.session_state.training_job = None
+
+@st.fragment(run_every=1.0)
+def show_training_progress():
+    """
+    Poll the background training job, rerunning the app once it finishes
+    """
+    job = st.session_state.training_job
+    
+    if job.done:
+        # The full rerun swaps the models in (see finish_training_job)
+        st.rerun()
+    
+    st.progress(job.progress, text=f"⏳ {describe_event(job.latest_event)} ({job.elapsed_s:.0f}s)")
+    
+    if job.cancel_requested:
+        st.info("⏹️ Cancelling after the current training step...")
+    elif st.button("⏹️ Cancel Training"):
+        job.cancel()
+    
+    if st.session_state.predictor is not None:
+        st.info("🔮 The current models keep serving predictions until training finishes.")
+
+def show_training_results(results, trainer):
+    # Display results
+    st.markdown("### 📊 Model Performance")
+    
+    results_df = pd.DataFrame(results).T
+    results_df = results_df.round(4)
+    
+    # Color code the results
+    st.dataframe(results_df.style.highlight_max(axis=0, subset=['R² Score']))
+    
+    # Best model
+    best_model = results_df['R² Score'].idxmax()
+    st.markdown(f"""
+    <div class="prediction-result">
+        <h3>🏆 Best Model: {best_model}</h3>
+        <p>R² Score: {results_df.loc[best_model, 'R² Score']:.4f}</p>
+        <p>RMSE: ${results_df.loc[best_model, 'RMSE']:,.0f}</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Model comparison chart
+    st.markdown("### 📈 Model Comparison")
+    
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    
+    # R² Score comparison
+    r2_scores = results_df['R² Score']
+    axes[0, 0].bar(r2_scores.index, r2_scores.values, color='skyblue')
+    axes[0, 0].set_title('R² Score Comparison')
+    axes[0, 0].set_ylabel('R² Score')
+    axes[0, 0].tick_params(axis='x', rotation=45)
+    
+    # RMSE comparison
+    rmse_scores = results_df['RMSE']
+    axes[0, 1].bar(rmse_scores.index, rmse_scores.values, color='lightcoral')
+    axes[0, 1].set_title('RMSE Comparison')
+    axes[0, 1].set_ylabel('RMSE')
+    axes[0, 1].tick_params(axis='x', rotation=45)
+    
+    # MAE comparison
+    mae_scores = results_df['MAE']
+    axes[1, 0].bar(mae_scores.index, mae_scores.values, color='lightgreen')
+    axes[1, 0].set_title('MAE Comparison')
+    axes[1, 0].set_ylabel('MAE')
+    axes[1, 0].tick_params(axis='x', rotation=45)
+    
+    # Training time comparison
+    train_time = results_df['Training Time (s)']
+    axes[1, 1].bar(train_time.index, train_time.values, color='gold')
+    axes[1, 1].set_title('Training Time Comparison')
+    axes[1, 1].set_ylabel('Time (seconds)')
+    axes[1, 1].tick_params(axis='x', rotation=45)
+    
+    plt.tight_layout()
+    st.pyplot(fig)
+    
+    if trainer is not None and st.button("💾 Save Models for Warm Start"):
+        try:
+            trainer.save_models(get_model_path())
+            st.success(f"✅ Models saved to {get_model_path()}; new sessions and restarts will load them instead of training.")
+        except Exception as e:
+            st.error(f"❌ Error saving models: {str(e)}")
+    
+    # Profiling summary
+    if trainer is not None and trainer.profiler is not None:
+        st.markdown("### 🔬 Profiling Hot Spots")
+        hot_functions = pd.DataFrame(trainer.profiler.get_hot_functions(top_n=15))
+        st.dataframe(hot_functions.round(4), use_container_width=True)
+        st.info(f"📂 Collapsed stacks for flamegraph tools written to: {trainer.profiler.output_dir}")
+
+def get_percentile_index():
+    """
+    Get the salary percentile index for the current dataset, maintained with its cached statistics
+    
+    Returns None when no dataset (or no salary column) is loaded.
+    """
+    dataset_stats = get_dataset_stats()
+    if dataset_stats is None:
+        return None
+    return dataset_stats.percentile_index
 
 def show_prediction_page():
     st.markdown("## 🔮 Salary Prediction")
@@ -416,16 +739,16 @@ def show_prediction_page():
         if st.session_state.data is None:
             st.info("🔄 Loading data and training models automatically...")
             with st.spinner("Generating synthetic data..."):
-                st.session_state.data = generate_synthetic_data()
+                st.session_state.data = load_synthetic_dataset()
                 st.success("✅ Data loaded successfully!")
         
         if st.session_state.model_trainer is None:
             with st.spinner("Training machine learning models..."):
                 try:
-                    trainer = ModelTrainer(st.session_state.data)
-                    results = trainer.train_models()
+                    trainer, predictor, results = get_trained_models()
                     st.session_state.model_trainer = trainer
-                    st.session_state.predictor = SalaryPredictor(trainer.models, trainer.encoders, trainer.scaler)
+                    st.session_state.predictor = predictor
+                    record_model_ready('trained')
                     st.success("✅ Models trained successfully!")
                 except Exception as e:
                     st.error(f"❌ Error training models: {str(e)}")
@@ -433,6 +756,17 @@ def show_prediction_page():
     
     predictor = st.session_state.predictor
     
+    startup_metrics = get_startup_metrics()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("🧠 Models", {'artifact': "Persisted", 'trained': "Trained in app"}.get(startup_metrics['model_source'], "N/A"))
+    with col2:
+        if startup_metrics['model_ready_s'] is not None:
+            st.metric("⏱️ Models Ready After Startup", f"{startup_metrics['model_ready_s']:.2f}s")
+    with col3:
+        if startup_metrics['first_prediction_s'] is not None:
+            st.metric("🚀 Time to First Prediction", f"{startup_metrics['first_prediction_s']:.2f}s")
+    
     # Input form
     st.markdown("### 📝 Employee Information")
     
@@ -487,6 +821,7 @@ def show_prediction_page():
                 
                 # Make prediction
                 prediction = predictor.predict(input_data)
+                record_prediction()
                 
                 # Display prediction
                 st.markdown("### 🎯 Prediction Results")
@@ -518,11 +853,12 @@ def show_prediction_page():
                     """, unsafe_allow_html=True)
                 
                 with col3:
-                    # Market comparison
-                    if 'salary' in st.session_state.data.columns:
-                        market_avg = st.session_state.data['salary'].mean()
+                    # Market comparison (defaults when models were warm-started without a dataset)
+                    percentile_index = get_percentile_index()
+                    if percentile_index is not None:
+                        market_avg = get_dataset_stats().column_summary('salary')['mean']
                         percentile = (prediction / market_avg - 1) * 100
-                        percentile_rank = (st.session_state.data['salary'] <= prediction).mean() * 100
+                        percentile_rank = percentile_index.rank(prediction)
                     else:
                         market_avg = 75000  # Default average
                         percentile = (prediction / market_avg - 1) * 100
@@ -540,16 +876,18 @@ def show_prediction_page():
                 # Multi-currency display
                 st.markdown("### 💱 Multi-Currency Conversion")
                 
-                currencies = get_currency_rates()
-                currency_cols = st.columns(len(currencies))
+                # All currencies converted and formatted in one pass
+                rate_vector = get_rate_vector()
+                converted_amounts = convert_salaries([prediction])[0]
+                formatted_amounts = format_currency_array(converted_amounts[np.newaxis, :], CURRENCY_CODES)[0]
+                currency_cols = st.columns(len(CURRENCY_CODES))
                 
-                for i, (currency, rate) in enumerate(currencies.items()):
+                for i, currency in enumerate(CURRENCY_CODES):
                     with currency_cols[i]:
-                        converted_amount = prediction * rate
                         st.metric(
                             f"{currency}",
-                            format_currency(converted_amount, currency),
-                            f"Rate: {rate:.4f}"
+                            formatted_amounts[i],
+                            f"Rate: {rate_vector[i]:.4f}"
                         )
                 
             except Exception as e:
@@ -573,32 +911,44 @@ def show_visualizations():
     if viz_type == "📊 Salary Distribution":
         st.subheader("💰 Salary Distribution Analysis")
         
-        # Interactive histogram
-        fig = px.histogram(
-            data, 
-            x='salary', 
-            nbins=30, 
-            title='Salary Distribution',
-            labels={'salary': 'Salary (USD)', 'count': 'Frequency'}
-        )
+        # Interactive histogram (large datasets are binned here rather than in the browser)
+        if len(data) > MAX_CHART_POINTS:
+            histogram = get_salary_histogram(get_dataset_stats().fingerprint, 30, data)
+            fig = px.bar(
+                histogram,
+                x='bin_center',
+                y='count',
+                title='Salary Distribution',
+                labels={'bin_center': 'Salary (USD)', 'count': 'Frequency'}
+            )
+            fig.update_traces(width=histogram['bin_end'] - histogram['bin_start'])
+        else:
+            fig = px.histogram(
+                data, 
+                x='salary', 
+                nbins=30, 
+                title='Salary Distribution',
+                labels={'salary': 'Salary (USD)', 'count': 'Frequency'}
+            )
         st.plotly_chart(fig, use_container_width=True)
         
         # Statistics
+        salary_summary = get_dataset_stats().column_summary('salary')
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Mean", f"${data['salary'].mean():,.0f}")
+            st.metric("Mean", f"${salary_summary['mean']:,.0f}")
         with col2:
-            st.metric("Median", f"${data['salary'].median():,.0f}")
+            st.metric("Median", f"${salary_summary['50%']:,.0f}")
         with col3:
-            st.metric("Std Dev", f"${data['salary'].std():,.0f}")
+            st.metric("Std Dev", f"${salary_summary['std']:,.0f}")
         with col4:
-            st.metric("Range", f"${data['salary'].max() - data['salary'].min():,.0f}")
+            st.metric("Range", f"${salary_summary['max'] - salary_summary['min']:,.0f}")
     
     elif viz_type == "🔗 Feature Relationships":
         st.subheader("🔍 Feature Relationship Analysis")
         
         # Select features for comparison
-        categorical_cols = data.select_dtypes(include=['object']).columns.tolist()
+        categorical_cols = data.select_dtypes(include=['object', 'category']).columns.tolist()
         numerical_cols = data.select_dtypes(include=[np.number]).columns.tolist()
         
         col1, col2 = st.columns(2)
@@ -608,8 +958,13 @@ def show_visualizations():
         with col2:
             color_feature = st.selectbox("Color by:", categorical_cols, index=0)
         
-        # Create visualization based on feature types
-        if x_feature in categorical_cols:
+        # Create visualization based on feature types; large datasets send aggregates or a sample
+        large_dataset = len(data) > MAX_CHART_POINTS
+        if x_feature in categorical_cols and large_dataset:
+            stats = get_box_statistics(get_dataset_stats().fingerprint, (x_feature, color_feature), data)
+            fig = box_figure(stats, x_feature, color_feature, f'Salary Distribution by {x_feature}')
+            st.caption(f"📦 Box plots computed from all {len(data):,} records (outlier points omitted)")
+        elif x_feature in categorical_cols:
             fig = px.box(
                 data, 
                 x=x_feature, 
@@ -617,9 +972,21 @@ def show_visualizations():
                 color=color_feature,
                 title=f'Salary Distribution by {x_feature}'
             )
+        elif large_dataset and st.radio("Large dataset view:", ["🔥 Density", "🎯 Stratified Sample"], horizontal=True) == "🔥 Density":
+            x_centers, y_centers, counts = get_density_grid(get_dataset_stats().fingerprint, x_feature, 'salary', data)
+            fig = go.Figure(go.Heatmap(x=x_centers, y=y_centers, z=counts, colorscale='Viridis',
+                                       colorbar={'title': 'Records'}))
+            fig.update_layout(title=f'Salary vs {x_feature} (density of all {len(data):,} records)',
+                              xaxis_title=x_feature, yaxis_title='salary')
         else:
+            plot_data = data
+            if large_dataset:
+                plot_data = get_chart_sample(get_dataset_stats().fingerprint, (x_feature, 'salary', color_feature),
+                                             color_feature, data)
+                st.caption(f"🎯 Showing a {len(plot_data):,}-record sample stratified by {color_feature} "
+                           f"(of {len(data):,})")
             fig = px.scatter(
-                data, 
+                plot_data, 
                 x=x_feature, 
                 y='salary',
                 color=color_feature,
@@ -634,7 +1001,7 @@ def show_visualizations():
         # Group by categorical variable
         group_by = st.selectbox(
             "Group by:",
-            data.select_dtypes(include=['object']).columns.tolist()
+            data.select_dtypes(include=['object', 'category']).columns.tolist()
         )
         
         # Calculate average salary by group
@@ -660,7 +1027,7 @@ def show_visualizations():
         
         # Select features for 3D plot
         numerical_cols = data.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = data.select_dtypes(include=['object']).columns.tolist()
+        categorical_cols = data.select_dtypes(include=['object', 'category']).columns.tolist()
         
         col1, col2, col3 = st.columns(3)
         
@@ -671,9 +1038,15 @@ def show_visualizations():
         with col3:
             color_feature = st.selectbox("Color by:", categorical_cols, index=0)
         
-        # Create 3D scatter plot
+        # Create 3D scatter plot (from a stratified sample for large datasets)
+        plot_data = data
+        if len(data) > MAX_CHART_POINTS:
+            plot_data = get_chart_sample(get_dataset_stats().fingerprint, (x_feature, y_feature, 'salary', color_feature),
+                                         color_feature, data)
+            st.caption(f"🎯 Showing a {len(plot_data):,}-record sample stratified by {color_feature} (of {len(data):,})")
+        
         fig = px.scatter_3d(
-            data,
+            plot_data,
             x=x_feature,
             y=y_feature,
             z='salary',
@@ -700,30 +1073,13 @@ def show_currency_converter():
     
     if st.button("🔄 Convert"):
         try:
-            # Get exchange rates
-            rates = get_currency_rates()
-            
-            # Convert to USD first, then to target currency
-            if from_currency == "USD":
-                usd_amount = amount
-            else:
-                usd_amount = amount / rates[from_currency]
-            
-            if to_currency == "USD":
-                converted_amount = usd_amount
-            else:
-                converted_amount = usd_amount * rates[to_currency]
+            converted_amount = convert_salary_currency(amount, from_currency, to_currency)
             
             st.success(f"💱 {format_currency(amount, from_currency)} = {format_currency(converted_amount, to_currency)}")
             
             # Show exchange rate
             if from_currency != to_currency:
-                if from_currency == "USD":
-                    rate = rates[to_currency]
-                elif to_currency == "USD":
-                    rate = 1 / rates[from_currency]
-                else:
-                    rate = rates[to_currency] / rates[from_currency]
+                rate = convert_salary_currency(1.0, from_currency, to_currency)
                 
                 st.info(f"📊 Exchange Rate: 1 {from_currency} = {rate:.4f} {to_currency}")
             
@@ -0,0 +1,180 @@
+import argparse
+import json
+import sys
+import numpy as np
+
+from benchmark_io import load_results
+
+def bootstrap_ratio_interval(baseline_times, candidate_times, confidence=0.95,
+                             n_resamples=2000, random_state=0):
+    """
+    Bootstrap a confidence interval for median(candidate) / median(baseline)
+    """
+    rng = np.random.default_rng(random_state)
+    baseline = np.asarray(baseline_times, dtype=float)
+    candidate = np.asarray(candidate_times, dtype=float)
+
+    baseline_samples = rng.choice(baseline, size=(n_resamples, len(baseline)), replace=True)
+    candidate_samples = rng.choice(candidate, size=(n_resamples, len(candidate)), replace=True)
+
+    ratios = np.median(candidate_samples, axis=1) / np.median(baseline_samples, axis=1)
+
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(ratios, [alpha, 1 - alpha])
+
+    return float(lower), float(upper)
+
+def compare_benchmark(baseline, candidate, threshold=0.10, confidence=0.95, min_repeats=3):
+    """
+    Compare one benchmark between two runs.
+
+    A regression is only reported when the whole confidence interval of the
+    median ratio lies above ``1 + threshold``, so noisy benchmarks need a
+    consistent slowdown to fail. With fewer than ``min_repeats`` timings on
+    either side no interval is computed and the point ratio is used instead.
+    """
+    baseline_median = float(np.median(baseline['times']))
+    candidate_median = float(np.median(candidate['times']))
+    ratio = candidate_median / baseline_median if baseline_median > 0 else float('inf')
+
+    enough_repeats = len(baseline['times']) >= min_repeats and len(candidate['times']) >= min_repeats
+
+    if enough_repeats:
+        lower, upper = bootstrap_ratio_interval(baseline['times'], candidate['times'], confidence)
+    else:
+        lower = upper = ratio
+
+    if lower > 1 + threshold:
+        status = 'regression'
+    elif upper < 1 - threshold:
+        status = 'improvement'
+    else:
+        status = 'unchanged'
+
+    return {
+        'stage': candidate.get('stage') or baseline.get('stage'),
+        'baseline_median': baseline_median,
+        'candidate_median': candidate_median,
+        'ratio': ratio,
+        'ratio_lower': lower,
+        'ratio_upper': upper,
+        'baseline_repeats': len(baseline['times']),
+        'candidate_repeats': len(candidate['times']),
+        'low_confidence': not enough_repeats,
+        'status': status
+    }
+
+def compare_results(baseline_results, candidate_results, threshold=0.10, confidence=0.95,
+                    min_repeats=3, stages=None):
+    """
+    Compare two benchmark result sets and build a pass/fail report
+
+    The comparison fails on any regression and on any baseline benchmark
+    (within ``stages``) that the candidate run did not report.
+    """
+    baseline_benchmarks = baseline_results['benchmarks']
+    candidate_benchmarks = candidate_results['benchmarks']
+
+    comparisons = {}
+    for name, candidate in candidate_benchmarks.items():
+        if name not in baseline_benchmarks:
+            continue
+        if stages and candidate.get('stage') not in stages:
+            continue
+
+        comparisons[name] = compare_benchmark(
+            baseline_benchmarks[name], candidate,
+            threshold=threshold, confidence=confidence, min_repeats=min_repeats
+        )
+
+    regressions = [name for name, result in comparisons.items() if result['status'] == 'regression']
+    # A benchmark that stopped running (renamed, crashed or skipped) fails the comparison
+    missing = sorted(
+        name for name, baseline in baseline_benchmarks.items()
+        if name not in candidate_benchmarks and (not stages or baseline.get('stage') in stages)
+    )
+
+    return {
+        'baseline_commit': baseline_results.get('metadata', {}).get('commit'),
+        'candidate_commit': candidate_results.get('metadata', {}).get('commit'),
+        'threshold': threshold,
+        'confidence': confidence,
+        'comparisons': comparisons,
+        'regressions': regressions,
+        'missing_in_candidate': missing,
+        'new_in_candidate': sorted(set(candidate_benchmarks) - set(baseline_benchmarks)),
+        'passed': not regressions and not missing
+    }
+
+def format_report(report):
+    """
+    Format a comparison report as a text table
+    """
+    lines = [
+        f"Baseline:  {report['baseline_commit']}",
+        f"Candidate: {report['candidate_commit']}",
+        f"Threshold: {report['threshold']:.0%} at {report['confidence']:.0%} confidence",
+        "",
+        f"{'Benchmark':<50} {'Baseline':>10} {'Candidate':>10} {'Ratio':>7} {'CI':>15}  Status"
+    ]
+
+    for name, result in report['comparisons'].items():
+        interval = f"[{result['ratio_lower']:.2f}, {result['ratio_upper']:.2f}]"
+        status = result['status'].upper() if result['status'] == 'regression' else result['status']
+        if result['low_confidence']:
+            status += ' (few repeats)'
+
+        lines.append(
+            f"{name:<50} {result['baseline_median']:>9.4f}s {result['candidate_median']:>9.4f}s "
+            f"{result['ratio']:>6.2f}x {interval:>15}  {status}"
+        )
+
+    for name in report['missing_in_candidate']:
+        lines.append(f"{name:<50} MISSING from candidate run")
+
+    lines.append("")
+    if report['passed']:
+        lines.append("PASS: no regressions above threshold")
+    if report['regressions']:
+        lines.append(f"FAIL: {len(report['regressions'])} regression(s): {', '.join(report['regressions'])}")
+    if report['missing_in_candidate']:
+        lines.append(
+            f"FAIL: {len(report['missing_in_candidate'])} benchmark(s) missing from candidate: "
+            f"{', '.join(report['missing_in_candidate'])}"
+        )
+
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark runs and flag regressions')
+    parser.add_argument('baseline', help='Baseline results JSON')
+    parser.add_argument('candidate', help='Candidate results JSON')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative slowdown that counts as a regression (default: 0.10)')
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--min-repeats', type=int, default=3,
+                        help='Repeats needed on both sides before a confidence interval is used')
+    parser.add_argument('--stages', nargs='+', default=None,
+                        help='Only compare these stages (e.g. generation fit predict_batch)')
+    parser.add_argument('--json', dest='json_output', default=None, help='Also write the report as JSON')
+    args = parser.parse_args(argv)
+
+    report = compare_results(
+        load_results(args.baseline),
+        load_results(args.candidate),
+        threshold=args.threshold,
+        confidence=args.confidence,
+        min_repeats=args.min_repeats,
+        stages=args.stages
+    )
+
+    print(format_report(report))
+
+    if args.json_output:
+        with open(args.json_output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    return 0 if report['passed'] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
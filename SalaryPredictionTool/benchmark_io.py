@@ -0,0 +1,22 @@
+import json
+import os
+
+def save_results(results, filepath):
+    """
+    Save benchmark results as JSON
+    """
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(filepath, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"Benchmark results saved to {filepath}")
+
+def load_results(filepath):
+    """
+    Load benchmark results from JSON
+    """
+    with open(filepath) as f:
+        return json.load(f)
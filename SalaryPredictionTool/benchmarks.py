@@ -0,0 +1,242 @@
+import argparse
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import sklearn
+import warnings
+warnings.filterwarnings('ignore')
+
+from benchmark_io import save_results
+from data_generator import generate_synthetic_data
+from model_trainer import ModelTrainer
+from predictor import SalaryPredictor
+from utils import benchmark_salary, build_benchmark_index, calculate_salary_statistics
+
+DEFAULT_GENERATION_SIZES = [1000, 100000, 1000000]
+DEFAULT_MODELS = ["Linear Regression", "Random Forest", "Gradient Boosting"]
+
+SAMPLE_PROFILE = {
+    'age': 30,
+    'gender': 'Male',
+    'education': "Bachelor's",
+    'experience': 5,
+    'job_title': 'Software Engineer',
+    'location': 'New York, NY',
+    'industry': 'Technology',
+    'company_size': 'Medium (51-200)',
+    'remote_work': 'No'
+}
+
+def time_callable(func, repeats=5, warmup=0, max_time=60.0, setup=None):
+    """
+    Time repeated calls of func, stopping early once max_time seconds have been spent.
+
+    ``setup`` (if given) runs untimed before every call and its return value is
+    passed to ``func``. At least one timed call is always made.
+    """
+    for _ in range(warmup):
+        func(setup()) if setup else func()
+
+    times = []
+    budget_start = time.perf_counter()
+
+    for _ in range(repeats):
+        args = (setup(),) if setup else ()
+
+        start_time = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start_time)
+
+        if time.perf_counter() - budget_start > max_time:
+            break
+
+    return times
+
+def _summarize(times, rows=None, stage=None):
+    """
+    Summarize timings for one benchmark
+    """
+    summary = {
+        'stage': stage,
+        'times': times,
+        'repeats': len(times),
+        'median': float(np.median(times)),
+        'mean': float(np.mean(times)),
+        'min': float(np.min(times)),
+        'max': float(np.max(times)),
+        'unit': 's'
+    }
+
+    if rows:
+        summary['rows'] = rows
+        summary['rows_per_second'] = rows / summary['median'] if summary['median'] > 0 else 0.0
+
+    return summary
+
+def get_run_metadata():
+    """
+    Describe the environment and commit a benchmark run was made on
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        commit = None
+
+    return {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+def run_benchmarks(generation_sizes=None, models=None, train_rows=10000, analysis_rows=100000,
+                   predict_batch_rows=10000, repeats=5, max_time=60.0, verbose=True):
+    """
+    Run the generate -> train -> predict benchmark suite and return the results
+    """
+    if generation_sizes is None:
+        generation_sizes = DEFAULT_GENERATION_SIZES
+    if models is None:
+        models = DEFAULT_MODELS
+
+    benchmarks = {}
+
+    def record(name, times, rows=None, stage=None):
+        benchmarks[name] = _summarize(times, rows=rows, stage=stage)
+        if verbose:
+            result = benchmarks[name]
+            print(f"  {name}: median {result['median']:.4f}s over {result['repeats']} run(s)")
+
+    if verbose:
+        print("Benchmarking data generation...")
+    for size in generation_sizes:
+        times = time_callable(lambda: generate_synthetic_data(size), repeats=repeats, max_time=max_time)
+        record(f"generate_synthetic_data[{size}]", times, rows=size, stage='generation')
+
+    train_data = generate_synthetic_data(train_rows)
+
+    if verbose:
+        print("Benchmarking preprocessing and training...")
+    times = time_callable(lambda trainer: trainer.preprocess_data(),
+                          setup=lambda: ModelTrainer(train_data),
+                          repeats=repeats, max_time=max_time)
+    record(f"preprocess_data[{train_rows}]", times, rows=train_rows, stage='preprocessing')
+
+    for model_name in models:
+        times = time_callable(lambda trainer: trainer.train_models(models_to_train=[model_name]),
+                              setup=lambda: ModelTrainer(train_data),
+                              repeats=repeats, max_time=max_time)
+        record(f"train_models[{model_name}]", times, rows=train_rows, stage='fit')
+
+    trainer = ModelTrainer(train_data)
+    trainer.train_models(models_to_train=models)
+    predictor = SalaryPredictor(trainer.models, trainer.encoders, trainer.scaler, trainer.feature_columns)
+
+    if verbose:
+        print("Benchmarking prediction...")
+    batch = train_data.drop(columns=['salary']).sample(
+        predict_batch_rows, replace=True, random_state=0
+    ).reset_index(drop=True)
+
+    for model_name in models:
+        times = time_callable(lambda: predictor.predict(SAMPLE_PROFILE, model_name),
+                              repeats=max(repeats, 20), warmup=1, max_time=max_time)
+        record(f"predict_single[{model_name}]", times, rows=1, stage='predict_single')
+
+        times = time_callable(lambda: predictor.predict_batch(batch, model_name),
+                              repeats=repeats, warmup=1, max_time=max_time)
+        record(f"predict_batch[{model_name}]", times, rows=predict_batch_rows, stage='predict_batch')
+
+    if verbose:
+        print("Benchmarking analysis utilities...")
+    analysis_data = train_data.sample(analysis_rows, replace=True, random_state=0).reset_index(drop=True)
+
+    times = time_callable(lambda: benchmark_salary(SAMPLE_PROFILE, analysis_data),
+                          repeats=max(repeats, 20), max_time=max_time)
+    record(f"benchmark_salary[{analysis_rows}]", times, rows=analysis_rows, stage='analysis')
+
+    benchmark_index = build_benchmark_index(analysis_data)
+    times = time_callable(lambda: benchmark_salary(SAMPLE_PROFILE, analysis_data, index=benchmark_index),
+                          repeats=max(repeats, 20), max_time=max_time)
+    record(f"benchmark_salary_indexed[{analysis_rows}]", times, rows=analysis_rows, stage='analysis')
+
+    times = time_callable(lambda: calculate_salary_statistics(analysis_data),
+                          repeats=repeats, max_time=max_time)
+    record(f"calculate_salary_statistics[{analysis_rows}]", times, rows=analysis_rows, stage='analysis')
+
+    times = time_callable(lambda: calculate_salary_statistics(analysis_data, group_by_column='job_title'),
+                          repeats=repeats, max_time=max_time)
+    record(f"calculate_salary_statistics[{analysis_rows},job_title]", times,
+           rows=analysis_rows, stage='analysis')
+
+    return {
+        'metadata': get_run_metadata(),
+        'parameters': {
+            'generation_sizes': generation_sizes,
+            'models': models,
+            'train_rows': train_rows,
+            'analysis_rows': analysis_rows,
+            'predict_batch_rows': predict_batch_rows,
+            'repeats': repeats,
+            'max_time': max_time
+        },
+        'benchmarks': benchmarks
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the generate -> train -> predict pipeline')
+    parser.add_argument('--output', default=None,
+                        help='Results file (default: benchmark_results/<commit>.json)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_GENERATION_SIZES,
+                        help='Row counts for generate_synthetic_data')
+    parser.add_argument('--models', nargs='+', default=DEFAULT_MODELS)
+    parser.add_argument('--train-rows', type=int, default=10000)
+    parser.add_argument('--analysis-rows', type=int, default=100000)
+    parser.add_argument('--predict-batch-rows', type=int, default=10000)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-time', type=float, default=60.0,
+                        help='Stop repeating a benchmark once it has used this many seconds')
+    parser.add_argument('--quick', action='store_true',
+                        help='Small sizes and few repeats, for smoke-testing the suite')
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.sizes = [1000]
+        args.train_rows = 2000
+        args.analysis_rows = 10000
+        args.predict_batch_rows = 1000
+        args.repeats = 3
+
+    results = run_benchmarks(
+        generation_sizes=args.sizes,
+        models=args.models,
+        train_rows=args.train_rows,
+        analysis_rows=args.analysis_rows,
+        predict_batch_rows=args.predict_batch_rows,
+        repeats=args.repeats,
+        max_time=args.max_time
+    )
+
+    output = args.output
+    if output is None:
+        commit = results['metadata']['commit'] or 'uncommitted'
+        output = os.path.join('benchmark_results', f"{commit[:12]}.json")
+
+    save_results(results, output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
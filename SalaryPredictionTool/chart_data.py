@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+# Most rows sent to the browser for one chart; larger datasets are aggregated or sampled first
+MAX_CHART_POINTS = 10000
+
+def stratified_sample(df, by=None, max_rows=MAX_CHART_POINTS, random_state=42):
+    """
+    Sample at most about max_rows rows, keeping each group's share of the data
+
+    Every group of ``by`` keeps a proportional number of rows and at least
+    one, so rare categories still appear (the result may exceed max_rows by
+    up to the number of groups). Row order is preserved. Frames already within
+    max_rows are returned unchanged.
+    """
+    if len(df) <= max_rows:
+        return df
+
+    rng = np.random.default_rng(random_state)
+    if by is None:
+        return df.iloc[np.sort(rng.choice(len(df), size=max_rows, replace=False))]
+
+    positions = rng.permutation(len(df))
+    grouper = df.iloc[positions].groupby(by, observed=True, dropna=False, sort=False)
+    rank = grouper.cumcount().to_numpy()
+    group_ids = grouper.ngroup().to_numpy()
+
+    group_sizes = np.bincount(group_ids)[group_ids]
+    quota = np.maximum(1, np.floor(group_sizes * max_rows / len(df)))
+
+    return df.iloc[np.sort(positions[rank < quota])]
+
+def histogram_counts(values, bins=30):
+    """
+    Histogram of all non-missing values as a small frame of bin edges, centers and counts
+    """
+    values = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy()
+    counts, edges = np.histogram(values, bins=bins)
+
+    return pd.DataFrame({
+        'bin_start': edges[:-1],
+        'bin_end': edges[1:],
+        'bin_center': (edges[:-1] + edges[1:]) / 2,
+        'count': counts
+    })
+
+def density_grid(x_values, y_values, bins=60):
+    """
+    Binned 2-D histogram of paired values (rows with a missing value are skipped)
+
+    Returns (x_centers, y_centers, counts) with counts shaped (len(y_centers),
+    len(x_centers)), the layout heatmaps expect.
+    """
+    x_values = pd.to_numeric(pd.Series(x_values), errors='coerce').to_numpy(dtype=float)
+    y_values = pd.to_numeric(pd.Series(y_values), errors='coerce').to_numpy(dtype=float)
+    valid = ~(np.isnan(x_values) | np.isnan(y_values))
+
+    counts, x_edges, y_edges = np.histogram2d(x_values[valid], y_values[valid], bins=bins)
+
+    return (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, counts.T
+
+def box_statistics(df, value, by):
+    """
+    Box-plot statistics of a numeric column for each group of the by columns
+
+    Quartiles use pandas' linear interpolation; whiskers reach the most
+    extreme values within 1.5 IQR of the box (Tukey), as plotly draws them.
+    Returns one row per group with q1, median, q3, lower_whisker,
+    upper_whisker, mean, count and outliers.
+    """
+    by = list(dict.fromkeys([by] if isinstance(by, str) else by))
+    data = df[by + [value]].dropna(subset=[value])
+    values = data[value]
+    groups = values.groupby([data[col] for col in by], observed=True)
+
+    q1 = groups.transform('quantile', 0.25)
+    q3 = groups.transform('quantile', 0.75)
+    iqr = q3 - q1
+    within = values.between(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+
+    stats = groups.agg(['mean', 'count'])
+    stats['q1'] = groups.quantile(0.25)
+    stats['median'] = groups.median()
+    stats['q3'] = groups.quantile(0.75)
+
+    whiskers = values[within].groupby([data.loc[within, col] for col in by], observed=True).agg(['min', 'max'])
+    stats['lower_whisker'] = whiskers['min']
+    stats['upper_whisker'] = whiskers['max']
+    stats['outliers'] = stats['count'] - within.groupby([data[col] for col in by], observed=True).sum()
+
+    columns = ['q1', 'median', 'q3', 'lower_whisker', 'upper_whisker', 'mean', 'count', 'outliers']
+    return stats[columns].reset_index()
+
+def box_summary(values, max_fliers=500):
+    """
+    Box-plot statistics of one numeric column in the format matplotlib's Axes.bxp takes
+
+    Matches Axes.boxplot's defaults (linear-interpolated quartiles, whiskers
+    at the most extreme values within 1.5 IQR). At most max_fliers outliers
+    are kept, evenly spaced through their sorted values so the extremes stay.
+    """
+    values = np.sort(pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy(dtype=float))
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+
+    low_edge = np.searchsorted(values, q1 - 1.5 * iqr, side='left')
+    high_edge = np.searchsorted(values, q3 + 1.5 * iqr, side='right')
+    fliers = np.concatenate([values[:low_edge], values[high_edge:]])
+    if len(fliers) > max_fliers:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, max_fliers).round().astype(int)]
+
+    return {
+        'med': median,
+        'q1': q1,
+        'q3': q3,
+        # Whiskers never fall inside the box, as in matplotlib
+        'whislo': min(values[low_edge], q1) if low_edge < len(values) else q1,
+        'whishi': max(values[high_edge - 1], q3) if high_edge > 0 else q3,
+        'mean': values.mean(),
+        'fliers': fliers
+    }
+
+def analysis_aggregates(df, bins=30):
+    """
+    Everything the Data Analysis charts need, computed in one pass over the data
+
+    Returns a dict of small results (histogram, salary box statistics,
+    correlation matrix and per-category value counts and mean salaries)
+    whose size depends on the number of columns and categories, not rows.
+    """
+    numeric_columns = df.select_dtypes(include=[np.number]).columns
+    categorical_columns = df.select_dtypes(include=['object', 'category']).columns
+
+    return {
+        'salary_histogram': histogram_counts(df['salary'], bins=bins),
+        'salary_box': box_summary(df['salary']),
+        'correlation': df[numeric_columns].corr() if len(numeric_columns) > 1 else None,
+        'categorical_columns': categorical_columns.tolist(),
+        'value_counts': {col: df[col].value_counts() for col in categorical_columns},
+        'mean_salary': {
+            col: df.groupby(col, observed=True)['salary'].mean().sort_values(ascending=False)
+            for col in categorical_columns
+        }
+    }
+
+if __name__ == "__main__":
+    import time
+    from data_generator import generate_synthetic_data
+
+    data = pd.concat([generate_synthetic_data(10000)] * 100, ignore_index=True)
+    data['education'] = data['education'].astype('category')
+
+    start_time = time.perf_counter()
+    sample = stratified_sample(data, by='education')
+    print(f"Stratified sample: {len(sample)} of {len(data)} rows in {time.perf_counter() - start_time:.3f}s")
+    print(pd.DataFrame({
+        'full': data['education'].value_counts(normalize=True),
+        'sample': sample['education'].value_counts(normalize=True)
+    }).round(3))
+
+    start_time = time.perf_counter()
+    x_centers, y_centers, counts = density_grid(data['experience'], data['salary'])
+    print(f"Density grid {counts.shape} in {time.perf_counter() - start_time:.3f}s")
+
+    start_time = time.perf_counter()
+    stats = box_statistics(data, 'salary', ['education'])
+    print(f"Box statistics in {time.perf_counter() - start_time:.3f}s")
+    print(stats.round(0))
+
+    start_time = time.perf_counter()
+    aggregates = analysis_aggregates(data)
+    print(f"Data Analysis aggregates in {time.perf_counter() - start_time:.3f}s")
@@ -0,0 +1,235 @@
+import argparse
+import os
+import sys
+import time
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+from predictor import load_predictor
+
+def _file_format(path, explicit_format=None):
+    """
+    Determine the file format from an explicit option or the file extension
+    """
+    if explicit_format:
+        return explicit_format.lower()
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    if extension == '.csv':
+        return 'csv'
+
+    raise ValueError(f"Cannot infer file format from {path}; pass --input-format/--output-format")
+
+def iter_input_chunks(path, chunksize, file_format=None):
+    """
+    Stream an input CSV or Parquet file as DataFrame chunks
+    """
+    file_format = _file_format(path, file_format)
+
+    if file_format == 'csv':
+        yield from pd.read_csv(path, chunksize=chunksize)
+    elif file_format == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet files requires pyarrow (pip install pyarrow)")
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+def _parquet_schema(table):
+    """
+    Output schema fixed from the first chunk, widened so later chunks can be cast to it
+
+    Chunks are typed independently, so integer columns are written as
+    float64 (a later chunk may have missing values) and columns with no
+    values in the first chunk as strings (their type is not known yet).
+    """
+    import pyarrow as pa
+
+    fields = []
+    for field, column in zip(table.schema, table.columns):
+        if column.null_count == len(column):
+            field = field.with_type(pa.large_string())
+        elif pa.types.is_integer(field.type):
+            field = field.with_type(pa.float64())
+        fields.append(field)
+
+    return pa.schema(fields)
+
+class ChunkWriter:
+    """
+    Append scored chunks to a CSV or Parquet output file
+    """
+
+    def __init__(self, path, file_format=None):
+        self.path = path
+        self.file_format = _file_format(path, file_format)
+        self._parquet_writer = None
+        self._header_written = False
+        self.schema = None
+        self.started = False
+
+    def write(self, chunk):
+        self.started = True
+        if self.file_format == 'csv':
+            chunk.to_csv(self.path, mode='a' if self._header_written else 'w',
+                         header=not self._header_written, index=False)
+            self._header_written = True
+        elif self.file_format == 'parquet':
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Writing Parquet files requires pyarrow (pip install pyarrow)")
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self.schema = _parquet_schema(table)
+                self._parquet_writer = pq.ParquetWriter(self.path, self.schema)
+
+            try:
+                table = table.cast(self.schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError) as e:
+                raise ValueError(f"Chunk does not match the output schema {self.schema}: {e}")
+            self._parquet_writer.write_table(table)
+        else:
+            raise ValueError(f"Unsupported format: {self.file_format}")
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+def _attach_predictions(chunk, scored, with_confidence, predictions_only):
+    """
+    Combine an input chunk with its predictions
+    """
+    if with_confidence:
+        predictions = scored.rename(columns={
+            'prediction': 'predicted_salary',
+            'lower': 'predicted_salary_lower',
+            'upper': 'predicted_salary_upper',
+            'std_dev': 'predicted_salary_std'
+        })
+    else:
+        predictions = pd.DataFrame({'predicted_salary': scored}, index=chunk.index)
+
+    if predictions_only:
+        return predictions.reset_index(drop=True)
+
+    return pd.concat([chunk, predictions], axis=1)
+
+def score_file(model_path, input_path, output_path, chunksize=50000, model_name=None,
+               with_confidence=False, workers=1, predictions_only=False,
+               input_format=None, output_format=None):
+    """
+    Score an input file chunk by chunk and write the predictions to an output file
+    """
+    predictor = load_predictor(model_path)
+
+    if model_name is not None and model_name not in predictor.models:
+        raise ValueError(f"Model {model_name} not found")
+
+    method = 'predict_batch_with_confidence' if with_confidence else 'predict_batch'
+    chunks = iter_input_chunks(input_path, chunksize, input_format)
+    writer = ChunkWriter(output_path, output_format)
+
+    total_rows = 0
+    start_time = time.perf_counter()
+    completed = False
+
+    pool = None
+    if workers > 1:
+        from prediction_pool import PredictionWorkerPool
+        pool = PredictionWorkerPool(predictor, num_workers=workers,
+                                    model_name=model_name, method=method).start()
+
+    try:
+        if pool is None:
+            for chunk in chunks:
+                scored = getattr(predictor, method)(chunk, model_name)
+                writer.write(_attach_predictions(chunk, scored, with_confidence, predictions_only))
+                total_rows += len(chunk)
+        else:
+            # Keep one chunk in flight per worker, writing results back in input order
+            while True:
+                window = [chunk for _, chunk in zip(range(workers), chunks)]
+                if not window:
+                    break
+
+                for chunk, scored in zip(window, pool.predict_batches(window)):
+                    writer.write(_attach_predictions(chunk, scored, with_confidence, predictions_only))
+                    total_rows += len(chunk)
+        completed = True
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.close()
+        # Never leave a truncated output behind
+        if not completed and writer.started and os.path.exists(output_path):
+            os.remove(output_path)
+
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'rows': total_rows,
+        'elapsed_s': elapsed,
+        'rows_per_second': total_rows / elapsed if elapsed > 0 else 0.0
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m cli',
+        description='Employee Salary Predictor command-line tools'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    score_parser = subparsers.add_parser('score', help='Score a CSV or Parquet file with saved models')
+    score_parser.add_argument('--models', required=True, help='Model artifact written by ModelTrainer.save_models')
+    score_parser.add_argument('--input', required=True, help='Input CSV or Parquet file')
+    score_parser.add_argument('--output', required=True, help='Output CSV or Parquet file')
+    score_parser.add_argument('--model-name', default=None, help='Model to use (default: best available)')
+    score_parser.add_argument('--chunksize', type=int, default=50000, help='Rows per chunk')
+    score_parser.add_argument('--with-confidence', action='store_true',
+                              help='Add per-tree confidence intervals (forest models only)')
+    score_parser.add_argument('--workers', type=int, default=1, help='Number of prediction processes')
+    score_parser.add_argument('--predictions-only', action='store_true',
+                              help='Write only prediction columns instead of input plus predictions')
+    score_parser.add_argument('--input-format', choices=['csv', 'parquet'], default=None)
+    score_parser.add_argument('--output-format', choices=['csv', 'parquet'], default=None)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'score':
+        try:
+            summary = score_file(
+                args.models, args.input, args.output,
+                chunksize=args.chunksize,
+                model_name=args.model_name,
+                with_confidence=args.with_confidence,
+                workers=args.workers,
+                predictions_only=args.predictions_only,
+                input_format=args.input_format,
+                output_format=args.output_format
+            )
+        except Exception as e:
+            print(f"Error scoring file: {e}", file=sys.stderr)
+            return 1
+
+        print(f"Scored {summary['rows']:,} rows in {summary['elapsed_s']:.2f}s "
+              f"({summary['rows_per_second']:,.0f} rows/sec) -> {args.output}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
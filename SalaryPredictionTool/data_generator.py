@@ -3,6 +3,9 @@ import numpy as np
 import random
 from datetime import datetime, timedelta
 
+from instrumentation import instrument
+
+@instrument('generate_data')
 def generate_synthetic_data(num_records=10000):
     """
     Generate synthetic employee salary data for training and testing
@@ -0,0 +1,196 @@
+import glob
+import hashlib
+import json
+import os
+
+import data_generator
+from data_generator import generate_synthetic_data
+from utils import LOADER_VERSION, load_kaggle_data
+
+CACHE_DIR_ENV_VAR = 'SALARY_DATASET_CACHE_DIR'
+DEFAULT_CACHE_DIR = '.dataset_cache'
+
+# File extension for each supported cache format
+CACHE_FORMATS = {
+    'feather': '.arrow',
+    'parquet': '.parquet'
+}
+
+def source_signature(source_path):
+    """
+    Describe a source file, or the CSVs in a directory, by path, size and modification time
+    """
+    if os.path.isdir(source_path):
+        files = sorted(glob.glob(os.path.join(source_path, "*.csv")))
+    else:
+        files = [source_path]
+
+    signature = []
+    for filepath in files:
+        stat = os.stat(filepath)
+        signature.append({
+            'path': os.path.abspath(filepath),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns
+        })
+
+    return signature
+
+def cache_key(signature, **params):
+    """
+    Build a cache key from a source signature, the loader version and extra parameters
+    """
+    payload = json.dumps(
+        {'source': signature, 'loader_version': LOADER_VERSION, 'params': params},
+        sort_keys=True, default=str
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+class DatasetCache:
+    """
+    On-disk columnar cache of loaded datasets.
+
+    Entries are Arrow IPC (Feather v2) or Parquet files named by a key built
+    from the source files' paths, sizes and modification times plus the
+    loader version, so an edited CSV or a bumped LOADER_VERSION misses the
+    cache instead of serving stale data. Feather entries are written
+    uncompressed and read through a memory map. Categorical columns and
+    df.attrs round-trip. Without pyarrow the cache is disabled and every load
+    goes to the source.
+    """
+
+    def __init__(self, cache_dir=None, format='feather'):
+        if format not in CACHE_FORMATS:
+            raise ValueError(f"Unsupported cache format: {format}")
+
+        self.cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV_VAR, DEFAULT_CACHE_DIR)
+        self.format = format
+
+        try:
+            import pyarrow
+            self.enabled = True
+        except ImportError:
+            print("Warning: pyarrow not installed, dataset cache disabled")
+            self.enabled = False
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}{CACHE_FORMATS[self.format]}")
+
+    def get(self, key):
+        """
+        Read a cached DataFrame, or None on a miss
+        """
+        path = self._path(key)
+        if not self.enabled or not os.path.exists(path):
+            return None
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        try:
+            if self.format == 'feather':
+                with pa.memory_map(path, 'r') as source:
+                    table = pa.ipc.open_file(source).read_all()
+            else:
+                table = pq.read_table(path, memory_map=True)
+
+            return table.to_pandas()
+        except Exception as e:
+            print(f"Warning: Could not read cached dataset {path}: {e}")
+            return None
+
+    def put(self, key, df):
+        """
+        Write a DataFrame to the cache
+        """
+        if not self.enabled:
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+
+            if self.format == 'feather':
+                with pa.OSFile(temp_path, 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+            else:
+                pq.write_table(table, temp_path)
+
+            # Readers never see a partially written entry
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Warning: Could not cache dataset: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def get_or_build(self, key, builder):
+        """
+        Return the cached DataFrame for key, building and caching it on a miss
+        """
+        df = self.get(key)
+        if df is not None:
+            return df
+
+        df = builder()
+        if df is not None:
+            self.put(key, df)
+
+        return df
+
+    def clear(self):
+        """
+        Remove all cached datasets
+        """
+        for extension in CACHE_FORMATS.values():
+            for path in glob.glob(os.path.join(self.cache_dir, f"*{extension}")):
+                os.remove(path)
+
+# Shared caches by directory, so the pyarrow check (and its warning) runs once per directory
+_DEFAULT_CACHES = {}
+
+def get_default_cache():
+    """
+    Get the shared DatasetCache for the configured cache directory
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR, DEFAULT_CACHE_DIR)
+    if cache_dir not in _DEFAULT_CACHES:
+        _DEFAULT_CACHES[cache_dir] = DatasetCache(cache_dir)
+    return _DEFAULT_CACHES[cache_dir]
+
+def load_kaggle_data_cached(dataset_path, cache=None, **loader_kwargs):
+    """
+    load_kaggle_data backed by the dataset cache
+    """
+    cache = cache or get_default_cache()
+    key = cache_key(source_signature(dataset_path), loader='kaggle', loader_kwargs=loader_kwargs)
+
+    return cache.get_or_build(key, lambda: load_kaggle_data(dataset_path, **loader_kwargs))
+
+def generate_synthetic_data_cached(num_records=10000, cache=None):
+    """
+    generate_synthetic_data backed by the dataset cache (generation is seeded, so output is reproducible)
+    """
+    cache = cache or get_default_cache()
+    key = cache_key(source_signature(data_generator.__file__), loader='synthetic', num_records=num_records)
+
+    return cache.get_or_build(key, lambda: generate_synthetic_data(num_records))
+
+if __name__ == "__main__":
+    import time
+
+    cache = get_default_cache()
+
+    start_time = time.perf_counter()
+    data = generate_synthetic_data_cached(10000, cache=cache)
+    print(f"First load: {len(data)} records in {time.perf_counter() - start_time:.3f}s")
+
+    start_time = time.perf_counter()
+    data = generate_synthetic_data_cached(10000, cache=cache)
+    print(f"Cached load: {len(data)} records in {time.perf_counter() - start_time:.3f}s")
@@ -0,0 +1,253 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from fingerprints import row_fingerprints
+from sketches import combine_moments, sample_moments
+from utils import SalaryPercentileIndex
+
+def _start_fingerprint(df):
+    hasher = hashlib.blake2b(digest_size=16)
+    header = "|".join(f"{col}:{dtype}" for col, dtype in df.dtypes.items())
+    hasher.update(header.encode())
+    return hasher
+
+def dataset_fingerprint(df):
+    """
+    Get a content fingerprint for a DataFrame (columns, dtypes and row values, ignoring the index)
+    """
+    hasher = _start_fingerprint(df)
+    hasher.update(row_fingerprints(df, stable=True).tobytes())
+    return hasher.hexdigest()
+
+def _categorical_columns(df):
+    return [
+        col for col, dtype in df.dtypes.items()
+        if pd.api.types.is_object_dtype(dtype)
+        or pd.api.types.is_string_dtype(dtype)
+        or isinstance(dtype, pd.CategoricalDtype)
+    ]
+
+def _sorted_quantile(sorted_values, q):
+    """
+    Linear-interpolated quantile of an already sorted array (same as pandas' default)
+    """
+    if len(sorted_values) == 0:
+        return np.nan
+
+    position = (len(sorted_values) - 1) * q
+    lower = int(np.floor(position))
+    upper = int(np.ceil(position))
+
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def _merge_unique(sorted_unique, new_values):
+    """
+    Merge new values into a sorted array of unique values, keeping it sorted and unique
+    """
+    new_values = np.unique(new_values)
+    positions = np.searchsorted(sorted_unique, new_values)
+    present = positions < len(sorted_unique)
+    present[present] = sorted_unique[positions[present]] == new_values[present]
+    return np.insert(sorted_unique, positions[~present], new_values[~present])
+
+class DatasetStatistics:
+    """
+    Dataset-level statistics computed once and updated incrementally.
+
+    Holds per-column missing counts, moments and a sorted-value index
+    (utils.SalaryPercentileIndex) for numeric columns, value counts for
+    categorical columns and row hashes for
+    duplicate counting. ``append`` folds new rows in without rescanning the
+    existing data, and the fingerprint is extended so it still equals
+    ``dataset_fingerprint`` of the combined frame.
+    """
+
+    def __init__(self, df):
+        self.columns = df.columns.tolist()
+        self.dtypes = df.dtypes.to_dict()
+        self.numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
+        self.categorical_columns = _categorical_columns(df)
+
+        self.row_count = 0
+        self.memory_usage = 0
+        self.missing_counts = pd.Series(0, index=df.columns, dtype='int64')
+        self.moments = {col: {'count': 0, 'mean': 0.0, 'm2': 0.0} for col in self.numeric_columns}
+        self.value_indexes = {col: SalaryPercentileIndex([]) for col in self.numeric_columns}
+        self.value_counts = {col: pd.Series(dtype='int64') for col in self.categorical_columns}
+        self.unique_row_hashes = np.empty(0, dtype=np.uint64)
+
+        self._fingerprint_hasher = _start_fingerprint(df)
+        self._update(df)
+
+    @property
+    def fingerprint(self):
+        return self._fingerprint_hasher.hexdigest()
+
+    @property
+    def percentile_index(self):
+        """
+        Percentile index of the salary column (None without one)
+        """
+        return self.value_indexes.get('salary')
+
+    @property
+    def duplicate_count(self):
+        return self.row_count - len(self.unique_row_hashes)
+
+    def append(self, new_rows):
+        """
+        Update the statistics with appended rows
+        """
+        if new_rows.columns.tolist() != self.columns:
+            raise ValueError("Appended rows must have the same columns as the dataset")
+
+        self._update(new_rows)
+        return self
+
+    def _update(self, df):
+        if len(df) == 0:
+            return
+
+        row_hashes = row_fingerprints(df, stable=True)
+        self._fingerprint_hasher.update(row_hashes.tobytes())
+        self.unique_row_hashes = _merge_unique(self.unique_row_hashes, row_hashes)
+
+        self.row_count += len(df)
+        self.memory_usage += int(df.memory_usage(deep=True).sum())
+        self.missing_counts = self.missing_counts.add(df.isnull().sum(), fill_value=0).astype('int64')
+
+        for col in self.numeric_columns:
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+            self.value_indexes[col].extend(values)
+
+            moments = self.moments[col]
+            moments['count'], moments['mean'], moments['m2'] = combine_moments(
+                moments['count'], moments['mean'], moments['m2'],
+                *sample_moments(values[~np.isnan(values)])
+            )
+
+        for col in self.categorical_columns:
+            self.value_counts[col] = self.value_counts[col].add(
+                df[col].value_counts(), fill_value=0
+            ).astype('int64')
+
+    def column_summary(self, col):
+        """
+        Get count/mean/std/min/quartiles/max for a numeric column
+        """
+        moments = self.moments[col]
+        sorted_values = self.value_indexes[col].sorted_salaries
+        count = moments['count']
+
+        return {
+            'count': float(count),
+            'mean': moments['mean'] if count else np.nan,
+            'std': np.sqrt(moments['m2'] / (count - 1)) if count > 1 else np.nan,
+            'min': sorted_values[0] if count else np.nan,
+            '25%': _sorted_quantile(sorted_values, 0.25),
+            '50%': _sorted_quantile(sorted_values, 0.50),
+            '75%': _sorted_quantile(sorted_values, 0.75),
+            'max': sorted_values[-1] if count else np.nan
+        }
+
+    def describe(self):
+        """
+        Numeric summary equivalent to DataFrame.describe()
+        """
+        return pd.DataFrame({col: self.column_summary(col) for col in self.numeric_columns})
+
+    def quantile(self, col, q):
+        return _sorted_quantile(self.value_indexes[col].sorted_salaries, q)
+
+    def percentile_rank(self, salary):
+        """
+        Percentile rank (0-100) of a salary or array of salaries among all records
+        """
+        return self.percentile_index.rank(salary)
+
+    def quality_report(self):
+        """
+        Report with the same structure as utils.validate_data_quality
+        """
+        quality_report = {
+            'total_records': self.row_count,
+            'missing_values': int(self.missing_counts.sum()),
+            'duplicate_records': self.duplicate_count,
+            'data_types': dict(self.dtypes),
+            'salary_statistics': {}
+        }
+
+        if 'salary' in self.moments:
+            summary = self.column_summary('salary')
+            sorted_salaries = self.percentile_index.sorted_salaries
+            threshold = _sorted_quantile(sorted_salaries, 0.95)
+            quality_report['salary_statistics'] = {
+                'min': summary['min'],
+                'max': summary['max'],
+                'mean': summary['mean'],
+                'median': summary['50%'],
+                'std': summary['std'],
+                'outliers': int(len(sorted_salaries) - np.searchsorted(sorted_salaries, threshold, side='right'))
+            }
+
+        return quality_report
+
+    def overall_salary_statistics(self):
+        """
+        Overall statistics with the same structure as calculate_salary_statistics
+        """
+        summary = self.column_summary('salary')
+        percentiles = {
+            label: self.quantile('salary', q)
+            for label, q in [('25th', 0.25), ('50th', 0.50), ('75th', 0.75),
+                             ('90th', 0.90), ('95th', 0.95), ('99th', 0.99)]
+        }
+
+        return {
+            'total_records': self.row_count,
+            'mean_salary': summary['mean'],
+            'median_salary': summary['50%'],
+            'std_salary': summary['std'],
+            'min_salary': summary['min'],
+            'max_salary': summary['max'],
+            'salary_range': summary['max'] - summary['min'],
+            'percentiles': percentiles
+        }
+
+    def categorical_analysis(self):
+        """
+        Unique/top/missing value summary for each categorical column
+        """
+        return {
+            col: {
+                'unique_values': len(self.value_counts[col]),
+                'top_values': self.value_counts[col].sort_values(ascending=False, kind='stable').head(10).to_dict(),
+                'missing_values': int(self.missing_counts[col])
+            }
+            for col in self.categorical_columns
+        }
+
+# Statistics for recently seen datasets, keyed by fingerprint
+_STATISTICS_CACHE = OrderedDict()
+_STATISTICS_CACHE_SIZE = 8
+
+def get_dataset_statistics(df):
+    """
+    Get DatasetStatistics for a DataFrame, reusing cached statistics for identical data
+    """
+    fingerprint = dataset_fingerprint(df)
+
+    stats = _STATISTICS_CACHE.get(fingerprint)
+    # Cached statistics that have since been appended to describe different data
+    if stats is not None and stats.fingerprint == fingerprint:
+        _STATISTICS_CACHE.move_to_end(fingerprint)
+        return stats
+
+    stats = DatasetStatistics(df)
+    _STATISTICS_CACHE[fingerprint] = stats
+    if len(_STATISTICS_CACHE) > _STATISTICS_CACHE_SIZE:
+        _STATISTICS_CACHE.popitem(last=False)
+
+    return stats
@@ -0,0 +1,340 @@
+import abc
+import bisect
+import csv
+import glob
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+
+import numpy as np
+
+from utils import CURRENCY_RATES
+
+RATES_PATH_ENV_VAR = 'SALARY_RATES_PATH'
+DEFAULT_TTL = 3600.0
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def _to_day_array(dates):
+    return np.asarray(dates, dtype='datetime64[D]')
+
+class _RateTable:
+    """
+    Immutable snapshot of every loaded rate, swapped in as a whole on reload
+    """
+
+    def __init__(self, snapshots=()):
+        # Later snapshots with the same effective date replace earlier ones
+        by_date = {}
+        for effective_date, rates in snapshots:
+            by_date.setdefault(_parse_date(effective_date), {}).update(rates)
+
+        self.effective_dates = sorted(by_date)
+        self.currency_codes = sorted({code for rates in by_date.values() for code in rates})
+        self.currency_index = {code: position for position, code in enumerate(self.currency_codes)}
+
+        self.rate_matrix = np.full((len(self.effective_dates), len(self.currency_codes)), np.nan)
+        for row, effective_date in enumerate(self.effective_dates):
+            for code, rate in by_date[effective_date].items():
+                self.rate_matrix[row, self.currency_index[code]] = float(rate)
+        self.rate_matrix.flags.writeable = False
+
+        self.day_array = _to_day_array(self.effective_dates)
+
+    def currency_positions(self, currency_codes):
+        try:
+            return np.array([self.currency_index[code] for code in currency_codes], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"Unsupported currency: {e.args[0]}")
+
+    def snapshot_row(self, as_of):
+        if not self.effective_dates:
+            raise ValueError("No exchange-rate snapshots available")
+
+        if as_of is None:
+            return len(self.effective_dates) - 1
+
+        row = bisect.bisect_right(self.effective_dates, _parse_date(as_of)) - 1
+        if row < 0:
+            raise ValueError(f"No exchange rates effective on {as_of}")
+        return row
+
+    def rate_vector(self, currency_codes, as_of=None):
+        row = self.snapshot_row(as_of)
+        columns = [self.currency_index.get(code) for code in currency_codes]
+
+        return np.array([
+            self.rate_matrix[row, column] if column is not None else np.nan
+            for column in columns
+        ])
+
+class ExchangeRateProvider(abc.ABC):
+    """
+    Base class for exchange-rate sources.
+
+    Subclasses supply ``_load_snapshots`` returning ``(effective_date,
+    {code: units per USD})`` pairs. The provider keeps them sorted as a
+    (snapshots x currencies) rate matrix, so the rates in effect on a date
+    are found by binary search: ``bisect`` for single lookups and
+    ``np.searchsorted`` for whole arrays of record dates.
+
+    All loaded state lives in one immutable table that ``reload`` replaces
+    in a single assignment, and every lookup reads that table once, so a
+    reload on another thread never mixes old and new snapshots.
+    """
+
+    def __init__(self):
+        self._table = _RateTable()
+        self._reload_lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _load_snapshots(self):
+        """
+        Return the source's (effective_date, {code: units per USD}) pairs
+        """
+
+    def reload(self):
+        """
+        Re-read every snapshot from the source
+        """
+        with self._reload_lock:
+            self._table = _RateTable(self._load_snapshots())
+        return self
+
+    def refresh(self):
+        """
+        Reload snapshots if the source may have changed
+        """
+        return self
+
+    def _current_table(self):
+        self.refresh()
+        return self._table
+
+    @property
+    def table(self):
+        """
+        The current rate table, refreshed first
+
+        Tables are replaced on reload, never modified, so callers can cache
+        values derived from one and rebuild them when the identity changes.
+        """
+        return self._current_table()
+
+    @property
+    def effective_dates(self):
+        return self._current_table().effective_dates
+
+    @property
+    def currency_codes(self):
+        return self._current_table().currency_codes
+
+    @property
+    def rate_matrix(self):
+        return self._current_table().rate_matrix
+
+    def get_rates(self, as_of=None):
+        """
+        Get {code: units per USD} effective on a date (default: the latest snapshot)
+        """
+        table = self._current_table()
+        row = table.snapshot_row(as_of)
+        return {
+            code: float(rate)
+            for code, rate in zip(table.currency_codes, table.rate_matrix[row])
+            if not np.isnan(rate)
+        }
+
+    def get_rate(self, currency_code, as_of=None):
+        """
+        Get one currency's rate (units per USD) effective on a date
+        """
+        table = self._current_table()
+        row = table.snapshot_row(as_of)
+        column = table.currency_positions([currency_code])[0]
+
+        rate = table.rate_matrix[row, column]
+        if np.isnan(rate):
+            raise ValueError(f"No {currency_code} rate effective on {as_of}")
+        return float(rate)
+
+    def rate_vector(self, currency_codes, as_of=None):
+        """
+        Get the rates of several currencies effective on one date as an array
+
+        Currencies the provider does not know, or that are missing from the
+        snapshot in effect, give NaN.
+        """
+        return self._current_table().rate_vector(currency_codes, as_of)
+
+    def rates_on(self, dates, currency_codes):
+        """
+        Get an (N, M) array of rates for N record dates and M currencies
+
+        Dates before the earliest snapshot, or currencies missing from the
+        snapshot in effect, give NaN.
+        """
+        table = self._current_table()
+        columns = table.currency_positions(currency_codes)
+        rows = np.searchsorted(table.day_array, _to_day_array(dates), side='right') - 1
+
+        rates = np.full((len(rows), len(columns)), np.nan)
+        valid = rows >= 0
+        if table.rate_matrix.size:
+            rates[valid] = table.rate_matrix[rows[valid]][:, columns]
+
+        return rates
+
+    def convert(self, amounts, from_currency, to_currency, dates=None):
+        """
+        Convert amounts between currencies, using the rates effective on each record's date
+
+        Without dates the latest snapshot is used for every amount.
+        """
+        amounts = np.asarray(amounts, dtype=float)
+
+        if dates is None:
+            return amounts / self.get_rate(from_currency) * self.get_rate(to_currency)
+
+        rates = self.rates_on(dates, [from_currency, to_currency])
+        return amounts / rates[:, 0] * rates[:, 1]
+
+class StaticRateProvider(ExchangeRateProvider):
+    """
+    Provider serving one fixed rate table (by default utils.CURRENCY_RATES)
+    """
+
+    def __init__(self, rates=None, effective_date=date(1970, 1, 1)):
+        super().__init__()
+        self._snapshots = [(effective_date, dict(rates if rates is not None else CURRENCY_RATES))]
+        self.reload()
+
+    def _load_snapshots(self):
+        return self._snapshots
+
+class FileRateProvider(ExchangeRateProvider):
+    """
+    Provider backed by JSON or CSV rate snapshots on disk.
+
+    ``path`` is a file or a directory of ``*.json``/``*.csv`` files.
+    JSON files hold one snapshot ``{"effective_date": "2025-01-01",
+    "rates": {"EUR": 0.92, ...}}``, a list of them, or ``{"snapshots":
+    [...]}``. CSV files have ``effective_date,currency,rate`` rows. Rates
+    are units per USD. Files are parsed once; after ``ttl`` seconds the next
+    lookup re-checks their sizes and modification times and re-parses only
+    if something changed.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self._signature = None
+        self._checked_at = None
+        self.refresh(force=True)
+
+    def _source_files(self):
+        if os.path.isdir(self.path):
+            return sorted(
+                glob.glob(os.path.join(self.path, "*.json")) + glob.glob(os.path.join(self.path, "*.csv"))
+            )
+        return [self.path]
+
+    def _source_signature(self):
+        signature = []
+        for filepath in self._source_files():
+            stat = os.stat(filepath)
+            signature.append((filepath, stat.st_size, stat.st_mtime_ns))
+        return signature
+
+    def refresh(self, force=False):
+        """
+        Re-parse the rate files if the TTL has expired and they changed on disk
+        """
+        if not force and self._checked_at is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self
+
+        with self._reload_lock:
+            # Another thread may have re-checked while this one waited for the lock
+            now = time.monotonic()
+            if not force and self._checked_at is not None and now - self._checked_at < self.ttl:
+                return self
+
+            signature = self._source_signature()
+            if force or signature != self._signature:
+                self._table = _RateTable(self._load_snapshots())
+                self._signature = signature
+            self._checked_at = now
+
+        return self
+
+    def _load_snapshots(self):
+        snapshots = []
+        for filepath in self._source_files():
+            if filepath.lower().endswith('.csv'):
+                snapshots.extend(_read_csv_snapshots(filepath))
+            else:
+                snapshots.extend(_read_json_snapshots(filepath))
+        return snapshots
+
+def _read_json_snapshots(filepath):
+    with open(filepath) as f:
+        content = json.load(f)
+
+    if isinstance(content, dict):
+        content = content.get('snapshots', [content])
+
+    return [(snapshot['effective_date'], snapshot['rates']) for snapshot in content]
+
+def _read_csv_snapshots(filepath):
+    snapshots = {}
+    with open(filepath, newline='') as f:
+        for row in csv.DictReader(f):
+            snapshots.setdefault(row['effective_date'], {})[row['currency']] = float(row['rate'])
+
+    return list(snapshots.items())
+
+# Providers by (path, ttl), so repeated lookups share parsed snapshots
+_PROVIDER_CACHE = {}
+# The same providers by the path as given, so repeated lookups skip resolving it
+_PROVIDER_LOOKUP = {}
+
+def get_rate_provider(path=None, ttl=DEFAULT_TTL):
+    """
+    Get a shared rate provider: file-backed when path (or SALARY_RATES_PATH) is set, else the built-in table
+    """
+    path = path or os.environ.get(RATES_PATH_ENV_VAR)
+    provider = _PROVIDER_LOOKUP.get((path, ttl))
+    if provider is not None:
+        return provider
+
+    key = (os.path.abspath(path) if path else None, ttl)
+    if key not in _PROVIDER_CACHE:
+        _PROVIDER_CACHE[key] = FileRateProvider(path, ttl=ttl) if path else StaticRateProvider()
+
+    provider = _PROVIDER_LOOKUP[(path, ttl)] = _PROVIDER_CACHE[key]
+    return provider
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, 'rates.json'), 'w') as f:
+            json.dump({'snapshots': [
+                {'effective_date': '2024-01-01', 'rates': {'USD': 1.0, 'EUR': 0.90, 'JPY': 140.0}},
+                {'effective_date': '2025-01-01', 'rates': {'USD': 1.0, 'EUR': 0.92, 'JPY': 149.5}}
+            ]}, f)
+
+        provider = get_rate_provider(directory)
+        print(f"Latest rates: {provider.get_rates()}")
+        print(f"EUR on 2024-06-30: {provider.get_rate('EUR', '2024-06-30')}")
+
+        converted = provider.convert([75000, 75000], 'USD', 'EUR', dates=['2024-03-01', '2025-03-01'])
+        print(f"75,000 USD in EUR by record date: {converted}")
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from sketches import HyperLogLog
+
+# 64-bit FNV prime, used to mix per-column hashes into one row fingerprint
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+def row_fingerprints(df, stable=False):
+    """
+    Get a 64-bit fingerprint for every row of a DataFrame (the index is ignored)
+
+    By default columns are factorized (categorical columns reuse their
+    codes) and the codes combined as a mixed-radix integer, which is exact
+    while the product of the column cardinalities fits in 64 bits; beyond
+    that the remaining columns' codes are hashed and mixed in. Codes depend
+    on the frame, so these fingerprints only compare rows within one frame.
+    With stable=True the row values are hashed (pd.util.hash_pandas_object),
+    giving uniformly distributed fingerprints that compare across chunks,
+    files and sessions, as sketches need.
+
+    Hashed fingerprints of distinct rows collide with probability about
+    n**2 / 2**65, which is negligible at any size this pipeline handles.
+    """
+    if stable:
+        return pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+
+    fingerprints = np.zeros(len(df), dtype=np.uint64)
+    capacity = 1
+
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy().astype(np.int64)
+            cardinality = len(column.cat.categories)
+        else:
+            codes, uniques = pd.factorize(column)
+            cardinality = len(uniques)
+
+        # Shift codes so missing values (-1) become 0
+        radix = cardinality + 1
+        if capacity * radix <= 2 ** 64:
+            fingerprints = fingerprints * np.uint64(radix) + (codes + 1).astype(np.uint64)
+            capacity *= radix
+        else:
+            fingerprints = (fingerprints * _FNV_PRIME) ^ pd.util.hash_array(codes)
+            capacity = 2 ** 64
+
+    return fingerprints
+
+def first_occurrence_mask(fingerprints, seen_fingerprints=None):
+    """
+    Mask of rows whose fingerprint has not appeared earlier in the array
+    (or in the sorted seen_fingerprints, e.g. from earlier chunks)
+    """
+    keep = ~pd.Series(fingerprints).duplicated().to_numpy()
+
+    if seen_fingerprints is not None and len(seen_fingerprints):
+        positions = np.minimum(np.searchsorted(seen_fingerprints, fingerprints), len(seen_fingerprints) - 1)
+        keep &= seen_fingerprints[positions] != fingerprints
+
+    return keep
+
+def _in_sorted(sorted_values, values):
+    """
+    Mask of values present in a sorted array
+    """
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+
+    positions = np.minimum(np.searchsorted(sorted_values, values), len(sorted_values) - 1)
+    return sorted_values[positions] == values
+
+class FingerprintSet:
+    """
+    Growing set of row fingerprints for de-duplicating a stream of chunks.
+
+    Fingerprints are kept in a few sorted runs, each at most half the size
+    of the one before it (merged like the digits of a binary counter), so
+    adding a chunk costs one binary search per run plus occasional merges
+    instead of re-sorting everything seen so far. Memory is 8 bytes per
+    distinct fingerprint.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+    def add(self, fingerprints):
+        """
+        Add a chunk's fingerprints, returning the mask of first occurrences
+
+        A fingerprint is a first occurrence when it was not added before and
+        does not appear earlier in the same chunk.
+        """
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        keep = first_occurrence_mask(fingerprints)
+        for run in self._runs:
+            keep &= ~_in_sorted(run, fingerprints)
+
+        new_run = np.sort(fingerprints[keep])
+        if len(new_run):
+            self._runs.append(new_run)
+            while len(self._runs) > 1 and len(self._runs[-1]) * 2 > len(self._runs[-2]):
+                newest = self._runs.pop()
+                # Stable sort (timsort) merges two sorted runs in linear time
+                self._runs[-1] = np.sort(np.concatenate([self._runs[-1], newest]), kind='stable')
+
+        return keep
+
+def duplicated_rows(df):
+    """
+    Hash-based equivalent of df.duplicated() (first occurrence kept)
+    """
+    return ~first_occurrence_mask(row_fingerprints(df))
+
+def drop_duplicate_rows(df):
+    """
+    Hash-based equivalent of df.drop_duplicates(); returns df itself when there are no duplicates
+    """
+    keep = first_occurrence_mask(row_fingerprints(df))
+    return df if keep.all() else df[keep]
+
+def count_duplicate_rows(df):
+    """
+    Hash-based equivalent of df.duplicated().sum()
+    """
+    fingerprints = row_fingerprints(df)
+    return len(fingerprints) - len(pd.unique(fingerprints))
+
+def approximate_duplicate_count(chunks, precision=14):
+    """
+    Estimate duplicate rows across a stream of DataFrame chunks in one pass
+
+    Distinct rows are counted with a HyperLogLog sketch over stable row
+    fingerprints, so memory stays fixed regardless of the number of rows.
+    Returns (total_rows, estimated_distinct_rows, estimated_duplicate_rows).
+    """
+    sketch = HyperLogLog(precision=precision)
+    total_rows = 0
+
+    for chunk in chunks:
+        sketch.update(row_fingerprints(chunk, stable=True))
+        total_rows += len(chunk)
+
+    distinct_rows = min(sketch.count(), total_rows)
+    return total_rows, distinct_rows, total_rows - distinct_rows
@@ -0,0 +1,260 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+def _current_rss_bytes():
+    """
+    Get the resident set size of this process, or None where /proc is unavailable
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _stage_key(name, labels):
+    if not labels:
+        return name
+    return f"{name}[{','.join(str(value) for value in labels.values())}]"
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class PipelineInstrumentation:
+    """
+    Collects wall-clock time and memory usage for named pipeline stages.
+
+    Stages are recorded with the ``stage`` context manager or the ``instrument``
+    decorator. With ``track_rss`` (the default) every stage samples RSS
+    before and after; latency-sensitive callers such as single predictions
+    turn it off, and RSS is then only sampled while a profiler is attached.
+    With ``track_memory`` the Python-level allocation peak is also measured
+    via tracemalloc, which slows allocation-heavy code noticeably and is
+    therefore opt-in. The most recent ``max_records`` stage records are kept
+    alongside running totals. When a ``profiler`` (see
+    profiling.StageProfiler) is attached, every stage is also profiled under
+    its name and labels; ``profiling`` attaches one for the current thread
+    only, for instances shared between concurrent callers. Instances pickle (e.g. with a predictor sent to
+    worker processes); the lock and per-thread stage stacks are recreated.
+    """
+
+    def __init__(self, track_memory=False, max_records=1000, track_rss=True):
+        self.track_memory = track_memory
+        self.track_rss = track_rss
+        self.records = deque(maxlen=max_records)
+        self.totals = {}
+        self.profiler = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _active_profiler(self):
+        return getattr(self._local, 'profiler', None) or self.profiler
+
+    @contextmanager
+    def profiling(self, profiler):
+        """
+        Profile the stages this thread runs inside the block with profiler
+        """
+        previous = getattr(self._local, 'profiler', None)
+        self._local.profiler = profiler
+        try:
+            yield profiler
+        finally:
+            self._local.profiler = previous
+
+    @contextmanager
+    def stage(self, name, **labels):
+        """
+        Measure a block of code as one stage; yields the record filled in on exit
+        """
+        record = {'stage': name, 'labels': labels}
+        stack = self._stack()
+
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            # Fold the parent's peak so far into its running maximum before resetting
+            if stack:
+                stack[-1]['_peak'] = max(stack[-1]['_peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            record['_peak'] = 0
+
+        stack.append(record)
+        profiler = self._active_profiler()
+        sample_rss = self.track_rss or profiler is not None
+        rss_before = _current_rss_bytes() if sample_rss else None
+        start_time = time.perf_counter()
+
+        try:
+            if profiler is not None:
+                profile_context = profiler.profile_stage(_stage_key(name, labels))
+            else:
+                profile_context = nullcontext()
+
+            with profile_context:
+                yield record
+        finally:
+            record['duration_s'] = time.perf_counter() - start_time
+            rss_after = _current_rss_bytes() if sample_rss else None
+            stack.pop()
+
+            record['rss_before_bytes'] = rss_before
+            record['rss_after_bytes'] = rss_after
+            record['rss_delta_bytes'] = (
+                rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            )
+
+            if self.track_memory:
+                peak = max(record.pop('_peak'), tracemalloc.get_traced_memory()[1])
+                record['tracemalloc_peak_bytes'] = peak
+                if stack:
+                    stack[-1]['_peak'] = max(stack[-1]['_peak'], peak)
+
+            record['timestamp'] = time.time()
+            self._add_record(record)
+
+    def _add_record(self, record):
+        key = (record['stage'], tuple(sorted(record['labels'].items())))
+
+        with self._lock:
+            self.records.append(record)
+
+            totals = self.totals.setdefault(key, {
+                'stage': record['stage'],
+                'labels': record['labels'],
+                'count': 0,
+                'total_s': 0.0,
+                'max_s': 0.0,
+                'max_rss_delta_bytes': None,
+                'max_tracemalloc_peak_bytes': None
+            })
+            totals['count'] += 1
+            totals['total_s'] += record['duration_s']
+            totals['max_s'] = max(totals['max_s'], record['duration_s'])
+
+            for record_key, totals_key in (('rss_delta_bytes', 'max_rss_delta_bytes'),
+                                           ('tracemalloc_peak_bytes', 'max_tracemalloc_peak_bytes')):
+                value = record.get(record_key)
+                if value is not None:
+                    current = totals[totals_key]
+                    totals[totals_key] = value if current is None else max(current, value)
+
+    def instrument(self, name=None, **labels):
+        """
+        Decorator recording every call of a function as a stage
+        """
+        def decorator(func):
+            stage_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage_name, **labels):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def get_report(self):
+        """
+        Get a structured report of recorded stages and per-stage totals
+        """
+        with self._lock:
+            stages = [dict(record) for record in self.records]
+            totals = []
+            for stage_totals in self.totals.values():
+                summary = dict(stage_totals)
+                summary['mean_s'] = summary['total_s'] / summary['count']
+                totals.append(summary)
+
+        return {'stages': stages, 'totals': totals}
+
+    def reset(self):
+        """
+        Discard all recorded stages
+        """
+        with self._lock:
+            self.records.clear()
+            self.totals.clear()
+
+    def to_json_lines(self):
+        """
+        Export recorded stages as JSON lines, one stage per line
+        """
+        return "\n".join(json.dumps(record, default=str) for record in self.get_report()['stages'])
+
+    def to_prometheus(self, prefix='salary_pipeline'):
+        """
+        Export per-stage totals in the Prometheus text exposition format
+        """
+        metrics = [
+            ('stage_seconds_total', 'counter', 'Total time spent in the stage', 'total_s'),
+            ('stage_calls_total', 'counter', 'Number of times the stage ran', 'count'),
+            ('stage_seconds_max', 'gauge', 'Longest single run of the stage', 'max_s'),
+            ('stage_rss_delta_bytes_max', 'gauge', 'Largest RSS growth during one run', 'max_rss_delta_bytes'),
+            ('stage_tracemalloc_peak_bytes_max', 'gauge', 'Largest traced allocation peak during one run',
+             'max_tracemalloc_peak_bytes')
+        ]
+
+        totals = self.get_report()['totals']
+        lines = []
+
+        for metric_name, metric_type, help_text, key in metrics:
+            samples = [stage_totals for stage_totals in totals if stage_totals[key] is not None]
+            if not samples:
+                continue
+
+            full_name = f"{prefix}_{metric_name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+
+            for stage_totals in samples:
+                labels = {'stage': stage_totals['stage'], **stage_totals['labels']}
+                label_text = ",".join(f'{label}="{_escape_label(value)}"' for label, value in labels.items())
+                lines.append(f"{full_name}{{{label_text}}} {stage_totals[key]}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, filepath, format='jsonl'):
+        """
+        Write the report to a file as JSON lines or Prometheus text
+        """
+        if format.lower() == 'jsonl':
+            content = self.to_json_lines() + "\n"
+        elif format.lower() == 'prometheus':
+            content = self.to_prometheus()
+        else:
+            raise ValueError(f"Unsupported format: {format}")
+
+        with open(filepath, 'w') as f:
+            f.write(content)
+
+# Shared instance for module-level functions such as data generation and loading
+default_instrumentation = PipelineInstrumentation()
+
+def instrument(name=None, **labels):
+    """
+    Decorator recording calls into the shared default instrumentation
+    """
+    return default_instrumentation.instrument(name, **labels)
@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
-import time
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.base import clone
+from sklearn.model_selection import KFold, train_test_split
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
@@ -9,8 +9,42 @@ from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import warnings
 warnings.filterwarnings('ignore')
 
+from instrumentation import PipelineInstrumentation
+from profiling import StageProfiler, profiling_enabled
+from utils import concat_categorical_frames
+
+MODEL_NAMES = ["Linear Regression", "Random Forest", "Gradient Boosting"]
+CV_FOLDS = 5
+
+class TrainingCancelled(Exception):
+    """
+    Raised by ModelTrainer.train_models when its cancel_event is set
+    """
+
+class _ProgressReporter:
+    def __init__(self, total_steps, callback=None, cancel_event=None):
+        self.total_steps = total_steps
+        self.completed_steps = 0
+        self.callback = callback
+        self.cancel_event = cancel_event
+    
+    def step(self, stage, model=None, fold=None):
+        self.completed_steps += 1
+        
+        if self.callback is not None:
+            self.callback({
+                'stage': stage,
+                'model': model,
+                'fold': fold,
+                'step': self.completed_steps,
+                'total_steps': self.total_steps
+            })
+        
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise TrainingCancelled("Model training was cancelled")
+
 class ModelTrainer:
-    def __init__(self, data):
+    def __init__(self, data, instrumentation=None):
         self.data = data.copy()
         self.models = {}
         self.encoders = {}
@@ -20,46 +54,125 @@ class ModelTrainer:
         self.y_train = None
         self.y_test = None
         self.feature_columns = None # Initialize feature_columns
+        self.instrumentation = instrumentation or PipelineInstrumentation()
+        self.profiler = None
+    
+    @classmethod
+    def from_shards(cls, shards, max_rows=None, instrumentation=None):
+        """
+        Create a trainer from an iterable of DataFrame shards
+        
+        Shards (e.g. from utils.iter_kaggle_shards) are consumed lazily, so
+        with max_rows no further files are read once enough rows are in hand.
+        """
+        frames = []
+        total_rows = 0
+        
+        for shard in shards:
+            if max_rows is not None and total_rows + len(shard) > max_rows:
+                shard = shard.iloc[:max_rows - total_rows]
+            
+            frames.append(shard)
+            total_rows += len(shard)
+            
+            if max_rows is not None and total_rows >= max_rows:
+                break
+        
+        if not frames:
+            raise ValueError("No shards to train on")
+        
+        return cls(concat_categorical_frames(frames), instrumentation=instrumentation)
         
     def preprocess_data(self):
         """
         Preprocess the data for training
         """
+        with self.instrumentation.stage('preprocess'):
+            X_scaled, y, encoders, scaler, feature_columns = self._fit_preprocessing()
+        
+        self.encoders = encoders
+        self.scaler = scaler
+        self.feature_columns = feature_columns
+        
+        return X_scaled, y
+
+    def _fit_preprocessing(self):
+        """
+        Fit the encoders and scaler without touching the trainer's state
+        
+        Returns (X_scaled, y, encoders, scaler, feature_columns), so training
+        can publish the preprocessing together with the models it fits.
+        """
         # Prepare features and target
         feature_columns = [col for col in self.data.columns if col != 'salary']
-        self.feature_columns = feature_columns # Store feature_columns
         X = self.data[feature_columns].copy()
         y = self.data['salary'].copy()
         
         # Encode categorical variables
-        categorical_columns = X.select_dtypes(include=['object']).columns
+        categorical_columns = X.select_dtypes(include=['object', 'category']).columns
+        encoders = {}
         
         for col in categorical_columns:
             le = LabelEncoder()
             X[col] = le.fit_transform(X[col].astype(str))
-            self.encoders[col] = le
+            encoders[col] = le
         
         # Scale numerical features
-        self.scaler = StandardScaler()
-        X_scaled = self.scaler.fit_transform(X)
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
         X_scaled = pd.DataFrame(X_scaled, columns=X.columns, index=X.index)
         
-        return X_scaled, y
+        return X_scaled, y, encoders, scaler, feature_columns
     
-    def train_models(self, models_to_train=None, test_size=0.2, random_state=42):
+    def train_models(self, models_to_train=None, test_size=0.2, random_state=42,
+                     profile=None, profile_dir=None, progress_callback=None, cancel_event=None):
         """
         Train multiple models and return performance metrics
+        
+        With profile=True (or the SALARY_PROFILE env var set) every stage is
+        profiled and collapsed stacks are written to profile_dir.
+        
+        progress_callback, if given, is called with an event dict (stage,
+        model, fold, step, total_steps) after preprocessing and after each
+        model fit, evaluation and cross-validation fold. Setting cancel_event
+        (a threading.Event) stops training at the next such step with
+        TrainingCancelled; models trained so far are discarded.
         """
+        if not profiling_enabled(profile):
+            return self._train_models(models_to_train, test_size, random_state,
+                                      progress_callback, cancel_event)
+        
+        if self.profiler is None:
+            self.profiler = StageProfiler(output_dir=profile_dir)
+        
+        self.instrumentation.profiler = self.profiler
+        try:
+            return self._train_models(models_to_train, test_size, random_state,
+                                      progress_callback, cancel_event)
+        finally:
+            self.instrumentation.profiler = None
+    
+    def _train_models(self, models_to_train, test_size, random_state,
+                      progress_callback=None, cancel_event=None):
         if models_to_train is None:
-            models_to_train = ["Linear Regression", "Random Forest", "Gradient Boosting"]
+            models_to_train = MODEL_NAMES
         
-        # Preprocess data
-        X, y = self.preprocess_data()
+        models_to_train = [name for name in models_to_train if name in MODEL_NAMES]
+        progress = _ProgressReporter(
+            1 + len(models_to_train) * (2 + CV_FOLDS), progress_callback, cancel_event
+        )
+        
+        # Preprocess data (kept local until training succeeds, so the current
+        # models keep matching the trainer's encoders and scaler meanwhile)
+        with self.instrumentation.stage('preprocess'):
+            X, y, encoders, scaler, feature_columns = self._fit_preprocessing()
+        progress.step('preprocess')
         
         # Split data
-        self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state
-        )
+        with self.instrumentation.stage('split'):
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=test_size, random_state=random_state
+            )
         
         # Define models
         model_dict = {
@@ -82,6 +195,7 @@ class ModelTrainer:
         }
         
         results = {}
+        trained_models = {}
         
         for model_name in models_to_train:
             if model_name in model_dict:
@@ -89,34 +203,45 @@ class ModelTrainer:
                 
                 model = model_dict[model_name]
                 
-                # Record training time
-                start_time = time.time()
+                # Train model (the fit stage also provides the training time)
+                with self.instrumentation.stage('fit', model=model_name) as fit_record:
+                    model.fit(X_train, y_train)
                 
-                # Train model
-                model.fit(self.X_train, self.y_train)
-                
-                training_time = time.time() - start_time
+                training_time = fit_record['duration_s']
+                progress.step('fit', model=model_name)
                 
                 # Make predictions
-                y_pred_train = model.predict(self.X_train)
-                y_pred_test = model.predict(self.X_test)
+                with self.instrumentation.stage('predict', model=model_name):
+                    y_pred_train = model.predict(X_train)
+                    y_pred_test = model.predict(X_test)
                 
                 # Calculate metrics
-                train_r2 = r2_score(self.y_train, y_pred_train)
-                test_r2 = r2_score(self.y_test, y_pred_test)
-                
-                train_rmse = np.sqrt(mean_squared_error(self.y_train, y_pred_train))
-                test_rmse = np.sqrt(mean_squared_error(self.y_test, y_pred_test))
+                with self.instrumentation.stage('metrics', model=model_name):
+                    train_r2 = r2_score(y_train, y_pred_train)
+                    test_r2 = r2_score(y_test, y_pred_test)
+                    
+                    train_rmse = np.sqrt(mean_squared_error(y_train, y_pred_train))
+                    test_rmse = np.sqrt(mean_squared_error(y_test, y_pred_test))
+                    
+                    train_mae = mean_absolute_error(y_train, y_pred_train)
+                    test_mae = mean_absolute_error(y_test, y_pred_test)
                 
-                train_mae = mean_absolute_error(self.y_train, y_pred_train)
-                test_mae = mean_absolute_error(self.y_test, y_pred_test)
+                progress.step('evaluate', model=model_name)
                 
-                # Cross-validation
-                cv_scores = cross_val_score(model, self.X_train, self.y_train, 
-                                          cv=5, scoring='r2')
+                # Cross-validation (folds as cross_val_score(cv=5, scoring='r2'), one progress step each)
+                with self.instrumentation.stage('cv', model=model_name):
+                    cv_scores = []
+                    for fold, (train_index, val_index) in enumerate(KFold(n_splits=CV_FOLDS).split(X_train)):
+                        fold_model = clone(model)
+                        fold_model.fit(X_train.iloc[train_index], y_train.iloc[train_index])
+                        cv_scores.append(r2_score(
+                            y_train.iloc[val_index], fold_model.predict(X_train.iloc[val_index])
+                        ))
+                        progress.step('cv', model=model_name, fold=fold + 1)
+                    cv_scores = np.array(cv_scores)
                 
                 # Store model and results
-                self.models[model_name] = model
+                trained_models[model_name] = model
                 
                 results[model_name] = {
                     'Training R² Score': train_r2,
@@ -136,8 +261,22 @@ class ModelTrainer:
                 
                 print(f"  ✓ {model_name} - R² Score: {test_r2:.4f}, RMSE: ${test_rmse:,.0f}")
         
+        # Publish the new models, and the preprocessing they were fitted with,
+        # only once every requested model has trained
+        self.encoders = encoders
+        self.scaler = scaler
+        self.feature_columns = feature_columns
+        self.X_train, self.X_test, self.y_train, self.y_test = X_train, X_test, y_train, y_test
+        self.models.update(trained_models)
+        
         return results
     
+    def get_stage_report(self):
+        """
+        Get timing and memory usage for each pipeline stage run by this trainer
+        """
+        return self.instrumentation.get_report()
+    
     def get_feature_importance(self, model_name):
         """
         Get feature importance for tree-based models
@@ -213,7 +352,8 @@ class ModelTrainer:
         model_data = {
             'models': self.models,
             'encoders': self.encoders,
-            'scaler': self.scaler
+            'scaler': self.scaler,
+            'feature_columns': self.feature_columns
         }
         
         joblib.dump(model_data, filepath)
@@ -230,6 +370,7 @@ class ModelTrainer:
         self.models = model_data['models']
         self.encoders = model_data['encoders']
         self.scaler = model_data['scaler']
+        self.feature_columns = model_data.get('feature_columns', self.feature_columns)
         
         print(f"Models loaded from {filepath}")
 
@@ -0,0 +1,249 @@
+import gc
+import os
+import queue
+import time
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+def _worker_loop(worker_id, predictor, method, model_name, task_queue, result_queue):
+    """
+    Serve prediction batches from a task queue until a stop signal is received
+    """
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        task_id, batch = task
+        start_time = time.perf_counter()
+
+        try:
+            result = getattr(predictor, method)(batch, model_name)
+            error = None
+        except Exception as e:
+            result = None
+            error = f"{type(e).__name__}: {e}"
+
+        elapsed = time.perf_counter() - start_time
+        result_queue.put((task_id, worker_id, result, error, elapsed, len(batch)))
+
+class PredictionWorkerPool:
+    """
+    Pool of prediction worker processes sharing one loaded SalaryPredictor.
+
+    On platforms that support ``fork`` the models are loaded once in the parent
+    and inherited copy-on-write by every worker; elsewhere the predictor is
+    pickled to each worker once at startup. Batches are dispatched round-robin
+    to the predictor's ``method`` (``predict_batch`` by default).
+    """
+
+    def __init__(self, predictor, num_workers=None, model_name=None, method='predict_batch',
+                 poll_interval=1.0):
+        if model_name is not None and model_name not in predictor.models:
+            raise ValueError(f"Model {model_name} not found")
+
+        self.predictor = predictor
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.model_name = model_name
+        self.method = method
+        self.poll_interval = poll_interval
+        self._workers = []
+        self._task_queues = []
+        self._result_queue = None
+        self._next_worker = 0
+        self._next_task_id = 0
+        self._stats = {}
+        self._gc_frozen = False
+
+    def start(self):
+        """
+        Fork the worker processes
+        """
+        if self._workers:
+            return self
+
+        if 'fork' in mp.get_all_start_methods():
+            context = mp.get_context('fork')
+            # Move the loaded models out of the cyclic GC's reach so collections
+            # in the workers don't touch (and un-share) their pages
+            gc.freeze()
+            self._gc_frozen = True
+        else:
+            context = mp.get_context()
+
+        self._result_queue = context.Queue()
+
+        for worker_id in range(self.num_workers):
+            task_queue = context.Queue()
+            process = context.Process(
+                target=_worker_loop,
+                args=(worker_id, self.predictor, self.method, self.model_name, task_queue, self._result_queue),
+                daemon=True
+            )
+            process.start()
+
+            self._task_queues.append(task_queue)
+            self._workers.append(process)
+            self._stats[worker_id] = {
+                'worker_id': worker_id,
+                'pid': process.pid,
+                'batches': 0,
+                'rows': 0,
+                'busy_time_s': 0.0,
+                'errors': 0
+            }
+
+        return self
+
+    def submit(self, batch):
+        """
+        Queue a batch on the next worker (round-robin) and return its task id
+        """
+        if not self._workers:
+            self.start()
+
+        task_id = self._next_task_id
+        self._next_task_id += 1
+
+        self._task_queues[self._next_worker].put((task_id, batch))
+        self._next_worker = (self._next_worker + 1) % self.num_workers
+
+        return task_id
+
+    def _check_workers(self):
+        for worker_id, process in enumerate(self._workers):
+            if not process.is_alive():
+                raise RuntimeError(
+                    f"Prediction worker {worker_id} (pid {process.pid}) exited with code {process.exitcode}"
+                )
+
+    def _collect(self, task_ids):
+        """
+        Wait for the given tasks and return their results keyed by task id
+
+        Raises RuntimeError if a worker process dies (e.g. killed for memory)
+        instead of waiting forever for its results.
+        """
+        pending = set(task_ids)
+        results = {}
+        errors = []
+
+        while pending:
+            try:
+                task_id, worker_id, result, error, elapsed, rows = self._result_queue.get(
+                    timeout=self.poll_interval
+                )
+            except queue.Empty:
+                self._check_workers()
+                continue
+
+            stats = self._stats[worker_id]
+            stats['batches'] += 1
+            stats['rows'] += rows
+            stats['busy_time_s'] += elapsed
+
+            if error is not None:
+                stats['errors'] += 1
+                errors.append(f"worker {worker_id}: {error}")
+
+            results[task_id] = result
+            pending.discard(task_id)
+
+        if errors:
+            raise RuntimeError(f"Prediction failed in {len(errors)} batch(es): {errors[0]}")
+
+        return results
+
+    def predict_batches(self, batches):
+        """
+        Predict a sequence of batches in parallel, returning arrays in input order
+        """
+        task_ids = [self.submit(batch) for batch in batches]
+        results = self._collect(task_ids)
+
+        return [results[task_id] for task_id in task_ids]
+
+    def predict(self, input_data, batch_size=1000):
+        """
+        Split a DataFrame (or list of records) into batches and predict them in parallel
+        """
+        if isinstance(input_data, list):
+            input_data = pd.DataFrame(input_data)
+
+        if len(input_data) == 0:
+            return np.array([], dtype=float)
+
+        batches = [
+            input_data.iloc[start:start + batch_size]
+            for start in range(0, len(input_data), batch_size)
+        ]
+
+        return np.concatenate(self.predict_batches(batches))
+
+    def get_worker_stats(self):
+        """
+        Get per-worker throughput statistics
+        """
+        worker_stats = []
+
+        for stats in self._stats.values():
+            busy_time = stats['busy_time_s']
+            worker_stats.append({
+                **stats,
+                'rows_per_second': stats['rows'] / busy_time if busy_time > 0 else 0.0
+            })
+
+        return worker_stats
+
+    def close(self):
+        """
+        Stop all workers
+        """
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+
+        for process in self._workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+        self._workers = []
+        self._task_queues = []
+        self._result_queue = None
+        self._next_worker = 0
+
+        if self._gc_frozen:
+            gc.unfreeze()
+            self._gc_frozen = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+if __name__ == "__main__":
+    # Test the worker pool
+    from data_generator import generate_synthetic_data
+    from model_trainer import ModelTrainer
+    from predictor import SalaryPredictor
+
+    data = generate_synthetic_data(2000)
+    trainer = ModelTrainer(data)
+    trainer.train_models(models_to_train=["Random Forest"])
+    predictor = SalaryPredictor(trainer.models, trainer.encoders, trainer.scaler)
+
+    features = data.drop(columns=['salary'])
+
+    with PredictionWorkerPool(predictor, num_workers=2) as pool:
+        start_time = time.perf_counter()
+        predictions = pool.predict(features, batch_size=250)
+        elapsed = time.perf_counter() - start_time
+
+        print(f"Predicted {len(predictions)} rows in {elapsed:.2f}s")
+        for stats in pool.get_worker_stats():
+            print(f"  Worker {stats['worker_id']} (pid {stats['pid']}): "
+                  f"{stats['batches']} batches, {stats['rows_per_second']:,.0f} rows/s")
@@ -1,15 +1,26 @@
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import LabelEncoder, StandardScaler
+import threading
 import warnings
 warnings.filterwarnings('ignore')
 
+from instrumentation import PipelineInstrumentation
+from profiling import StageProfiler, profiling_enabled
+from utils import factorize_values
+
+# Guards lazy creation of a predictor's profiler when sessions share the predictor
+_PROFILER_LOCK = threading.Lock()
+
 class SalaryPredictor:
-    def __init__(self, models, encoders, scaler, feature_columns=None):
+    def __init__(self, models, encoders, scaler, feature_columns=None, instrumentation=None):
         self.models = models
         self.encoders = encoders
         self.scaler = scaler
         self.feature_columns = feature_columns
+        # Single predictions are latency-sensitive, so RSS is only sampled while profiling
+        self.instrumentation = instrumentation or PipelineInstrumentation(track_rss=False)
+        self.profiler = None
         self.best_model_name, self.best_model = self._determine_best_model()
     
     def _determine_best_model(self):
@@ -34,10 +45,25 @@ class SalaryPredictor:
         
         return best_model_name, best_model
     
+    def _select_model(self, model_name):
+        """
+        Get (name, model) for model_name, or the best model when it is None
+        """
+        if model_name is None:
+            return self.best_model_name, self.best_model
+        
+        if model_name not in self.models:
+            raise ValueError(f"Model {model_name} not found")
+        return model_name, self.models[model_name]
+    
     def preprocess_input(self, input_data):
         """
         Preprocess input data for prediction
         """
+        with self.instrumentation.stage('preprocess_input'):
+            return self._preprocess_input(input_data)
+
+    def _preprocess_input(self, input_data):
         # Convert to DataFrame if it's a dictionary
         if isinstance(input_data, dict):
             input_df = pd.DataFrame([input_data])
@@ -78,14 +104,12 @@ class SalaryPredictor:
         for col, encoder in self.encoders.items():
             if col in processed_df.columns:
                 try:
-                    # Handle unseen categories
-                    unique_values = processed_df[col].unique()
-                    for value in unique_values:
-                        if value not in encoder.classes_:
-                            # Use the most frequent class as default
-                            processed_df[col] = processed_df[col].replace(value, encoder.classes_[0])
-                    
-                    processed_df[col] = encoder.transform(processed_df[col].astype(str))
+                    # Encode once per distinct value; unseen categories (and
+                    # missing values, code -1) fall back to the first class
+                    class_codes = {value: code for code, value in enumerate(encoder.classes_)}
+                    codes, uniques = factorize_values(processed_df[col])
+                    lookup = np.array([class_codes.get(value, 0) for value in uniques] + [0], dtype=np.int64)
+                    processed_df[col] = lookup[codes]
                 except Exception as e:
                     print(f"Warning: Error encoding {col}: {e}")
                     # Use default value (first class)
@@ -100,47 +124,97 @@ class SalaryPredictor:
         
         return processed_df
     
-    def predict(self, input_data, model_name=None):
+    def predict(self, input_data, model_name=None, profile=None, profile_dir=None):
         """
         Make salary prediction
+        
+        With profile=True (or the SALARY_PROFILE env var set) preprocessing and
+        prediction are profiled; profiles accumulate across calls in profile_dir.
         """
-        if model_name is None:
-            model_name = self.best_model_name
-            model = self.best_model
-        else:
-            if model_name not in self.models:
-                raise ValueError(f"Model {model_name} not found")
-            model = self.models[model_name]
+        if not profiling_enabled(profile):
+            return self._predict(input_data, model_name)
+        
+        with _PROFILER_LOCK:
+            if self.profiler is None:
+                self.profiler = StageProfiler(output_dir=profile_dir)
+        
+        # Attached for this thread only: other sessions may be predicting at the same time
+        with self.instrumentation.profiling(self.profiler):
+            return self._predict(input_data, model_name)
+    
+    def _predict(self, input_data, model_name):
+        model_name, model = self._select_model(model_name)
         
         # Preprocess input
         processed_input = self.preprocess_input(input_data)
         
         # Make prediction
-        prediction = model.predict(processed_input)
+        with self.instrumentation.stage('predict', model=model_name):
+            prediction = model.predict(processed_input)
         
         # Return single value if single prediction
         if len(prediction) == 1:
             return float(prediction[0])
         
         return prediction
-    
+
+    def predict_batch(self, input_data, model_name=None):
+        """
+        Make salary predictions for a batch of inputs, always returning an array
+        """
+        if isinstance(input_data, list):
+            input_data = pd.DataFrame(input_data)
+
+        model_name, model = self._select_model(model_name)
+
+        processed_input = self.preprocess_input(input_data)
+
+        with self.instrumentation.stage('predict_batch', model=model_name):
+            return np.asarray(model.predict(processed_input), dtype=float)
+
+    def predict_batch_with_confidence(self, input_data, model_name=None):
+        """
+        Make batch predictions with per-tree confidence intervals (for forest models)
+        """
+        if isinstance(input_data, list):
+            input_data = pd.DataFrame(input_data)
+
+        model_name, model = self._select_model(model_name)
+
+        processed_input = self.preprocess_input(input_data)
+
+        with self.instrumentation.stage('predict_batch', model=model_name):
+            predictions = np.asarray(model.predict(processed_input), dtype=float)
+
+        # Only forests hold a list of full regressors; boosting stages predict residuals
+        std_dev = np.full(len(predictions), np.nan)
+        if isinstance(getattr(model, 'estimators_', None), list):
+            with self.instrumentation.stage('confidence_interval', model=model_name):
+                tree_input = np.asarray(processed_input, dtype=np.float32)
+                tree_predictions = np.stack([
+                    estimator.predict(tree_input) for estimator in model.estimators_
+                ])
+                std_dev = tree_predictions.std(axis=0)
+
+        return pd.DataFrame({
+            'prediction': predictions,
+            'lower': predictions - 1.96 * std_dev,
+            'upper': predictions + 1.96 * std_dev,
+            'std_dev': std_dev
+        }, index=input_data.index)
+
     def predict_with_confidence(self, input_data, model_name=None):
         """
         Make prediction with confidence interval (for tree-based models)
         """
-        if model_name is None:
-            model_name = self.best_model_name
-            model = self.best_model
-        else:
-            if model_name not in self.models:
-                raise ValueError(f"Model {model_name} not found")
-            model = self.models[model_name]
+        model_name, model = self._select_model(model_name)
         
         # Preprocess input
         processed_input = self.preprocess_input(input_data)
         
         # Make prediction
-        prediction = model.predict(processed_input)[0]
+        with self.instrumentation.stage('predict', model=model_name):
+            prediction = model.predict(processed_input)[0]
         
         # Calculate confidence interval
         confidence_interval = None
@@ -188,13 +262,7 @@ class SalaryPredictor:
         """
         Analyze feature impact on prediction (for tree-based models)
         """
-        if model_name is None:
-            model_name = self.best_model_name
-            model = self.best_model
-        else:
-            if model_name not in self.models:
-                raise ValueError(f"Model {model_name} not found")
-            model = self.models[model_name]
+        model_name, model = self._select_model(model_name)
         
         if not hasattr(model, 'feature_importances_'):
             return None
@@ -251,6 +319,12 @@ class SalaryPredictor:
         
         return errors
     
+    def get_stage_report(self):
+        """
+        Get timing and memory usage for the prediction stages run by this predictor
+        """
+        return self.instrumentation.get_report()
+    
     def get_model_info(self):
         """
         Get information about available models
@@ -264,6 +338,25 @@ class SalaryPredictor:
         
         return info
 
+def load_predictor(filepath, mmap_mode=None):
+    """
+    Build a SalaryPredictor from a ModelTrainer.save_models artifact
+
+    With mmap_mode='r' the models' numpy arrays (e.g. tree node tables) are
+    memory-mapped from the file instead of copied, so loading is fast and
+    processes loading the same artifact share those pages.
+    """
+    import joblib
+
+    model_data = joblib.load(filepath, mmap_mode=mmap_mode)
+
+    return SalaryPredictor(
+        model_data['models'],
+        model_data['encoders'],
+        model_data['scaler'],
+        feature_columns=model_data.get('feature_columns')
+    )
+
 if __name__ == "__main__":
     # Test the predictor
     from data_generator import generate_synthetic_data
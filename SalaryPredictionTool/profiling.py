@@ -0,0 +1,189 @@
+import copy
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+PROFILE_ENV_VAR = 'SALARY_PROFILE'
+PROFILE_DIR_ENV_VAR = 'SALARY_PROFILE_DIR'
+DEFAULT_PROFILE_DIR = 'profiles'
+
+def profiling_enabled(profile=None):
+    """
+    Resolve an explicit profile flag, falling back to the SALARY_PROFILE env var
+    """
+    if profile is not None:
+        return bool(profile)
+
+    return os.environ.get(PROFILE_ENV_VAR, '').lower() in ('1', 'true', 'yes', 'on')
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def _stage_filename(stage_name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', stage_name).strip('_')
+
+class _StackSampler(threading.Thread):
+    """
+    Background thread sampling the call stack of one thread at a fixed interval
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+class StageProfiler:
+    """
+    Per-stage cProfile and stack-sampling profiler.
+
+    For every profiled stage a ``<stage>.prof`` pstats dump and a
+    ``<stage>.collapsed`` file (folded stacks, one ``frame;frame;frame count``
+    line per stack, as consumed by flamegraph.pl, speedscope or inferno) are
+    written to ``output_dir``; ``pipeline.collapsed`` combines all stages under
+    a root frame per stage. Repeated runs of a stage accumulate.
+    """
+
+    def __init__(self, output_dir=None, sample_interval=0.005):
+        self.output_dir = output_dir or os.environ.get(PROFILE_DIR_ENV_VAR, DEFAULT_PROFILE_DIR)
+        self.sample_interval = sample_interval
+        self.stage_stats = {}
+        self.stage_stacks = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        del state['_local']
+        # pstats.Stats keeps an output stream, which cannot be pickled
+        state['stage_stats'] = {}
+        for stage_name, stats in self.stage_stats.items():
+            stats = copy.copy(stats)
+            stats.stream = None
+            state['stage_stats'][stage_name] = stats
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for stats in self.stage_stats.values():
+            stats.stream = sys.stdout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile_stage(self, stage_name):
+        """
+        Profile a block of code as one stage
+        """
+        # Only one profiler can be active per thread, so nested stages are
+        # attributed to the outermost profiled stage
+        if getattr(self._local, 'active', False):
+            yield
+            return
+
+        self._local.active = True
+        profile = cProfile.Profile()
+        sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+
+        sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            sampler.stop()
+            self._local.active = False
+            self._add_stage(stage_name, profile, sampler.stacks)
+
+    def _add_stage(self, stage_name, profile, stacks):
+        with self._lock:
+            if stage_name in self.stage_stats:
+                self.stage_stats[stage_name].add(profile)
+            else:
+                self.stage_stats[stage_name] = pstats.Stats(profile)
+
+            self.stage_stacks.setdefault(stage_name, Counter()).update(stacks)
+
+            try:
+                self._write_stage(stage_name)
+            except OSError as e:
+                print(f"Warning: Could not write profile for {stage_name}: {e}")
+
+    def _write_stage(self, stage_name):
+        os.makedirs(self.output_dir, exist_ok=True)
+        filename = _stage_filename(stage_name)
+
+        self.stage_stats[stage_name].dump_stats(os.path.join(self.output_dir, f"{filename}.prof"))
+
+        with open(os.path.join(self.output_dir, f"{filename}.collapsed"), 'w') as f:
+            for stack, count in self.stage_stacks[stage_name].most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(os.path.join(self.output_dir, 'pipeline.collapsed'), 'w') as f:
+            for name, stacks in self.stage_stacks.items():
+                root = name.replace(';', '_').replace(' ', '_')
+                for stack, count in stacks.most_common():
+                    f.write(f"{root};{stack} {count}\n")
+
+    def get_hot_functions(self, top_n=20, stage_name=None):
+        """
+        Get the top-N functions by own (exclusive) time across all or one stage
+        """
+        with self._lock:
+            if stage_name is not None:
+                stats_list = [self.stage_stats[stage_name]] if stage_name in self.stage_stats else []
+            else:
+                stats_list = list(self.stage_stats.values())
+
+            if not stats_list:
+                return []
+
+            combined = pstats.Stats()
+            for stats in stats_list:
+                combined.add(stats)
+
+        hot_functions = []
+        for (filename, line, function), (_, calls, total_time, cumulative_time, _) in combined.stats.items():
+            hot_functions.append({
+                'function': function,
+                'location': f"{os.path.basename(filename)}:{line}",
+                'calls': calls,
+                'own_time_s': total_time,
+                'cumulative_time_s': cumulative_time
+            })
+
+        hot_functions.sort(key=lambda row: row['own_time_s'], reverse=True)
+        return hot_functions[:top_n]
+
+    def reset(self):
+        """
+        Discard all collected profiles
+        """
+        with self._lock:
+            self.stage_stats.clear()
+            self.stage_stacks.clear()
@@ -0,0 +1,365 @@
+import numpy as np
+import pandas as pd
+
+class TDigest:
+    """
+    Mergeable t-digest quantile sketch.
+
+    Values are buffered and periodically compressed into weighted centroids
+    whose sizes follow the k1 scale function, so the tails keep fine
+    resolution while the middle of the distribution is summarized coarsely.
+    Memory stays O(compression) regardless of how many values are added, and
+    digests built on separate chunks or workers can be merged.
+    """
+
+    def __init__(self, compression=200, buffer_size=None):
+        self.compression = compression
+        self.buffer_size = buffer_size or compression * 20
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer_means = []
+        self._buffer_weights = []
+        self._buffered = 0
+
+    def update(self, values, weights=None):
+        """
+        Add an array of values (NaNs are ignored)
+        """
+        values = np.asarray(values, dtype=float).ravel()
+
+        if weights is None:
+            mask = ~np.isnan(values)
+            values = values[mask]
+            weights = np.ones(len(values))
+        else:
+            weights = np.asarray(weights, dtype=float).ravel()
+            mask = ~np.isnan(values)
+            values, weights = values[mask], weights[mask]
+
+        if len(values) == 0:
+            return self
+
+        self.count += weights.sum()
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        self._buffer_means.append(values)
+        self._buffer_weights.append(weights)
+        self._buffered += len(values)
+
+        if self._buffered >= self.buffer_size:
+            self._compress()
+
+        return self
+
+    def merge(self, other):
+        """
+        Merge another digest into this one
+        """
+        other._compress()
+        if other.count == 0:
+            return self
+
+        self._buffer_means.append(other.means)
+        self._buffer_weights.append(other.weights)
+        self._buffered += len(other.means)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        self._compress()
+        return self
+
+    def _compress(self):
+        if not self._buffered:
+            return
+
+        means = np.concatenate([self.means] + self._buffer_means)
+        weights = np.concatenate([self.weights] + self._buffer_weights)
+        self._buffer_means = []
+        self._buffer_weights = []
+        self._buffered = 0
+
+        order = np.argsort(means, kind='mergesort')
+        means, weights = means[order], weights[order]
+
+        # Place each point on the k1 scale by its mid-quantile; points sharing
+        # a unit-width k bucket are merged into one centroid
+        cumulative = np.cumsum(weights)
+        q_mid = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+        buckets = np.floor(k - k[0]).astype(np.int64)
+
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        merged_weights = np.add.reduceat(weights, starts)
+        merged_means = np.add.reduceat(means * weights, starts) / merged_weights
+
+        self.means = merged_means
+        self.weights = merged_weights
+
+    def quantile(self, q):
+        """
+        Estimate the value at quantile q (scalar or array, 0-1)
+        """
+        self._compress()
+        if self.count == 0:
+            return np.nan if np.ndim(q) == 0 else np.full(np.shape(q), np.nan)
+
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.r_[0.0, centers, self.count]
+        values = np.r_[self.min, self.means, self.max]
+
+        return np.interp(np.asarray(q, dtype=float) * self.count, positions, values)
+
+    def cdf(self, x):
+        """
+        Estimate the fraction of values at or below x (scalar or array)
+        """
+        self._compress()
+        if self.count == 0:
+            return np.nan if np.ndim(x) == 0 else np.full(np.shape(x), np.nan)
+
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.r_[0.0, centers, self.count]
+        values = np.r_[self.min, self.means, self.max]
+
+        return np.interp(x, values, positions, left=0.0, right=self.count) / self.count
+
+def sample_moments(values):
+    """
+    Get (count, mean, sum of squared deviations) of an array without NaNs
+    """
+    if len(values) == 0:
+        return 0, 0.0, 0.0
+
+    mean = values.mean()
+    return len(values), mean, ((values - mean) ** 2).sum()
+
+def combine_moments(count, mean, m2, other_count, other_mean, other_m2):
+    """
+    Combine the (count, mean, m2) of two samples with Chan's parallel update
+    """
+    if other_count == 0:
+        return count, mean, m2
+
+    total = count + other_count
+    delta = other_mean - mean
+    return (
+        total,
+        mean + delta * other_count / total,
+        m2 + other_m2 + delta ** 2 * count * other_count / total
+    )
+
+class SalarySketch:
+    """
+    Mergeable one-pass summary of a salary distribution.
+
+    Count, mean, variance, min and max are exact (merged with Chan's
+    parallel update); quantiles come from a t-digest. ``count`` covers
+    non-missing salaries only; ``records`` also counts the missing ones.
+    """
+
+    def __init__(self, compression=200):
+        self.records = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.digest = TDigest(compression=compression)
+
+    def _combine_moments(self, count, mean, m2):
+        self.count, self.mean, self.m2 = combine_moments(self.count, self.mean, self.m2, count, mean, m2)
+
+    def update(self, values):
+        """
+        Add an array of salaries (NaNs are ignored)
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        self.records += len(values)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self._combine_moments(*sample_moments(values))
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.digest.update(values)
+
+        return self
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one
+        """
+        self.records += other.records
+        self._combine_moments(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.digest.merge(other.digest)
+
+        return self
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def quantile(self, q):
+        return self.digest.quantile(q)
+
+    def percentile_rank(self, salary):
+        """
+        Estimate the percentile rank (0-100) of a salary or array of salaries
+        """
+        return self.digest.cdf(salary) * 100
+
+    def describe(self):
+        """
+        Summary matching the keys of pandas Series.describe()
+        """
+        q25, q50, q75 = self.quantile([0.25, 0.5, 0.75]) if self.count else [np.nan] * 3
+
+        return {
+            'count': float(self.count),
+            'mean': self.mean if self.count else np.nan,
+            'std': self.std,
+            'min': self.min if self.count else np.nan,
+            '25%': q25,
+            '50%': q50,
+            '75%': q75,
+            'max': self.max if self.count else np.nan
+        }
+
+def _leading_zeros(values):
+    """
+    Count leading zero bits of each uint64 value (64 for zero)
+    """
+    values = values.copy()
+    zeros = np.zeros(len(values), dtype=np.int64)
+
+    for shift in (32, 16, 8, 4, 2, 1):
+        # Values whose top `shift` bits are all zero
+        mask = values < np.uint64(1 << (64 - shift))
+        zeros[mask] += shift
+        values[mask] <<= np.uint64(shift)
+
+    zeros[values == 0] = 64
+    return zeros
+
+class HyperLogLog:
+    """
+    Mergeable HyperLogLog distinct-count sketch over 64-bit hashes.
+
+    The top ``precision`` bits of each hash pick one of 2**precision
+    registers, which keeps the longest run of leading zeros seen in the
+    remaining bits. The relative error is about 1.04 / sqrt(2**precision)
+    (0.8% at the default of 14, using 16 KiB).
+    """
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = np.zeros(self.num_registers, dtype=np.uint8)
+
+    def update(self, hashes):
+        """
+        Add an array of uint64 hashes (e.g. from fingerprints.row_fingerprints)
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64).ravel()
+        if len(hashes) == 0:
+            return self
+
+        register_index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remainder = hashes << np.uint64(self.precision)
+        rank = np.minimum(_leading_zeros(remainder), 64 - self.precision) + 1
+
+        np.maximum.at(self.registers, register_index, rank.astype(np.uint8))
+        return self
+
+    def merge(self, other):
+        """
+        Merge another sketch of the same precision into this one
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """
+        Estimate the number of distinct hashes added
+        """
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        # Small-range correction: linear counting while registers are still empty
+        empty_registers = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and empty_registers:
+            estimate = m * np.log(m / empty_registers)
+
+        return int(round(estimate))
+
+def build_salary_sketches(chunks, group_by_column=None, compression=200):
+    """
+    Build salary sketches in one pass over an iterable of DataFrame chunks.
+
+    group_by_column may be a column name or a list of columns; groups of
+    several columns are keyed by tuples. Returns the overall SalarySketch
+    and a dict of per-group sketches (empty when no group_by_column is
+    given). Results from separate workers can be combined with
+    merge_salary_sketches.
+    """
+    overall = SalarySketch(compression=compression)
+    groups = {}
+
+    if isinstance(group_by_column, str):
+        group_by_columns = [group_by_column]
+    else:
+        group_by_columns = list(group_by_column or [])
+    # A single column keeps scalar group keys
+    group_key = group_by_columns[0] if len(group_by_columns) == 1 else group_by_columns
+
+    for chunk in chunks:
+        if 'salary' not in chunk.columns:
+            continue
+
+        salaries = pd.to_numeric(chunk['salary'], errors='coerce').to_numpy(dtype=float)
+        overall.update(salaries)
+
+        if group_by_columns and all(col in chunk.columns for col in group_by_columns):
+            grouped = chunk.groupby(group_key, sort=False, observed=True).indices
+            for group, positions in grouped.items():
+                if group not in groups:
+                    groups[group] = SalarySketch(compression=compression)
+                groups[group].update(salaries[positions])
+
+    return overall, groups
+
+def merge_salary_sketches(results):
+    """
+    Merge (overall, groups) pairs produced by build_salary_sketches on separate workers
+    """
+    overall = None
+    groups = {}
+
+    for partial_overall, partial_groups in results:
+        if overall is None:
+            overall = partial_overall
+        else:
+            overall.merge(partial_overall)
+
+        for group, sketch in partial_groups.items():
+            if group in groups:
+                groups[group].merge(sketch)
+            else:
+                groups[group] = sketch
+
+    return overall, groups
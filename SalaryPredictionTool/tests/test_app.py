@@ -0,0 +1,57 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from data_generator import generate_synthetic_data
+from model_trainer import ModelTrainer
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+@pytest.fixture(scope="module")
+def model_artifact(tmp_path_factory):
+    trainer = ModelTrainer(generate_synthetic_data(500))
+    trainer.train_models(models_to_train=["Linear Regression"])
+
+    path = str(tmp_path_factory.mktemp("models") / "models.joblib")
+    trainer.save_models(path)
+    return path
+
+def test_warm_start_prediction_without_dataset(model_artifact, monkeypatch):
+    monkeypatch.setenv("SALARY_MODEL_PATH", model_artifact)
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.run()
+    assert at.session_state.predictor is not None
+    assert at.session_state.data is None
+
+    at.sidebar.selectbox[0].set_value("🔮 Salary Prediction").run()
+    at.button[0].click().run()
+
+    assert not at.exception
+    assert not at.error
+    # No dataset was loaded or trained on the way to the first prediction
+    assert at.session_state.data is None
+    metric_labels = [metric.label for metric in at.metric]
+    assert metric_labels[0] == "🧠 Models"
+    assert "USD" in metric_labels and "EUR" in metric_labels
+
+def test_finished_training_is_swapped_in_on_another_page(monkeypatch, tmp_path):
+    monkeypatch.setenv("SALARY_MODEL_PATH", str(tmp_path / "missing.joblib"))
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.session_state.data = generate_synthetic_data(400)
+    at.run()
+    at.sidebar.selectbox[0].set_value("🤖 Model Training").run()
+    at.multiselect[0].set_value(["Linear Regression"]).run()
+    at.button[0].click().run()
+
+    job = at.session_state.training_job
+    at.sidebar.selectbox[0].set_value("🔮 Salary Prediction").run()
+    assert job.wait(timeout=60)
+
+    # The training page's progress fragment is not running here
+    at.run()
+    assert at.session_state.training_job is None
+    assert at.session_state.predictor is not None
+    assert list(at.session_state.predictor.models) == ["Linear Regression"]
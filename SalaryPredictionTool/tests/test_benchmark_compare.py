@@ -0,0 +1,23 @@
+from benchmark_compare import compare_results, format_report
+
+def _results(benchmarks):
+    return {'metadata': {'commit': 'abc'}, 'benchmarks': benchmarks}
+
+def test_benchmark_missing_from_candidate_fails():
+    baseline = _results({
+        'fit[Linear Regression]': {'stage': 'fit', 'times': [1.0, 1.0, 1.0]},
+        'predict_batch[1000]': {'stage': 'predict_batch', 'times': [0.5, 0.5, 0.5]}
+    })
+    candidate = _results({
+        'fit[Linear Regression]': {'stage': 'fit', 'times': [1.0, 1.01, 0.99]}
+    })
+
+    report = compare_results(baseline, candidate)
+
+    assert not report['passed']
+    assert report['regressions'] == []
+    assert report['missing_in_candidate'] == ['predict_batch[1000]']
+    assert "missing from candidate: predict_batch[1000]" in format_report(report)
+
+    # Benchmarks outside the compared stages are not required
+    assert compare_results(baseline, candidate, stages=['fit'])['passed']
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cli import main, score_file
+from data_generator import generate_synthetic_data
+from model_trainer import ModelTrainer
+
+@pytest.fixture(scope="module")
+def model_artifact(tmp_path_factory):
+    trainer = ModelTrainer(generate_synthetic_data(400))
+    trainer.train_models(models_to_train=["Linear Regression"])
+
+    path = str(tmp_path_factory.mktemp("models") / "models.joblib")
+    trainer.save_models(path)
+    return path
+
+def test_parquet_output_from_mixed_dtype_chunks(model_artifact, tmp_path):
+    data = generate_synthetic_data(30).drop(columns=['salary'])
+    # 'notes' is empty in the first chunk and text later; 'badge' is int until a value goes missing
+    data['notes'] = [None] * 10 + ['referral'] * 20
+    data['badge'] = np.arange(30, dtype=float)
+    data.loc[25, 'badge'] = np.nan
+    input_path = tmp_path / "input.csv"
+    data.to_csv(input_path, index=False)
+    output_path = tmp_path / "scored.parquet"
+
+    summary = score_file(model_artifact, str(input_path), str(output_path), chunksize=10)
+
+    scored = pd.read_parquet(output_path)
+    assert summary['rows'] == len(scored) == 30
+    assert scored['notes'].isna().sum() == 10
+    assert scored['notes'].iloc[-1] == 'referral'
+    assert np.isnan(scored['badge'].iloc[25])
+    assert scored['badge'].iloc[24] == 24
+    assert scored['predicted_salary'].notna().all()
+
+def test_failed_run_removes_partial_output(model_artifact, tmp_path):
+    data = generate_synthetic_data(20).drop(columns=['salary'])
+    # Numeric in the first chunk, text in the second: no common type to cast to
+    data['experience'] = data['experience'].astype(object)
+    data.loc[10:, 'experience'] = 'ten'
+    input_path = tmp_path / "input.csv"
+    data.to_csv(input_path, index=False)
+    output_path = tmp_path / "scored.parquet"
+
+    exit_code = main(['score', '--models', model_artifact, '--input', str(input_path),
+                      '--output', str(output_path), '--chunksize', '10'])
+
+    assert exit_code == 1
+    assert not output_path.exists()
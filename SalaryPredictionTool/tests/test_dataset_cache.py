@@ -0,0 +1,26 @@
+import dataset_cache
+from dataset_cache import DatasetCache, get_default_cache, load_kaggle_data_cached
+
+def test_loader_kwargs_are_part_of_the_cache_key(tmp_path, monkeypatch):
+    source = tmp_path / "salaries.csv"
+    source.write_text("age,salary\n30,50000\n40,70000\n")
+    calls = []
+
+    def fake_loader(dataset_path, **loader_kwargs):
+        calls.append(loader_kwargs)
+        return dataset_cache.generate_synthetic_data(5)
+
+    monkeypatch.setattr(dataset_cache, "load_kaggle_data", fake_loader)
+    cache = DatasetCache(str(tmp_path / "cache"))
+
+    load_kaggle_data_cached(str(source), cache=cache)
+    load_kaggle_data_cached(str(source), cache=cache)
+    load_kaggle_data_cached(str(source), cache=cache, chunksize=1)
+
+    assert calls == [{}, {'chunksize': 1}]
+
+def test_default_cache_is_shared(tmp_path, monkeypatch):
+    monkeypatch.setenv(dataset_cache.CACHE_DIR_ENV_VAR, str(tmp_path))
+
+    assert get_default_cache() is get_default_cache()
+    assert get_default_cache().cache_dir == str(tmp_path)
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from data_generator import generate_synthetic_data
+from dataset_stats import DatasetStatistics, dataset_fingerprint
+
+def test_append_matches_statistics_of_combined_frame():
+    first = generate_synthetic_data(1500)
+    first['salary'] = first['salary'].astype(float)
+    # Repeats rows of the first frame, so appending adds duplicates
+    second = pd.concat([first.iloc[:300], first.sample(200, random_state=1)], ignore_index=True)
+    second.loc[5, 'salary'] = np.nan
+    combined = pd.concat([first, second], ignore_index=True)
+
+    stats = DatasetStatistics(first).append(second)
+
+    assert stats.fingerprint == dataset_fingerprint(combined)
+    assert stats.duplicate_count == int(combined.duplicated().sum())
+    pd.testing.assert_frame_equal(stats.describe(), combined.describe())
+    for salary in [40000, 80000, 150000]:
+        assert stats.percentile_rank(salary) == (combined['salary'] <= salary).mean() * 100
+    assert stats.percentile_index.total_count == len(combined)
@@ -0,0 +1,99 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from exchange_rates import ExchangeRateProvider, FileRateProvider, StaticRateProvider, get_rate_provider
+from utils import CURRENCY_RATES, convert_salary_currency, get_currency_rates, get_rate_vector, CURRENCY_CODES
+
+SNAPSHOTS = {'snapshots': [
+    {'effective_date': '2024-01-01', 'rates': {'USD': 1.0, 'EUR': 0.90}},
+    {'effective_date': '2025-01-01', 'rates': {'USD': 1.0, 'EUR': 0.92, 'JPY': 149.5}}
+]}
+
+@pytest.fixture
+def rates_file(tmp_path):
+    path = tmp_path / 'rates.json'
+    path.write_text(json.dumps(SNAPSHOTS))
+    return path
+
+def test_base_provider_is_abstract():
+    with pytest.raises(TypeError):
+        ExchangeRateProvider()
+
+def test_rate_lookup_at_snapshot_boundaries(rates_file):
+    provider = FileRateProvider(str(rates_file))
+
+    assert provider.get_rate('EUR', '2024-12-31') == 0.90
+    assert provider.get_rate('EUR', '2025-01-01') == 0.92
+    assert provider.get_rate('EUR') == 0.92
+
+    with pytest.raises(ValueError, match="No exchange rates effective"):
+        provider.get_rate('EUR', '2023-12-31')
+    # JPY only appears in the second snapshot
+    with pytest.raises(ValueError, match="No JPY rate"):
+        provider.get_rate('JPY', '2024-12-31')
+
+def test_rates_on_matches_single_lookups(rates_file):
+    provider = FileRateProvider(str(rates_file))
+    dates = ['2023-12-31', '2024-01-01', '2024-12-31', '2025-01-01', '2030-06-01']
+
+    rates = provider.rates_on(dates, ['EUR', 'JPY'])
+
+    np.testing.assert_array_equal(np.isnan(rates[:, 0]), [True, False, False, False, False])
+    np.testing.assert_array_equal(rates[1:, 0], [0.90, 0.90, 0.92, 0.92])
+    np.testing.assert_array_equal(np.isnan(rates[:, 1]), [True, True, True, False, False])
+
+def test_get_rate_uses_reloaded_snapshots(rates_file):
+    provider = FileRateProvider(str(rates_file), ttl=0)
+    assert provider.get_rate('EUR') == 0.92
+
+    updated = {'snapshots': SNAPSHOTS['snapshots'] + [
+        {'effective_date': '2026-01-01', 'rates': {'USD': 1.0, 'GBP': 0.75}}
+    ]}
+    rates_file.write_text(json.dumps(updated))
+    os.utime(rates_file, ns=(0, os.stat(rates_file).st_mtime_ns + 10**9))
+
+    # The reload adds a currency column, so a lookup indexed into the old matrix would be wrong
+    assert provider.get_rate('GBP') == 0.75
+    assert provider.get_rate('EUR', '2025-06-01') == 0.92
+
+def test_csv_snapshots(tmp_path):
+    path = tmp_path / 'rates.csv'
+    path.write_text("effective_date,currency,rate\n2024-01-01,EUR,0.9\n2025-01-01,EUR,0.92\n")
+
+    provider = FileRateProvider(str(tmp_path))
+
+    assert provider.get_rates('2024-06-01') == {'EUR': 0.9}
+    assert provider.effective_dates[-1].isoformat() == '2025-01-01'
+
+def test_utils_conversion_uses_configured_rates(rates_file, monkeypatch):
+    monkeypatch.setenv('SALARY_RATES_PATH', str(rates_file))
+
+    assert convert_salary_currency(1000.0, 'USD', 'EUR') == pytest.approx(920.0)
+    # Currencies missing from the rate file keep the built-in rate
+    rate_vector = get_rate_vector()
+    assert rate_vector[CURRENCY_CODES.index('GBP')] == CURRENCY_RATES['GBP']
+
+def test_utils_rates_are_cached_until_the_table_is_replaced(rates_file, monkeypatch):
+    monkeypatch.setenv('SALARY_RATES_PATH', str(rates_file))
+
+    rate_vector = get_rate_vector()
+    assert get_rate_vector() is rate_vector
+    assert not rate_vector.flags.writeable
+
+    updated = {'snapshots': SNAPSHOTS['snapshots'] + [
+        {'effective_date': '2026-01-01', 'rates': {'USD': 1.0, 'EUR': 0.95}}
+    ]}
+    rates_file.write_text(json.dumps(updated))
+    get_rate_provider().reload()
+
+    assert get_rate_vector() is not rate_vector
+    assert get_currency_rates()['EUR'] == 0.95
+
+def test_static_provider_serves_builtin_rates():
+    provider = StaticRateProvider()
+
+    assert provider.get_rates() == CURRENCY_RATES
+    assert provider.get_rate('JPY', '2000-01-01') == CURRENCY_RATES['JPY']
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_generator import generate_synthetic_data
+from fingerprints import (FingerprintSet, count_duplicate_rows, drop_duplicate_rows, duplicated_rows,
+                          row_fingerprints)
+
+def _frames():
+    data = generate_synthetic_data(2000)
+    with_repeats = pd.concat([data, data.sample(500, random_state=0)], ignore_index=True)
+
+    with_missing = with_repeats.copy()
+    with_missing.loc[::7, 'salary'] = np.nan
+    with_missing.loc[::11, 'job_title'] = None
+
+    categorical = with_missing.astype({'education': 'category', 'location': 'category'})
+    categorical['education'] = categorical['education'].cat.add_categories(['Unused'])
+
+    duplicate_names = pd.DataFrame(
+        np.random.default_rng(0).integers(0, 3, size=(3000, 3)), columns=['a', 'a', 'b']
+    )
+
+    # Enough high-cardinality columns that the mixed-radix code overflows 64 bits
+    rng = np.random.default_rng(1)
+    wide = pd.DataFrame({f"c{i}": rng.integers(0, 5000, 4000) for i in range(8)})
+    wide = pd.concat([wide, wide.iloc[:300]], ignore_index=True)
+
+    return {
+        'repeats': with_repeats,
+        'missing': with_missing,
+        'categorical': categorical,
+        'duplicate_names': duplicate_names,
+        'wide': wide
+    }
+
+@pytest.mark.parametrize("name, df", list(_frames().items()))
+def test_fingerprint_dedup_matches_pandas(name, df):
+    expected = df.duplicated().to_numpy()
+
+    np.testing.assert_array_equal(duplicated_rows(df), expected)
+    assert count_duplicate_rows(df) == expected.sum()
+    pd.testing.assert_frame_equal(drop_duplicate_rows(df), df.drop_duplicates())
+
+def test_stable_fingerprints_dedup_across_chunks():
+    df = _frames()['missing']
+    # Uneven chunk sizes exercise merges of the sorted runs
+    bounds = [0, 100, 150, 900, 960, 1000, 1800, 2100, len(df)]
+
+    seen = FingerprintSet()
+    keep = [
+        seen.add(row_fingerprints(df.iloc[start:end], stable=True))
+        for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+
+    np.testing.assert_array_equal(np.concatenate(keep), ~df.duplicated().to_numpy())
+    assert len(seen) == len(df.drop_duplicates())
@@ -0,0 +1,82 @@
+import pickle
+import threading
+
+import pytest
+
+from data_generator import generate_synthetic_data
+from instrumentation import PipelineInstrumentation, _current_rss_bytes
+from model_trainer import ModelTrainer
+from predictor import SalaryPredictor
+from profiling import StageProfiler
+
+@pytest.fixture(scope="module")
+def predictor():
+    trainer = ModelTrainer(generate_synthetic_data(300))
+    trainer.train_models(models_to_train=["Linear Regression"])
+    return SalaryPredictor(trainer.models, trainer.encoders, trainer.scaler)
+
+@pytest.fixture(scope="module")
+def employee():
+    return generate_synthetic_data(1).drop(columns=['salary']).iloc[0].to_dict()
+
+def test_instrumentation_round_trips_through_pickle():
+    instrumentation = PipelineInstrumentation()
+    with instrumentation.stage('load'):
+        pass
+
+    restored = pickle.loads(pickle.dumps(instrumentation))
+    with restored.stage('load'):
+        pass
+
+    totals = restored.get_report()['totals']
+    assert [(stage['stage'], stage['count']) for stage in totals] == [('load', 2)]
+
+def test_profiler_round_trips_through_pickle(tmp_path):
+    profiler = StageProfiler(output_dir=str(tmp_path))
+    with profiler.profile_stage('work'):
+        sum(range(10000))
+
+    restored = pickle.loads(pickle.dumps(profiler))
+    with restored.profile_stage('work'):
+        sum(range(10000))
+
+    assert restored.get_hot_functions(top_n=5)
+
+def test_predictor_pickles_and_predicts(predictor, employee):
+    restored = pickle.loads(pickle.dumps(predictor))
+    assert restored.predict(employee) == pytest.approx(predictor.predict(employee))
+
+@pytest.mark.skipif(_current_rss_bytes() is None, reason="RSS is read from /proc")
+def test_predictor_samples_rss_only_while_profiling(predictor, employee, tmp_path):
+    predictor.instrumentation.reset()
+    predictor.predict(employee)
+    assert all(stage['rss_before_bytes'] is None for stage in predictor.instrumentation.get_report()['stages'])
+
+    predictor.instrumentation.reset()
+    predictor.predict(employee, profile=True, profile_dir=str(tmp_path))
+    assert any(stage['rss_before_bytes'] is not None for stage in predictor.instrumentation.get_report()['stages'])
+
+def test_profiler_is_attached_only_for_the_profiling_thread(tmp_path):
+    instrumentation = PipelineInstrumentation(track_rss=False)
+    profiler = StageProfiler(output_dir=str(tmp_path))
+    entered = threading.Event()
+    release = threading.Event()
+
+    def profiled():
+        with instrumentation.profiling(profiler):
+            entered.set()
+            release.wait()
+            with instrumentation.stage('profiled'):
+                pass
+
+    thread = threading.Thread(target=profiled)
+    thread.start()
+    entered.wait()
+    # Runs while the other thread has its profiler attached
+    with instrumentation.stage('unprofiled'):
+        pass
+    release.set()
+    thread.join()
+
+    assert set(profiler.stage_stats) == {'profiled'}
+    assert instrumentation._active_profiler() is None
@@ -0,0 +1,25 @@
+import threading
+
+import pytest
+
+from data_generator import generate_synthetic_data
+from model_trainer import ModelTrainer, TrainingCancelled
+
+def test_cancelled_training_keeps_published_preprocessing():
+    trainer = ModelTrainer(generate_synthetic_data(300))
+    trainer.train_models(models_to_train=["Linear Regression"])
+    encoders, scaler, models = trainer.encoders, trainer.scaler, dict(trainer.models)
+
+    cancel_event = threading.Event()
+
+    def cancel_after_preprocessing(event):
+        if event['stage'] == 'preprocess':
+            cancel_event.set()
+
+    with pytest.raises(TrainingCancelled):
+        trainer.train_models(models_to_train=["Linear Regression"],
+                             progress_callback=cancel_after_preprocessing, cancel_event=cancel_event)
+
+    assert trainer.encoders is encoders
+    assert trainer.scaler is scaler
+    assert trainer.models == models
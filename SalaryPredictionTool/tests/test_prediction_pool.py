@@ -0,0 +1,37 @@
+import os
+import signal
+
+import numpy as np
+import pytest
+
+from data_generator import generate_synthetic_data
+from model_trainer import ModelTrainer
+from prediction_pool import PredictionWorkerPool
+from predictor import SalaryPredictor
+
+@pytest.fixture(scope="module")
+def predictor_and_features():
+    data = generate_synthetic_data(600)
+    trainer = ModelTrainer(data)
+    trainer.train_models(models_to_train=["Linear Regression"])
+    predictor = SalaryPredictor(trainer.models, trainer.encoders, trainer.scaler)
+    return predictor, data.drop(columns=['salary'])
+
+def test_pool_predictions_keep_input_order(predictor_and_features):
+    predictor, features = predictor_and_features
+
+    with PredictionWorkerPool(predictor, num_workers=3) as pool:
+        predictions = pool.predict(features, batch_size=70)
+
+    np.testing.assert_allclose(predictions, predictor.predict_batch(features))
+
+def test_pool_raises_when_a_worker_dies(predictor_and_features):
+    predictor, features = predictor_and_features
+
+    with PredictionWorkerPool(predictor, num_workers=2, poll_interval=0.1) as pool:
+        victim = pool._workers[0]
+        os.kill(victim.pid, signal.SIGKILL)
+        victim.join(timeout=5)
+
+        with pytest.raises(RuntimeError, match="exited with code"):
+            pool.predict(features, batch_size=100)
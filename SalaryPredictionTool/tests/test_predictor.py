@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_generator import generate_synthetic_data
+from model_trainer import ModelTrainer
+from predictor import SalaryPredictor
+
+@pytest.fixture(scope="module")
+def predictor_and_features():
+    data = generate_synthetic_data(500)
+    trainer = ModelTrainer(data)
+    trainer.train_models(models_to_train=["Linear Regression"])
+    predictor = SalaryPredictor(trainer.models, trainer.encoders, trainer.scaler, trainer.feature_columns)
+    return predictor, data.drop(columns=['salary']).iloc[:20].reset_index(drop=True)
+
+def test_categorical_input_with_missing_values_is_encoded_per_value(predictor_and_features):
+    predictor, features = predictor_and_features
+    categorical = features.astype({'job_title': 'category'})
+    categorical['job_title'] = categorical['job_title'].cat.add_categories(['Astronaut'])
+    categorical.loc[0, 'job_title'] = np.nan
+    categorical.loc[1, 'job_title'] = 'Astronaut'
+
+    encoded = predictor._preprocess_input(categorical)
+    expected = predictor._preprocess_input(features.astype({'job_title': object}))
+
+    # Only the missing and unseen rows fall back to the first class
+    pd.testing.assert_frame_equal(encoded.iloc[2:], expected.iloc[2:])
+    first_class = features.iloc[:2].assign(job_title=predictor.encoders['job_title'].classes_[0])
+    pd.testing.assert_frame_equal(encoded.iloc[:2], predictor._preprocess_input(first_class))
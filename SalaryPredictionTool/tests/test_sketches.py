@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from fingerprints import row_fingerprints
+from sketches import HyperLogLog, SalarySketch, TDigest
+from utils import calculate_salary_statistics, calculate_salary_statistics_streaming
+
+QUANTILES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+def test_merged_tdigests_match_a_single_pass():
+    values = np.random.default_rng(0).lognormal(11, 0.5, 200000)
+    chunks = np.array_split(values, 8)
+
+    single = TDigest().update(values)
+    merged = TDigest()
+    for chunk in chunks:
+        merged.merge(TDigest().update(chunk))
+
+    assert merged.count == single.count == len(values)
+    # Compare in rank space: each estimate should sit within 0.5% of its target rank
+    for digest in (single, merged):
+        estimates = digest.quantile(QUANTILES)
+        ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+        np.testing.assert_allclose(ranks, QUANTILES, atol=0.005)
+
+def test_merged_salary_sketches_have_exact_moments():
+    values = np.random.default_rng(1).normal(80000, 20000, 50000)
+    values[::97] = np.nan
+
+    single = SalarySketch().update(values)
+    merged = SalarySketch()
+    for chunk in np.array_split(values, 5):
+        merged.merge(SalarySketch().update(chunk))
+
+    valid = values[~np.isnan(values)]
+    for sketch in (single, merged):
+        assert sketch.records == len(values)
+        assert sketch.count == len(valid)
+        np.testing.assert_allclose([sketch.mean, sketch.std], [valid.mean(), valid.std(ddof=1)])
+        assert (sketch.min, sketch.max) == (valid.min(), valid.max())
+
+def test_merged_hyperloglogs_match_a_single_pass():
+    df = pd.DataFrame({'id': np.arange(100000) % 60000, 'group': np.arange(100000) % 7})
+    hashes = row_fingerprints(df, stable=True)
+
+    single = HyperLogLog().update(hashes)
+    merged = HyperLogLog()
+    for chunk in np.array_split(hashes, 6):
+        merged.merge(HyperLogLog().update(chunk))
+
+    # Register-wise max is order independent, so the merge is exact
+    np.testing.assert_array_equal(merged.registers, single.registers)
+    true_distinct = len(df.drop_duplicates())
+    assert abs(merged.count() - true_distinct) / true_distinct < 0.03
+
+def test_streaming_statistics_count_rows_with_missing_salaries():
+    df = pd.DataFrame({'salary': [50000.0, np.nan, 70000.0, np.nan, 90000.0]})
+
+    streaming = calculate_salary_statistics_streaming([df.iloc[:2], df.iloc[2:]])
+    exact = calculate_salary_statistics(df)
+
+    assert streaming['overall_statistics']['total_records'] == exact['overall_statistics']['total_records'] == 5
+    assert streaming['overall_statistics']['mean_salary'] == exact['overall_statistics']['mean_salary']
+
+def test_streaming_statistics_group_by_several_columns():
+    df = pd.DataFrame({
+        'education': ['BS', 'BS', 'MS', 'MS', 'BS', 'MS'],
+        'remote_work': ['Yes', 'No', 'Yes', 'Yes', 'Yes', 'No'],
+        'salary': [50000.0, 60000.0, 70000.0, 80000.0, 90000.0, 100000.0]
+    })
+    group_by = ['education', 'remote_work']
+
+    streaming = calculate_salary_statistics_streaming([df.iloc[:3], df.iloc[3:]], group_by)
+    exact = calculate_salary_statistics(df, group_by)
+
+    for stat in ('count', 'mean', 'min', 'max'):
+        assert streaming['grouped_statistics'][stat] == exact['grouped_statistics'][stat]
+    assert set(streaming['salary_distribution_by_group']) == set(exact['salary_distribution_by_group'])
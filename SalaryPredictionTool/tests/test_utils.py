@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from data_generator import generate_synthetic_data
+from utils import clean_data, clean_data_chunked, concat_categorical_frames, normalize_unique_values
+
+def test_concat_categorical_frames_leaves_inputs_unchanged():
+    first = pd.DataFrame({'city': pd.Categorical(['Austin', 'Boston']), 'salary': [1.0, 2.0]})
+    second = pd.DataFrame({'city': pd.Categorical(['Chicago']), 'salary': [3.0]})
+    originals = [first.copy(), second.copy()]
+
+    combined = concat_categorical_frames([first, second])
+
+    assert list(combined['city'].cat.categories) == ['Austin', 'Boston', 'Chicago']
+    assert combined['city'].tolist() == ['Austin', 'Boston', 'Chicago']
+    pd.testing.assert_frame_equal(first, originals[0])
+    pd.testing.assert_frame_equal(second, originals[1])
+
+def test_normalized_categories_still_concatenate():
+    raw = pd.Series(pd.Categorical([' Austin', 'Boston', None]))
+    normalized = normalize_unique_values(raw, str.strip)
+
+    assert normalized.cat.categories.dtype == raw.cat.categories.dtype
+    assert normalized.isna().tolist() == [False, False, True]
+
+    combined = concat_categorical_frames([
+        pd.DataFrame({'city': normalized}),
+        pd.DataFrame({'city': pd.Categorical(['Chicago'])})
+    ])
+    assert combined['city'].tolist()[:2] == ['Austin', 'Boston']
+
+def test_clean_data_returns_a_copy_of_clean_input():
+    df = pd.DataFrame({'age': [30, 40, 50], 'salary': [50000.0, 60000.0, 70000.0]})
+
+    cleaned = clean_data(df)
+    cleaned.loc[0, 'salary'] = 0.0
+
+    assert cleaned is not df
+    assert df.loc[0, 'salary'] == 50000.0
+
+def test_clean_data_strips_text_only_when_asked():
+    df = pd.DataFrame({'job_title': [' Engineer', 'Engineer ', 'Analyst'], 'salary': [1.0, 1.0, 2.0]})
+
+    assert clean_data(df)['job_title'].tolist() == [' Engineer', 'Engineer ', 'Analyst']
+    assert clean_data(df, strip_whitespace=True)['job_title'].tolist() == ['Engineer', 'Analyst']
+
+def test_clean_data_chunked_drops_the_same_duplicates_as_clean_data():
+    data = generate_synthetic_data(3000)
+    data = pd.concat([data, data.sample(1000, random_state=0)], ignore_index=True)
+    chunks = lambda: (data.iloc[start:start + 700] for start in range(0, len(data), 700))
+
+    cleaned = pd.concat(list(clean_data_chunked(chunks)))
+
+    # Outlier bounds come from t-digest quartiles, so only a few rows at the bounds may differ
+    deduplicated = data.drop_duplicates()
+    assert cleaned.index.isin(deduplicated.index).all()
+    assert abs(len(cleaned) - len(clean_data(data))) <= 5
+    pd.testing.assert_frame_equal(cleaned, deduplicated.loc[cleaned.index])
+
+def test_clean_data_chunked_rejects_a_changing_chunk_source():
+    data = generate_synthetic_data(100)
+    passes = []
+
+    def chunks():
+        passes.append(1)
+        size = 50 if len(passes) == 1 else 40
+        return (data.iloc[start:start + size] for start in range(0, len(data), size))
+
+    with pytest.raises(ValueError, match="different chunks"):
+        list(clean_data_chunked(chunks))
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+
+from model_trainer import TrainingCancelled
+
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+class TrainingJob:
+    """
+    Runs a training function on a background thread and records its progress.
+
+    ``train`` is called as ``train(progress_callback=..., cancel_event=...)``
+    (the keywords of ModelTrainer.train_models) and its return value becomes
+    ``result``. Progress events are kept in a bounded buffer that the UI
+    polls; ``cancel`` sets the event the trainer checks between steps. The
+    job never touches the models currently serving predictions, so callers
+    swap ``result`` in only once ``status`` is COMPLETED.
+    """
+
+    def __init__(self, train, max_events=200):
+        self._train = train
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.events = deque(maxlen=max_events)
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="training-job", daemon=True)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.status = RUNNING
+        self._thread.start()
+        return self
+
+    def _record_event(self, event):
+        event = dict(event, elapsed_s=time.perf_counter() - self.started_at)
+        with self._lock:
+            self.events.append(event)
+
+    def _run(self):
+        try:
+            self.result = self._train(progress_callback=self._record_event, cancel_event=self._cancel_event)
+            self.status = COMPLETED
+        except TrainingCancelled:
+            self.status = CANCELLED
+        except Exception as e:
+            self.error = e
+            self.status = FAILED
+        finally:
+            self.finished_at = time.perf_counter()
+
+    def cancel(self):
+        """
+        Ask the job to stop after the current training step
+        """
+        self._cancel_event.set()
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self):
+        return self.status in (COMPLETED, CANCELLED, FAILED)
+
+    @property
+    def latest_event(self):
+        with self._lock:
+            return self.events[-1] if self.events else None
+
+    @property
+    def progress(self):
+        """
+        Fraction of training steps completed (0 to 1)
+        """
+        if self.status == COMPLETED:
+            return 1.0
+
+        event = self.latest_event
+        if event is None:
+            return 0.0
+        return event['step'] / event['total_steps']
+
+    @property
+    def elapsed_s(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def wait(self, timeout=None):
+        """
+        Block until the job finishes (or the timeout passes); returns whether it finished
+        """
+        self._thread.join(timeout)
+        return self.done
+
+def describe_event(event):
+    """
+    Human-readable description of a training progress event
+    """
+    if event is None:
+        return "Starting..."
+    if event['stage'] == 'preprocess':
+        return "Preprocessed data"
+    if event['stage'] == 'fit':
+        return f"{event['model']}: fitted"
+    if event['stage'] == 'evaluate':
+        return f"{event['model']}: evaluated on the test set"
+    if event['stage'] == 'cv':
+        return f"{event['model']}: cross-validation fold {event['fold']} done"
+    return event['stage']
+
+if __name__ == "__main__":
+    from data_generator import generate_synthetic_data
+    from model_trainer import ModelTrainer
+
+    trainer = ModelTrainer(generate_synthetic_data(1000))
+    job = TrainingJob(trainer.train_models).start()
+
+    while not job.wait(timeout=0.5):
+        print(f"{job.progress:.0%} - {describe_event(job.latest_event)}")
+
+    print(f"Job {job.status} in {job.elapsed_s:.1f}s with {len(job.events)} progress events")
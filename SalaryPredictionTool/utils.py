@@ -3,197 +3,463 @@ import numpy as np
 import os
 import glob
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pandas.api.types import union_categoricals
 warnings.filterwarnings('ignore')
 
+from fingerprints import FingerprintSet, count_duplicate_rows, drop_duplicate_rows, row_fingerprints
+from instrumentation import instrument
+from sketches import HyperLogLog, SalarySketch, TDigest, build_salary_sketches
+
+# Current exchange rates (as of 2025), units per USD
+CURRENCY_RATES = {
+    'USD': 1.0000,      # Base currency
+    'EUR': 0.9200,      # Euro
+    'GBP': 0.7900,      # British Pound
+    'JPY': 149.50,      # Japanese Yen
+    'CAD': 1.3500,      # Canadian Dollar
+    'AUD': 1.5200,      # Australian Dollar
+    'CHF': 0.9100,      # Swiss Franc
+    'CNY': 7.2500,      # Chinese Yuan
+    'INR': 85.56,       # Indian Rupee
+    'BRL': 5.8500,      # Brazilian Real
+    'KRW': 1340.00,     # Korean Won
+    'MXN': 20.45,       # Mexican Peso
+    'SGD': 1.3400,      # Singapore Dollar
+    'HKD': 7.8000,      # Hong Kong Dollar
+    'NOK': 10.80,       # Norwegian Krone
+    'SEK': 11.20,       # Swedish Krona
+    'DKK': 6.8500,      # Danish Krone
+    'PLN': 4.0500,      # Polish Zloty
+    'RUB': 92.00,       # Russian Ruble
+    'TRY': 29.50,       # Turkish Lira
+}
+
+CURRENCY_SYMBOLS = {
+    'USD': '$',
+    'EUR': '€',
+    'GBP': '£',
+    'JPY': '¥',
+    'CAD': 'C$',
+    'AUD': 'A$',
+    'CHF': 'CHF',
+    'CNY': '¥',
+    'INR': '₹',
+    'BRL': 'R$',
+    'KRW': '₩',
+    'MXN': '$',
+    'SGD': 'S$',
+    'HKD': 'HK$',
+    'NOK': 'kr',
+    'SEK': 'kr',
+    'DKK': 'kr',
+    'PLN': 'zł',
+    'RUB': '₽',
+    'TRY': '₺'
+}
+
+# Currencies formatted without decimal places
+ZERO_DECIMAL_CURRENCIES = {'JPY', 'KRW'}
+
+# Built-in rates as a vector indexed by position in CURRENCY_CODES, for array conversions
+CURRENCY_CODES = list(CURRENCY_RATES)
+CURRENCY_INDEX = {code: position for position, code in enumerate(CURRENCY_CODES)}
+CURRENCY_RATE_VECTOR = np.array([CURRENCY_RATES[code] for code in CURRENCY_CODES])
+
+# (rate table, rate vector, rates dict) resolved from the provider's current table
+_RESOLVED_RATES = {}
+
+def _resolve_rates():
+    """
+    Get the current (rate vector, rates dict), rebuilt only when the provider's rate table changes
+    """
+    # Imported here: exchange_rates itself imports this module
+    from exchange_rates import get_rate_provider
+    
+    table = get_rate_provider().table
+    resolved = _RESOLVED_RATES.get('current')
+    if resolved is None or resolved[0] is not table:
+        rates = table.rate_vector(CURRENCY_CODES)
+        rate_vector = np.where(np.isnan(rates), CURRENCY_RATE_VECTOR, rates)
+        rate_vector.flags.writeable = False
+        # Replaced as one tuple so concurrent readers never see a mixed entry
+        resolved = (table, rate_vector, dict(zip(CURRENCY_CODES, rate_vector.tolist())))
+        _RESOLVED_RATES['current'] = resolved
+    
+    return resolved[1], resolved[2]
+
+def get_rate_vector():
+    """
+    Get the current rates aligned with CURRENCY_CODES (a read-only array)
+    
+    Rates come from the configured exchange-rate provider (a rate file when
+    SALARY_RATES_PATH is set); currencies the provider lacks keep their
+    built-in CURRENCY_RATES value.
+    """
+    return _resolve_rates()[0]
+
 def get_currency_rates():
     """
     Get exchange rates for multi-currency support
     """
-    # Current exchange rates (as of 2025)
-    rates = {
-        'USD': 1.0000,      # Base currency
-        'EUR': 0.9200,      # Euro
-        'GBP': 0.7900,      # British Pound
-        'JPY': 149.50,      # Japanese Yen
-        'CAD': 1.3500,      # Canadian Dollar
-        'AUD': 1.5200,      # Australian Dollar
-        'CHF': 0.9100,      # Swiss Franc
-        'CNY': 7.2500,      # Chinese Yuan
-        'INR': 85.56,       # Indian Rupee
-        'BRL': 5.8500,      # Brazilian Real
-        'KRW': 1340.00,     # Korean Won
-        'MXN': 20.45,       # Mexican Peso
-        'SGD': 1.3400,      # Singapore Dollar
-        'HKD': 7.8000,      # Hong Kong Dollar
-        'NOK': 10.80,       # Norwegian Krone
-        'SEK': 11.20,       # Swedish Krona
-        'DKK': 6.8500,      # Danish Krone
-        'PLN': 4.0500,      # Polish Zloty
-        'RUB': 92.00,       # Russian Ruble
-        'TRY': 29.50,       # Turkish Lira
-    }
+    return dict(_resolve_rates()[1])
+
+def _currency_positions(currency_codes):
+    """
+    Map currency codes (a code or array of codes) to positions in CURRENCY_RATE_VECTOR
+    """
+    if isinstance(currency_codes, str):
+        if currency_codes not in CURRENCY_INDEX:
+            raise ValueError("Unsupported currency")
+        return CURRENCY_INDEX[currency_codes]
     
-    return rates
+    try:
+        return np.array([CURRENCY_INDEX[code] for code in currency_codes], dtype=np.int64)
+    except KeyError:
+        raise ValueError("Unsupported currency")
 
 def format_currency(amount, currency_code):
     """
     Format currency amount with proper symbols and formatting
     """
-    currency_symbols = {
-        'USD': '$',
-        'EUR': '€',
-        'GBP': '£',
-        'JPY': '¥',
-        'CAD': 'C$',
-        'AUD': 'A$',
-        'CHF': 'CHF',
-        'CNY': '¥',
-        'INR': '₹',
-        'BRL': 'R$',
-        'KRW': '₩',
-        'MXN': '$',
-        'SGD': 'S$',
-        'HKD': 'HK$',
-        'NOK': 'kr',
-        'SEK': 'kr',
-        'DKK': 'kr',
-        'PLN': 'zł',
-        'RUB': '₽',
-        'TRY': '₺'
-    }
-    
-    symbol = currency_symbols.get(currency_code, currency_code)
+    symbol = CURRENCY_SYMBOLS.get(currency_code, currency_code)
     
     # Format with appropriate decimal places
-    if currency_code in ['JPY', 'KRW']:
+    if currency_code in ZERO_DECIMAL_CURRENCIES:
         # No decimal places for these currencies
         return f"{symbol}{amount:,.0f}"
     else:
         return f"{symbol}{amount:,.2f}"
 
-def load_kaggle_data(dataset_path):
+def format_currency_array(amounts, currency_codes):
+    """
+    Format an array of amounts for bulk display or export
+    
+    amounts is (N,) with one currency code, or (N, M) with M codes, one per
+    column; the symbol and precision are resolved once per currency rather
+    than per value. Returns an object array of strings with amounts' shape.
+    """
+    amounts = np.asarray(amounts, dtype=float)
+    single_currency = isinstance(currency_codes, str)
+    columns = amounts.reshape(-1, 1) if single_currency else amounts
+    codes = [currency_codes] if single_currency else list(currency_codes)
+    
+    if columns.ndim != 2 or columns.shape[1] != len(codes):
+        raise ValueError("Expected one currency code per column of amounts")
+    
+    formatted = np.empty(columns.shape, dtype=object)
+    for position, currency_code in enumerate(codes):
+        symbol = CURRENCY_SYMBOLS.get(currency_code, currency_code)
+        template = "{}{:,.0f}" if currency_code in ZERO_DECIMAL_CURRENCIES else "{}{:,.2f}"
+        formatted[:, position] = [template.format(symbol, value) for value in columns[:, position].tolist()]
+    
+    return formatted.reshape(amounts.shape)
+
+# Bump when load_kaggle_data's output changes so cached datasets are rebuilt
+LOADER_VERSION = 1
+
+# Column mapping for different dataset formats
+KAGGLE_COLUMN_MAPPING = {
+    'Salary': 'salary',
+    'Annual Salary': 'salary',
+    'yearly_salary': 'salary',
+    'wage': 'salary',
+    'income': 'salary',
+    'compensation': 'salary',
+    'Age': 'age',
+    'Gender': 'gender',
+    'Sex': 'gender',
+    'Education': 'education',
+    'Education Level': 'education',
+    'degree': 'education',
+    'Experience': 'experience',
+    'Years of Experience': 'experience',
+    'work_experience': 'experience',
+    'Job Title': 'job_title',
+    'Position': 'job_title',
+    'role': 'job_title',
+    'Location': 'location',
+    'City': 'location',
+    'State': 'location',
+    'Industry': 'industry',
+    'Sector': 'industry',
+    'Company Size': 'company_size',
+    'company_size': 'company_size',
+    'Remote Work': 'remote_work',
+    'remote': 'remote_work',
+    'work_from_home': 'remote_work'
+}
+
+SALARY_COLUMN_NAMES = ['salary', 'annual_salary', 'yearly_salary', 'wage', 'income', 'compensation']
+
+# String features read as category; the first five are also title-cased
+CATEGORICAL_FEATURES = ['gender', 'education', 'industry', 'location', 'job_title',
+                        'company_size', 'remote_work']
+TITLE_CASE_FEATURES = ['gender', 'education', 'industry', 'location', 'job_title']
+
+DEFAULT_FEATURE_VALUES = {
+    'age': 30,
+    'gender': 'Unknown',
+    'education': "Bachelor's",
+    'experience': 5,
+    'job_title': 'Unknown',
+    'location': 'Unknown',
+    'industry': 'Unknown',
+    'company_size': 'Medium (51-200)',
+    'remote_work': 'No'
+}
+
+def resolve_column_mapping(header):
+    """
+    Map raw CSV column names to standard names using only the header
+    
+    Returns a {raw name: standard name} dict, or None if no salary column is found.
+    """
+    mapping = {}
+    for col in header:
+        mapping[col] = KAGGLE_COLUMN_MAPPING.get(col, col).lower()
+    
+    # The first column that looks like a salary becomes 'salary'
+    for col, name in mapping.items():
+        if name in SALARY_COLUMN_NAMES:
+            mapping[col] = 'salary'
+            return mapping
+    
+    return None
+
+def factorize_values(series):
+    """
+    Get (codes, uniques) for a Series, using a categorical column's own codes and categories
+    
+    Missing values get code -1.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series)
+
+def normalize_unique_values(series, func):
+    """
+    Apply a per-value normalization to a Series once per distinct value
+    
+    The column is factorized, func runs only on the unique values and the
+    results are mapped back through the codes, so the Python-level work
+    scales with the number of distinct values instead of rows. Categorical
+    columns stay categorical (categories that collide after normalization
+    are merged); missing values stay missing.
+    """
+    codes, uniques = factorize_values(series)
+    
+    normalized = [func(value) for value in uniques]
+    if normalized == list(uniques):
+        return series
+    
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Keep the categories' dtype (str or object) so shards still combine with union_categoricals
+        category_codes, categories = pd.factorize(pd.Index(normalized, dtype=uniques.dtype))
+        # Code -1 (missing) indexes the appended -1 and stays missing
+        new_codes = np.append(category_codes, -1)[codes]
+        return pd.Series(
+            pd.Categorical.from_codes(new_codes, categories),
+            index=series.index,
+            name=series.name
+        )
+    
+    values = np.empty(len(normalized) + 1, dtype=object)
+    values[:-1] = normalized
+    values[-1] = np.nan
+    
+    return pd.Series(values[codes], index=series.index, name=series.name).infer_objects()
+
+def _read_csv_chunks(data_file, dtypes, chunksize, engine):
+    """
+    Yield DataFrame chunks of a CSV file read with explicit dtypes
+    """
+    if engine == 'pyarrow':
+        # The pyarrow engine parses with multiple threads but does not support chunksize
+        yield pd.read_csv(data_file, dtype=dtypes, engine='pyarrow')
+    else:
+        yield from pd.read_csv(data_file, dtype=dtypes, chunksize=chunksize)
+
+def _filter_salary_chunk(chunk):
+    """
+    Keep only rows with a valid, positive salary
+    """
+    salary = chunk['salary']
+    if salary.dtype != np.float32:
+        salary = pd.to_numeric(salary, errors='coerce').astype(np.float32)
+    
+    chunk = chunk.assign(salary=salary)
+    return chunk[(salary > 0).to_numpy()]
+
+def concat_categorical_frames(frames):
+    """
+    Concatenate DataFrames, unifying categories so categorical columns stay categorical
+    
+    Frames may have different columns; a categorical column missing from a
+    frame is filled with missing values for its rows.
+    """
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    
+    # Recategorized columns go into new frames via assign; the callers' frames are left as they are
+    columns = dict.fromkeys(col for frame in frames for col in frame.columns)
+    recategorized = [{} for _ in frames]
+    for col in columns:
+        parts = [frame[col] for frame in frames if col in frame.columns]
+        if not all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            continue
+        
+        categories = union_categoricals(parts).categories
+        for frame, new_columns in zip(frames, recategorized):
+            if col in frame.columns:
+                new_columns[col] = frame[col].cat.set_categories(categories)
+            else:
+                new_columns[col] = pd.Categorical.from_codes(np.full(len(frame), -1), categories)
+    
+    frames = [
+        frame.assign(**new_columns) if new_columns else frame
+        for frame, new_columns in zip(frames, recategorized)
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+def _resolve_engine(engine):
+    if engine == 'pyarrow':
+        try:
+            import pyarrow
+        except ImportError:
+            print("Warning: pyarrow not installed, falling back to the default CSV engine")
+            return None
+    
+    return engine
+
+def load_csv_file(data_file, chunksize=100000, engine=None):
+    """
+    Load one salary CSV into the standard schema
+    
+    The column mapping is resolved from the header alone, then the file is
+    read in chunks with explicit dtypes (category for string features,
+    float32 for salary) so multi-GB exports never hold an untyped copy in
+    memory. Title-casing is applied per category rather than per row and
+    missing feature columns are filled with defaults. Returns None if the
+    file has no salary column.
+    """
+    engine = _resolve_engine(engine)
+    
+    header = pd.read_csv(data_file, nrows=0).columns.tolist()
+    mapping = resolve_column_mapping(header)
+    
+    if mapping is None:
+        print(f"No salary column found in {data_file}")
+        print(f"Available columns: {[KAGGLE_COLUMN_MAPPING.get(col, col).lower() for col in header]}")
+        return None
+    
+    dtypes = {col: 'category' for col, name in mapping.items() if name in CATEGORICAL_FEATURES}
+    salary_source = next(col for col, name in mapping.items() if name == 'salary')
+    dtypes[salary_source] = 'float32'
+    
+    try:
+        chunks = [
+            _filter_salary_chunk(chunk.rename(columns=mapping))
+            for chunk in _read_csv_chunks(data_file, dtypes, chunksize, engine)
+        ]
+    except ValueError:
+        # Salary values that are not plain numbers: read as text and coerce
+        dtypes[salary_source] = 'str'
+        chunks = [
+            _filter_salary_chunk(chunk.rename(columns=mapping))
+            for chunk in _read_csv_chunks(data_file, dtypes, chunksize, engine)
+        ]
+    
+    df = concat_categorical_frames(chunks)
+    
+    # Clean and standardize other columns
+    for col in TITLE_CASE_FEATURES:
+        if col in df.columns:
+            df[col] = normalize_unique_values(df[col], str.title)
+    
+    # Add missing columns with default values if needed
+    for col, default_value in DEFAULT_FEATURE_VALUES.items():
+        if col not in df.columns:
+            if col in CATEGORICAL_FEATURES:
+                df[col] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int64), [default_value])
+            else:
+                df[col] = default_value
+    
+    return df
+
+def _find_csv_files(dataset_path):
+    return sorted(glob.glob(os.path.join(dataset_path, "*.csv")))
+
+def iter_kaggle_shards(dataset_path, chunksize=100000, engine=None):
+    """
+    Lazily load the CSV shards of a dataset directory one file at a time
+    
+    Yields one standardized DataFrame per file (files without a salary
+    column are skipped), with the source path in df.attrs['source_file'].
+    """
+    for data_file in _find_csv_files(dataset_path):
+        df = load_csv_file(data_file, chunksize=chunksize, engine=engine)
+        if df is not None:
+            df.attrs['source_file'] = data_file
+            yield df
+
+@instrument('load_data')
+def load_kaggle_data(dataset_path, chunksize=100000, engine=None, max_workers=None, use_processes=False):
     """
     Load salary dataset from Kaggle with improved column mapping
+    
+    Every CSV in the directory is loaded (see load_csv_file) on a thread
+    pool, or a process pool with use_processes=True, and the shards are
+    concatenated into one frame. Files without a salary column are skipped.
+    Rows loaded per file are recorded in df.attrs['file_row_counts'].
+    Pass engine='pyarrow' to parse with pyarrow's multithreaded reader.
     """
     try:
         # Look for CSV files in the dataset directory
-        csv_files = glob.glob(os.path.join(dataset_path, "*.csv"))
+        csv_files = _find_csv_files(dataset_path)
         
         if not csv_files:
             print("No CSV files found in the dataset directory")
             return None
         
-        # Try to load the first CSV file
-        data_file = csv_files[0]
-        print(f"Loading data from: {data_file}")
-        
-        # Load the data
-        df = pd.read_csv(data_file)
-        
-        # Column mapping for different dataset formats
-        column_mapping = {
-            'Salary': 'salary',
-            'Annual Salary': 'salary',
-            'yearly_salary': 'salary',
-            'wage': 'salary',
-            'income': 'salary',
-            'compensation': 'salary',
-            'Age': 'age',
-            'Gender': 'gender',
-            'Sex': 'gender',
-            'Education': 'education',
-            'Education Level': 'education',
-            'degree': 'education',
-            'Experience': 'experience',
-            'Years of Experience': 'experience',
-            'work_experience': 'experience',
-            'Job Title': 'job_title',
-            'Position': 'job_title',
-            'role': 'job_title',
-            'Location': 'location',
-            'City': 'location',
-            'State': 'location',
-            'Industry': 'industry',
-            'Sector': 'industry',
-            'Company Size': 'company_size',
-            'company_size': 'company_size',
-            'Remote Work': 'remote_work',
-            'remote': 'remote_work',
-            'work_from_home': 'remote_work'
-        }
-        
-        # Apply column mapping before making lowercase
-        df = df.rename(columns=column_mapping)
-        
-        # Make column names lowercase for consistency
-        df.columns = df.columns.str.lower()
-        
-        # Find salary column (case-insensitive)
-        salary_columns = ['salary', 'annual_salary', 'yearly_salary', 'wage', 'income', 'compensation']
-        salary_col = None
+        print(f"Loading data from {len(csv_files)} file(s): {csv_files}")
+        engine = _resolve_engine(engine)
         
-        for col in df.columns:
-            if col.lower() in salary_columns:
-                salary_col = col
-                break
+        if len(csv_files) == 1:
+            shards = [load_csv_file(csv_files[0], chunksize, engine)]
+        else:
+            if max_workers is None:
+                max_workers = min(len(csv_files), os.cpu_count() or 1)
+            executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            
+            with executor_class(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(load_csv_file, data_file, chunksize, engine)
+                    for data_file in csv_files
+                ]
+                shards = []
+                for data_file, future in zip(csv_files, futures):
+                    try:
+                        shards.append(future.result())
+                    except Exception as e:
+                        print(f"Warning: Could not load {data_file}: {e}")
+                        shards.append(None)
         
-        if salary_col is None:
+        loaded = [(data_file, shard) for data_file, shard in zip(csv_files, shards) if shard is not None]
+        if not loaded:
             print("No salary column found in the dataset")
-            print(f"Available columns: {df.columns.tolist()}")
             return None
         
-        # Rename salary column to standard name
-        if salary_col != 'salary':
-            df = df.rename(columns={salary_col: 'salary'})
-        
-        # Basic data validation and cleaning
-        # Remove rows with missing salary values
-        df = df.dropna(subset=['salary'])
-        
-        # Convert salary to numeric if it's not already
-        df['salary'] = pd.to_numeric(df['salary'], errors='coerce')
-        
-        # Remove rows with invalid salary values
-        df = df.dropna(subset=['salary'])
-        df = df[df['salary'] > 0]
-        
-        # Clean and standardize other columns
-        if 'gender' in df.columns:
-            df['gender'] = df['gender'].astype(str).str.title()
-        
-        if 'education' in df.columns:
-            df['education'] = df['education'].astype(str).str.title()
-        
-        if 'industry' in df.columns:
-            df['industry'] = df['industry'].astype(str).str.title()
-        
-        if 'location' in df.columns:
-            df['location'] = df['location'].astype(str).str.title()
-        
-        if 'job_title' in df.columns:
-            df['job_title'] = df['job_title'].astype(str).str.title()
-        
-        # Add missing columns with default values if needed
-        required_columns = ['age', 'gender', 'education', 'experience', 'job_title', 
-                           'location', 'industry', 'company_size', 'remote_work']
-        
-        for col in required_columns:
-            if col not in df.columns:
-                # Add default values for missing columns
-                default_values = {
-                    'age': 30,
-                    'gender': 'Unknown',
-                    'education': "Bachelor's",
-                    'experience': 5,
-                    'job_title': 'Unknown',
-                    'location': 'Unknown',
-                    'industry': 'Unknown',
-                    'company_size': 'Medium (51-200)',
-                    'remote_work': 'No'
-                }
-                df[col] = default_values[col]
+        file_row_counts = {data_file: len(shard) for data_file, shard in loaded}
+        df = concat_categorical_frames([shard for _, shard in loaded])
+        df.attrs['file_row_counts'] = file_row_counts
         
         print(f"Loaded {len(df)} records with valid salary data")
+        if len(file_row_counts) > 1:
+            for data_file, rows in file_row_counts.items():
+                print(f"  {os.path.basename(data_file)}: {rows} records")
         print(f"Dataset columns: {df.columns.tolist()}")
         print(f"Salary range: ${df['salary'].min():,.0f} - ${df['salary'].max():,.0f}")
         
@@ -203,14 +469,19 @@ def load_kaggle_data(dataset_path):
         print(f"Error loading Kaggle data: {e}")
         return None
 
-def validate_data_quality(df):
+def validate_data_quality(df, dataset_stats=None):
     """
     Validate data quality and provide statistics
+    
+    Pass a dataset_stats.DatasetStatistics for df to answer from cached statistics.
     """
+    if dataset_stats is not None:
+        return dataset_stats.quality_report()
+    
     quality_report = {
         'total_records': len(df),
         'missing_values': df.isnull().sum().sum(),
-        'duplicate_records': df.duplicated().sum(),
+        'duplicate_records': count_duplicate_rows(df),
         'data_types': df.dtypes.to_dict(),
         'salary_statistics': {}
     }
@@ -227,42 +498,308 @@ def validate_data_quality(df):
     
     return quality_report
 
-def clean_data(df):
+def _combined_dtype(current, new):
+    """
+    Widest dtype covering both chunk dtypes: numeric types promote, anything else becomes object
+    """
+    if current == new:
+        return current
+    # Chunks read separately carry their own categories
+    if isinstance(current, pd.CategoricalDtype) and isinstance(new, pd.CategoricalDtype):
+        return current
+    if pd.api.types.is_numeric_dtype(current) and pd.api.types.is_numeric_dtype(new):
+        return np.result_type(current, new)
+    return np.dtype(object)
+
+class StreamingQualityValidator:
+    """
+    One-pass data quality validation over DataFrame chunks.
+    
+    Accumulates per-column null counts, each column's dtype across chunks,
+    exact salary moments (parallel Welford), a t-digest of salaries and a
+    HyperLogLog sketch of stable row fingerprints. ``report`` has the same
+    structure as validate_data_quality: counts, extremes, mean and std are
+    exact, while the median, the 95th percentile outlier threshold and the
+    duplicate count are sketch estimates. Validators built on separate
+    workers can be merged.
+    """
+    
+    def __init__(self, compression=200, precision=14):
+        self.total_records = 0
+        self.missing_counts = {}
+        self.data_types = {}
+        self.dtype_changes = []
+        self.salary = SalarySketch(compression=compression)
+        self.distinct_rows = HyperLogLog(precision=precision)
+    
+    def update(self, chunk):
+        """
+        Fold one chunk into the running statistics
+        """
+        self.total_records += len(chunk)
+        
+        for col, count in chunk.isna().sum().items():
+            self.missing_counts[col] = self.missing_counts.get(col, 0) + int(count)
+        
+        for col, dtype in chunk.dtypes.items():
+            self._update_dtype(col, dtype)
+        
+        if 'salary' in chunk.columns:
+            self.salary.update(pd.to_numeric(chunk['salary'], errors='coerce').to_numpy(dtype=float))
+        
+        self.distinct_rows.update(row_fingerprints(chunk, stable=True))
+        return self
+    
+    def _update_dtype(self, col, dtype):
+        if col not in self.data_types:
+            self.data_types[col] = dtype
+            return
+        
+        combined = _combined_dtype(self.data_types[col], dtype)
+        if combined != self.data_types[col]:
+            self.dtype_changes.append((col, self.data_types[col], dtype))
+            self.data_types[col] = combined
+    
+    def merge(self, other):
+        """
+        Merge a validator built on other chunks into this one
+        """
+        self.total_records += other.total_records
+        for col, count in other.missing_counts.items():
+            self.missing_counts[col] = self.missing_counts.get(col, 0) + count
+        for col, dtype in other.data_types.items():
+            self._update_dtype(col, dtype)
+        self.dtype_changes.extend(other.dtype_changes)
+        self.salary.merge(other.salary)
+        self.distinct_rows.merge(other.distinct_rows)
+        
+        return self
+    
+    def report(self):
+        """
+        Report with the same structure as validate_data_quality
+        """
+        distinct_rows = min(self.distinct_rows.count(), self.total_records)
+        
+        quality_report = {
+            'total_records': self.total_records,
+            'missing_values': sum(self.missing_counts.values()),
+            'duplicate_records': self.total_records - distinct_rows,
+            'data_types': dict(self.data_types),
+            'salary_statistics': {}
+        }
+        
+        if 'salary' in self.data_types:
+            salary = self.salary
+            median, threshold = salary.quantile([0.5, 0.95]) if salary.count else (np.nan, np.nan)
+            outliers = salary.count * (1 - salary.digest.cdf(threshold)) if salary.count else 0
+            
+            quality_report['salary_statistics'] = {
+                'min': salary.min if salary.count else np.nan,
+                'max': salary.max if salary.count else np.nan,
+                'mean': salary.mean if salary.count else np.nan,
+                'median': median,
+                'std': salary.std,
+                'outliers': int(round(outliers))
+            }
+        
+        return quality_report
+
+def validate_data_quality_streaming(chunks, compression=200, precision=14):
+    """
+    Validate data quality in one pass over DataFrame chunks
+    
+    Returns the same structure as validate_data_quality (see
+    StreamingQualityValidator for which values are estimates).
+    """
+    validator = StreamingQualityValidator(compression=compression, precision=precision)
+    for chunk in chunks:
+        validator.update(chunk)
+    
+    return validator.report()
+
+def _strip_text(value):
+    return value.strip() if isinstance(value, str) else value
+
+def _strip_text_columns(df):
+    """
+    Strip surrounding whitespace from text values, once per distinct value
+    """
+    stripped = {
+        col: normalize_unique_values(df[col], _strip_text)
+        for col in df.columns
+        if not pd.api.types.is_numeric_dtype(df[col])
+    }
+    return df.assign(**stripped) if stripped else df
+
+def _column_mode(series):
+    """
+    Most frequent non-missing value, ties broken like Series.mode()[0]; None if all missing
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    if len(counts) == 0 or counts.max() == 0:
+        return None
+    
+    candidates = np.flatnonzero(counts == counts.max())
+    if len(candidates) == 1 or isinstance(series.dtype, pd.CategoricalDtype):
+        return uniques[candidates[0]]
+    
+    return series.mode().iloc[0]
+
+def _fill_values(df):
+    """
+    Fill values for every column with missing data: median for numeric columns, mode otherwise
+    """
+    missing_columns = df.columns[df.isna().any().to_numpy()]
+    numeric_columns = [col for col in missing_columns if pd.api.types.is_numeric_dtype(df[col])]
+    
+    # One aggregation for all numeric medians
+    fill_values = df[numeric_columns].median().to_dict() if numeric_columns else {}
+    
+    for col in missing_columns:
+        if col not in fill_values:
+            mode_value = _column_mode(df[col])
+            if mode_value is not None:
+                fill_values[col] = mode_value
+    
+    return fill_values
+
+def clean_data(df, strip_whitespace=False):
     """
     Clean and preprocess the data
+    
+    Duplicates are found from 64-bit row fingerprints rather than comparing
+    object columns, and all fill values come from one aggregation and are
+    applied in a single fillna. With strip_whitespace=True surrounding
+    whitespace is stripped from text values first, so rows that differ only
+    in padding (e.g. ' Engineer' and 'Engineer') count as duplicates and
+    share a category. The result is always a new DataFrame, even when
+    nothing needed cleaning.
     """
-    cleaned_df = df.copy()
+    cleaned_df = _strip_text_columns(df) if strip_whitespace else df
     
-    # Remove duplicates
-    cleaned_df = cleaned_df.drop_duplicates()
+    # Remove duplicates (first occurrence kept)
+    cleaned_df = drop_duplicate_rows(cleaned_df)
     
     # Handle missing values
-    for col in cleaned_df.columns:
-        if cleaned_df[col].dtype == 'object':
-            # Fill missing categorical values with mode
-            mode_value = cleaned_df[col].mode()
-            if len(mode_value) > 0:
-                cleaned_df[col] = cleaned_df[col].fillna(mode_value[0])
-        else:
-            # Fill missing numerical values with median
-            cleaned_df[col] = cleaned_df[col].fillna(cleaned_df[col].median())
+    fill_values = _fill_values(cleaned_df)
+    if fill_values:
+        cleaned_df = cleaned_df.fillna(fill_values)
     
     # Handle outliers in salary (remove extreme outliers)
     if 'salary' in cleaned_df.columns:
-        Q1 = cleaned_df['salary'].quantile(0.25)
-        Q3 = cleaned_df['salary'].quantile(0.75)
+        Q1, Q3 = cleaned_df['salary'].quantile([0.25, 0.75]).to_numpy()
         IQR = Q3 - Q1
         
         lower_bound = Q1 - 3 * IQR
         upper_bound = Q3 + 3 * IQR
         
-        cleaned_df = cleaned_df[
-            (cleaned_df['salary'] >= lower_bound) & 
-            (cleaned_df['salary'] <= upper_bound)
-        ]
+        salary = cleaned_df['salary'].to_numpy()
+        within_bounds = (salary >= lower_bound) & (salary <= upper_bound)
+        if not within_bounds.all():
+            cleaned_df = cleaned_df[within_bounds]
+    
+    # Callers may modify the result, so never hand back the input itself
+    if cleaned_df is df:
+        cleaned_df = df.copy()
     
     return cleaned_df
 
+def clean_data_chunked(chunk_source, compression=200, strip_whitespace=False):
+    """
+    Clean a dataset too large for memory in two passes over its chunks
+    
+    chunk_source is a callable returning a fresh iterable of DataFrame chunks
+    (e.g. lambda: pd.read_csv(path, chunksize=100000)), the same chunks each
+    time. The first pass de-duplicates rows by hash and collects numeric
+    medians and salary quartiles (t-digest estimates) and categorical value
+    counts; the second yields cleaned chunks with the same steps as
+    clean_data, including the optional whitespace stripping. Across the
+    whole dataset only the distinct row hashes (8 bytes per unique row) and
+    a keep flag per row are held.
+    """
+    seen_hashes = FingerprintSet()
+    keep_masks = []
+    digests = {}
+    value_counts = {}
+    missing_counts = {}
+    
+    for chunk in chunk_source():
+        if strip_whitespace:
+            chunk = _strip_text_columns(chunk)
+        keep = seen_hashes.add(row_fingerprints(chunk, stable=True))
+        keep_masks.append(keep)
+        chunk = chunk[keep]
+        
+        for col in chunk.columns:
+            missing_counts[col] = missing_counts.get(col, 0) + int(chunk[col].isna().sum())
+            if pd.api.types.is_numeric_dtype(chunk[col]):
+                digests.setdefault(col, TDigest(compression=compression)).update(
+                    chunk[col].to_numpy(dtype=float)
+                )
+            else:
+                counts = chunk[col].value_counts()
+                value_counts[col] = counts if col not in value_counts else value_counts[col].add(counts, fill_value=0)
+    
+    fill_values = {}
+    for col, count in missing_counts.items():
+        if count == 0:
+            continue
+        if col in digests:
+            if digests[col].count:
+                fill_values[col] = float(digests[col].quantile(0.5))
+        elif len(value_counts[col]):
+            counts = value_counts[col]
+            fill_values[col] = counts[counts == counts.max()].sort_index().index[0]
+    
+    bounds = None
+    if 'salary' in digests and digests['salary'].count:
+        salary_digest = digests['salary']
+        # Missing salaries are filled with the median before outliers are judged
+        if 'salary' in fill_values:
+            salary_digest.update([fill_values['salary']], weights=[missing_counts['salary']])
+        Q1, Q3 = salary_digest.quantile([0.25, 0.75])
+        IQR = Q3 - Q1
+        bounds = (Q1 - 3 * IQR, Q3 + 3 * IQR)
+    
+    # The second pass reuses the first pass's de-duplication instead of hashing again
+    chunk_count = 0
+    for chunk in chunk_source():
+        if chunk_count >= len(keep_masks) or len(chunk) != len(keep_masks[chunk_count]):
+            raise ValueError("chunk_source returned different chunks on the second pass")
+        keep = keep_masks[chunk_count]
+        chunk_count += 1
+        
+        if strip_whitespace:
+            chunk = _strip_text_columns(chunk)
+        chunk = chunk[keep]
+        chunk_fill_values = {col: value for col, value in fill_values.items() if col in chunk.columns}
+        # Chunks read separately may not share categories
+        new_categories = {
+            col: chunk[col].cat.add_categories([value])
+            for col, value in chunk_fill_values.items()
+            if isinstance(chunk[col].dtype, pd.CategoricalDtype) and value not in chunk[col].cat.categories
+        }
+        if new_categories:
+            chunk = chunk.assign(**new_categories)
+        if chunk_fill_values:
+            chunk = chunk.fillna(chunk_fill_values)
+        
+        if bounds is not None:
+            salary = chunk['salary'].to_numpy()
+            chunk = chunk[(salary >= bounds[0]) & (salary <= bounds[1])]
+        
+        yield chunk
+    
+    if chunk_count != len(keep_masks):
+        raise ValueError("chunk_source returned different chunks on the second pass")
+
 def export_data(df, filename, format='csv'):
     """
     Export data to various formats
@@ -284,55 +821,210 @@ def export_data(df, filename, format='csv'):
         print(f"Error exporting data: {e}")
         return False
 
-def calculate_salary_statistics(df, group_by_column=None):
+DESCRIBE_STATISTICS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+def grouped_salary_summary(df, group_by_columns):
+    """
+    Compute count/mean/std/min/quartiles/max of salary for every group in one pass
+    
+    Groups are numbered once, then counts and sums come from np.bincount and
+    the order statistics from a single sort by (group, salary), instead of
+    calling describe() per group. Returns a DataFrame indexed by group (a
+    MultiIndex for several columns) with the columns of Series.describe().
+    """
+    if isinstance(group_by_columns, str):
+        group_by_columns = [group_by_columns]
+    
+    grouped = df.groupby(group_by_columns, sort=True, dropna=True, observed=True)
+    group_index = grouped.size().index
+    group_ids = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    n_groups = len(group_index)
+    
+    salary = pd.to_numeric(df['salary'], errors='coerce').to_numpy(dtype=float)
+    valid = (group_ids >= 0) & ~np.isnan(salary)
+    ids = group_ids[valid]
+    values = salary[valid]
+    
+    count = np.bincount(ids, minlength=n_groups)
+    sums = np.bincount(ids, weights=values, minlength=n_groups)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / count
+        squared_deviation = np.bincount(ids, weights=(values - mean[ids]) ** 2, minlength=n_groups)
+        std = np.where(count > 1, np.sqrt(squared_deviation / (count - 1)), np.nan)
+    
+    # Sort once by (group, salary); each group is then a contiguous sorted segment
+    sorted_values = values[np.lexsort((values, ids))]
+    starts = np.cumsum(count) - count
+    has_values = count > 0
+    last = np.maximum(count - 1, 0)
+    
+    def segment_quantile(q):
+        position = last * q
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        if len(sorted_values) == 0:
+            return np.full(n_groups, np.nan)
+        low_values = sorted_values[np.minimum(starts + lower, len(sorted_values) - 1)]
+        high_values = sorted_values[np.minimum(starts + upper, len(sorted_values) - 1)]
+        result = low_values + (high_values - low_values) * (position - lower)
+        return np.where(has_values, result, np.nan)
+    
+    summary = pd.DataFrame({
+        'count': count.astype(float),
+        'mean': mean,
+        'std': std,
+        'min': segment_quantile(0.0),
+        '25%': segment_quantile(0.25),
+        '50%': segment_quantile(0.5),
+        '75%': segment_quantile(0.75),
+        'max': segment_quantile(1.0)
+    }, index=group_index)
+    
+    return summary
+
+def calculate_salary_statistics(df, group_by_column=None, dataset_stats=None):
     """
     Calculate comprehensive salary statistics
+    
+    group_by_column may be a column name or a list of columns to group by
+    together. Overall statistics are taken from dataset_stats (a
+    dataset_stats.DatasetStatistics for df) when given.
     """
     if 'salary' not in df.columns:
         return None
     
     stats = {}
     
-    if group_by_column and group_by_column in df.columns:
+    if isinstance(group_by_column, str):
+        group_by_columns = [group_by_column]
+    else:
+        group_by_columns = list(group_by_column or [])
+    
+    if group_by_columns and all(col in df.columns for col in group_by_columns):
+        summary = grouped_salary_summary(df, group_by_columns)
+        
         # Group statistics
-        grouped_stats = df.groupby(group_by_column)['salary'].agg([
-            'count', 'mean', 'median', 'std', 'min', 'max'
-        ]).round(2)
+        grouped_stats = summary.rename(columns={'50%': 'median'})[
+            ['count', 'mean', 'median', 'std', 'min', 'max']
+        ].round(2).astype({'count': 'int64'})
         
         stats['grouped_statistics'] = grouped_stats.to_dict()
         
-        # Additional grouped metrics
-        stats['salary_distribution_by_group'] = (
-            df.groupby(group_by_column)['salary']
-            .apply(lambda x: x.describe())
-            .to_dict()
-        )
+        # Additional grouped metrics, keyed by (group..., statistic) like describe()
+        stats['salary_distribution_by_group'] = {
+            (*(group if isinstance(group, tuple) else (group,)), stat): value
+            for group, row in zip(summary.index, summary[DESCRIBE_STATISTICS].to_numpy())
+            for stat, value in zip(DESCRIBE_STATISTICS, row)
+        }
+    
+    if dataset_stats is not None:
+        stats['overall_statistics'] = dataset_stats.overall_salary_statistics()
+        return stats
+    
+    quantiles = df['salary'].quantile([0.25, 0.50, 0.75, 0.90, 0.95, 0.99]).to_numpy()
     
     # Overall statistics
     stats['overall_statistics'] = {
         'total_records': len(df),
         'mean_salary': df['salary'].mean(),
-        'median_salary': df['salary'].median(),
+        'median_salary': quantiles[1],
         'std_salary': df['salary'].std(),
         'min_salary': df['salary'].min(),
         'max_salary': df['salary'].max(),
         'salary_range': df['salary'].max() - df['salary'].min(),
         'percentiles': {
-            '25th': df['salary'].quantile(0.25),
-            '50th': df['salary'].quantile(0.50),
-            '75th': df['salary'].quantile(0.75),
-            '90th': df['salary'].quantile(0.90),
-            '95th': df['salary'].quantile(0.95),
-            '99th': df['salary'].quantile(0.99)
+            '25th': quantiles[0],
+            '50th': quantiles[1],
+            '75th': quantiles[2],
+            '90th': quantiles[3],
+            '95th': quantiles[4],
+            '99th': quantiles[5]
         }
     }
     
     return stats
 
-def generate_data_report(df):
+def calculate_salary_statistics_streaming(chunks, group_by_column=None, compression=200):
+    """
+    Calculate salary statistics in one pass over DataFrame chunks using quantile sketches
+    
+    group_by_column may be a column name or a list of columns, as for
+    calculate_salary_statistics, which this returns the same structure as;
+    counts, means, standard deviations and extremes are exact while medians
+    and percentiles are t-digest estimates.
+    """
+    overall, groups = build_salary_sketches(chunks, group_by_column, compression=compression)
+    
+    if overall.count == 0:
+        return None
+    
+    stats = {}
+    
+    if group_by_column:
+        group_keys = sorted(groups, key=str)
+        descriptions = {group: groups[group].describe() for group in group_keys}
+        
+        stats['grouped_statistics'] = {
+            stat: {group: round(float(descriptions[group][key]), 2) for group in group_keys}
+            for stat, key in [('count', 'count'), ('mean', 'mean'), ('median', '50%'),
+                              ('std', 'std'), ('min', 'min'), ('max', 'max')]
+        }
+        
+        stats['salary_distribution_by_group'] = {
+            (*(group if isinstance(group, tuple) else (group,)), stat): value
+            for group in group_keys
+            for stat, value in descriptions[group].items()
+        }
+    
+    percentiles = overall.quantile([0.25, 0.50, 0.75, 0.90, 0.95, 0.99])
+    
+    stats['overall_statistics'] = {
+        # Every row, like len(df) in calculate_salary_statistics; the moments cover valid salaries
+        'total_records': overall.records,
+        'mean_salary': overall.mean,
+        'median_salary': percentiles[1],
+        'std_salary': overall.std,
+        'min_salary': overall.min,
+        'max_salary': overall.max,
+        'salary_range': overall.max - overall.min,
+        'percentiles': {
+            '25th': percentiles[0],
+            '50th': percentiles[1],
+            '75th': percentiles[2],
+            '90th': percentiles[3],
+            '95th': percentiles[4],
+            '99th': percentiles[5]
+        }
+    }
+    
+    return stats
+
+def generate_data_report(df, dataset_stats=None):
     """
     Generate a comprehensive data report
+    
+    Pass a dataset_stats.DatasetStatistics for df to build the report from
+    cached statistics instead of rescanning the data.
     """
+    if dataset_stats is not None:
+        report = {
+            'dataset_info': {
+                'shape': (dataset_stats.row_count, len(dataset_stats.columns)),
+                'columns': list(dataset_stats.columns),
+                'data_types': dict(dataset_stats.dtypes),
+                'memory_usage': dataset_stats.memory_usage
+            },
+            'data_quality': dataset_stats.quality_report(),
+            'salary_statistics': calculate_salary_statistics(df, dataset_stats=dataset_stats)
+        }
+        
+        categorical_analysis = dataset_stats.categorical_analysis()
+        if categorical_analysis:
+            report['categorical_analysis'] = categorical_analysis
+        
+        return report
+    
     report = {
         'dataset_info': {
             'shape': df.shape,
@@ -345,7 +1037,7 @@ def generate_data_report(df):
     }
     
     # Add categorical column analysis
-    categorical_columns = df.select_dtypes(include=['object']).columns
+    categorical_columns = df.select_dtypes(include=['object', 'category']).columns
     if len(categorical_columns) > 0:
         report['categorical_analysis'] = {}
         for col in categorical_columns:
@@ -359,74 +1051,269 @@ def generate_data_report(df):
 
 def convert_salary_currency(amount, from_currency, to_currency):
     """
-    Convert salary from one currency to another
+    Convert salary from one currency to another (amount may be a scalar or an array)
     """
-    rates = get_currency_rates()
-    
-    if from_currency not in rates or to_currency not in rates:
-        raise ValueError("Unsupported currency")
+    rate_vector = get_rate_vector()
+    from_rate = rate_vector[_currency_positions(from_currency)]
+    to_rate = rate_vector[_currency_positions(to_currency)]
     
     # Convert to USD first, then to target currency
-    usd_amount = amount / rates[from_currency]
-    converted_amount = usd_amount * rates[to_currency]
+    usd_amount = amount / from_rate
+    converted_amount = usd_amount * to_rate
     
     return converted_amount
 
-def get_salary_percentile(salary, df):
+def convert_salaries(amounts, from_currency='USD', to_currencies=None):
     """
-    Get the percentile rank of a salary within the dataset
+    Convert N salaries into M currencies as one (N, M) array
+    
+    from_currency is one code or one code per salary; to_currencies defaults
+    to every code in CURRENCY_CODES, which then labels the columns.
+    """
+    amounts = np.asarray(amounts, dtype=float).reshape(-1, 1)
+    
+    rate_vector = get_rate_vector()
+    from_rates = rate_vector[_currency_positions(from_currency)]
+    if np.ndim(from_rates):
+        from_rates = from_rates.reshape(-1, 1)
+    
+    if to_currencies is None:
+        to_rates = rate_vector
+    else:
+        to_rates = rate_vector[_currency_positions(list(to_currencies))]
+    
+    return amounts / from_rates * to_rates[np.newaxis, :]
+
+class SalaryPercentileIndex:
+    """
+    Sorted salary array answering percentile-rank queries by binary search.
+
+    The rank of a salary is the share of records earning at most that amount;
+    records with a missing salary count towards the total but never rank
+    below a salary, matching ``(df['salary'] <= salary).mean()``.
+    """
+
+    def __init__(self, salaries):
+        values = np.asarray(salaries, dtype=float)
+        self.total_count = len(values)
+        self.sorted_salaries = np.sort(values[~np.isnan(values)])
+
+    def extend(self, salaries):
+        """
+        Add new salaries, merging them into the sorted array
+        """
+        values = np.asarray(salaries, dtype=float)
+        self.total_count += len(values)
+
+        new_values = np.sort(values[~np.isnan(values)])
+        positions = np.searchsorted(self.sorted_salaries, new_values, side='right')
+        self.sorted_salaries = np.insert(self.sorted_salaries, positions, new_values)
+
+    def rank(self, salaries):
+        """
+        Get percentile ranks (0-100) for one salary or an array of salaries
+        """
+        if self.total_count == 0:
+            return np.nan if np.ndim(salaries) == 0 else np.full(np.shape(salaries), np.nan)
+
+        counts = np.searchsorted(self.sorted_salaries, salaries, side='right')
+        return counts / self.total_count * 100
+
+def build_percentile_index(df):
+    """
+    Build a SalaryPercentileIndex for repeated percentile queries on one dataset
+    """
+    if 'salary' not in df.columns:
+        return None
+
+    return SalaryPercentileIndex(df['salary'].to_numpy(dtype=float))
+
+def get_salary_percentile(salary, df, index=None):
+    """
+    Get the percentile rank of a salary (or an array of salaries) within the dataset
+    
+    Pass an index from build_percentile_index(df) when ranking many
+    predictions against the same dataset.
     """
     if 'salary' not in df.columns:
         return None
     
-    percentile = (df['salary'] <= salary).mean() * 100
-    return round(percentile, 1)
+    if index is None:
+        if np.ndim(salary) == 0:
+            percentile = (df['salary'] <= salary).mean() * 100
+            return round(percentile, 1)
+        index = build_percentile_index(df)
+    
+    percentile = index.rank(salary)
+    
+    if np.ndim(percentile) == 0:
+        return round(float(percentile), 1)
+    return np.round(percentile, 1)
+
+BENCHMARK_KEY_COLUMNS = ['education', 'job_title', 'industry', 'location']
+
+class SalaryBenchmarkIndex:
+    """
+    Reusable index for benchmarking salaries against similar profiles.
 
-def benchmark_salary(input_data, df):
+    Rows are grouped by the categorical profile columns and, within each
+    group, ordered by experience, so a benchmark query is a dictionary lookup
+    plus a binary-search slice instead of a scan over the whole dataset.
+    Indexes for queries that only specify some of the profile columns are
+    built on first use and cached.
+    """
+
+    def __init__(self, df, key_columns=None):
+        if key_columns is None:
+            key_columns = BENCHMARK_KEY_COLUMNS
+
+        self.df = df
+        self.key_columns = [col for col in key_columns if col in df.columns]
+        self.has_experience = 'experience' in df.columns
+        self._indexes = {}
+
+        self.salary = df['salary'].to_numpy(dtype=float)
+        self.has_missing_salary = bool(np.isnan(self.salary).any())
+
+        if self.has_experience:
+            self.experience = pd.to_numeric(df['experience'], errors='coerce').to_numpy(dtype=float)
+        else:
+            self.experience = np.zeros(len(df))
+
+        self._get_index(tuple(self.key_columns))
+
+    def _get_index(self, columns):
+        """
+        Get (building if needed) the group lookup for a subset of key columns
+        """
+        if columns in self._indexes:
+            return self._indexes[columns]
+
+        if columns:
+            group_ids = (
+                self.df.groupby(list(columns), sort=False, dropna=True, observed=True)
+                .ngroup()
+                .fillna(-1)
+                .to_numpy(dtype=np.int64)
+            )
+        else:
+            group_ids = np.zeros(len(self.df), dtype=np.int64)
+
+        # Order rows by group, then by experience within each group
+        valid_rows = np.flatnonzero(group_ids >= 0)
+        order = valid_rows[np.lexsort((self.experience[valid_rows], group_ids[valid_rows]))]
+        sorted_groups = group_ids[order]
+
+        if len(order):
+            starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        else:
+            starts = np.array([], dtype=np.int64)
+        ends = np.r_[starts[1:], len(order)]
+
+        first_rows = order[starts]
+        key_values = [self.df[col].to_numpy()[first_rows] for col in columns]
+        keys = zip(*key_values) if columns else [()] * len(starts)
+
+        index = {
+            'experience': self.experience[order],
+            'salary': self.salary[order],
+            'groups': {key: (start, end) for key, start, end in zip(keys, starts, ends)}
+        }
+        self._indexes[columns] = index
+
+        return index
+
+    def query(self, input_data, exp_range=2):
+        """
+        Get the salaries of profiles similar to input_data
+        """
+        columns = tuple(col for col in self.key_columns if col in input_data)
+        index = self._get_index(columns)
+
+        bounds = index['groups'].get(tuple(input_data[col] for col in columns))
+        if bounds is None:
+            return np.array([], dtype=float)
+
+        start, end = bounds
+
+        if 'experience' in input_data and self.has_experience:
+            experience = index['experience'][start:end]
+            low = np.searchsorted(experience, input_data['experience'] - exp_range, side='left')
+            high = np.searchsorted(experience, input_data['experience'] + exp_range, side='right')
+            start, end = start + low, start + high
+
+        return index['salary'][start:end]
+
+def build_benchmark_index(df):
+    """
+    Build a SalaryBenchmarkIndex for repeated benchmark_salary calls on one dataset
+    """
+    if 'salary' not in df.columns:
+        return None
+
+    return SalaryBenchmarkIndex(df)
+
+def _benchmark_stats_from_array(salaries, skip_missing=False):
+    """
+    Compute benchmark statistics from an array of salaries
+    """
+    if skip_missing:
+        values = salaries[~np.isnan(salaries)]
+    else:
+        values = salaries
+
+    quantiles = np.quantile(values, [0.25, 0.5, 0.75, 0.90]) if len(values) else [np.nan] * 4
+
+    return {
+        'sample_size': len(salaries),
+        'mean_salary': values.mean() if len(values) else np.nan,
+        'median_salary': quantiles[1],
+        'std_salary': values.std(ddof=1) if len(values) > 1 else np.nan,
+        'min_salary': values.min() if len(values) else np.nan,
+        'max_salary': values.max() if len(values) else np.nan,
+        'percentiles': {
+            '25th': quantiles[0],
+            '75th': quantiles[2],
+            '90th': quantiles[3]
+        }
+    }
+
+def benchmark_salary(input_data, df, index=None):
     """
     Benchmark a salary against similar profiles in the dataset
+    
+    Pass an index from build_benchmark_index(df) when benchmarking many
+    profiles against the same dataset.
     """
     if 'salary' not in df.columns:
         return None
     
+    if index is not None:
+        similar_salaries = index.query(input_data)
+        if len(similar_salaries) == 0:
+            return None
+        return _benchmark_stats_from_array(similar_salaries, skip_missing=index.has_missing_salary)
+    
     # Filter similar profiles
-    similar_profiles = df.copy()
+    mask = np.ones(len(df), dtype=bool)
     
     # Filter by categorical variables if available
-    categorical_filters = ['education', 'job_title', 'industry', 'location']
-    
-    for col in categorical_filters:
-        if col in input_data and col in similar_profiles.columns:
-            similar_profiles = similar_profiles[
-                similar_profiles[col] == input_data[col]
-            ]
+    for col in BENCHMARK_KEY_COLUMNS:
+        if col in input_data and col in df.columns:
+            mask &= (df[col] == input_data[col]).to_numpy()
     
     # Filter by experience range if available
-    if 'experience' in input_data and 'experience' in similar_profiles.columns:
+    if 'experience' in input_data and 'experience' in df.columns:
         exp_range = 2  # ±2 years
-        similar_profiles = similar_profiles[
-            (similar_profiles['experience'] >= input_data['experience'] - exp_range) &
-            (similar_profiles['experience'] <= input_data['experience'] + exp_range)
-        ]
+        experience = df['experience'].to_numpy()
+        mask &= (experience >= input_data['experience'] - exp_range) & (experience <= input_data['experience'] + exp_range)
     
-    if len(similar_profiles) == 0:
-        return None
+    similar_salaries = df['salary'].to_numpy(dtype=float)[mask]
     
-    benchmark_stats = {
-        'sample_size': len(similar_profiles),
-        'mean_salary': similar_profiles['salary'].mean(),
-        'median_salary': similar_profiles['salary'].median(),
-        'std_salary': similar_profiles['salary'].std(),
-        'min_salary': similar_profiles['salary'].min(),
-        'max_salary': similar_profiles['salary'].max(),
-        'percentiles': {
-            '25th': similar_profiles['salary'].quantile(0.25),
-            '75th': similar_profiles['salary'].quantile(0.75),
-            '90th': similar_profiles['salary'].quantile(0.90)
-        }
-    }
+    if len(similar_salaries) == 0:
+        return None
     
-    return benchmark_stats
+    return _benchmark_stats_from_array(similar_salaries, skip_missing=True)
 
 if __name__ == "__main__":
     # Test utility functions
@@ -443,3 +1330,7 @@ if __name__ == "__main__":
     # Test currency conversion
     converted = convert_salary_currency(75000, 'USD', 'EUR')
     print(f"Converted salary: {converted}")
+    
+    # Test array conversion and formatting
+    converted = convert_salaries([50000, 75000, 120000], 'USD', ['EUR', 'JPY'])
+    print(f"Converted salaries:\n{format_currency_array(converted, ['EUR', 'JPY'])}")